@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Microbenchmark of the call overhead of `@fnfnwrap` wrappers compared
+with calling the original function directly. Run from the repository
+root with `python3 bench/bench_dispatch.py`.
+"""
+__all__ = ()
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pyfnfn import fnfnwrap
+
+this_dir = os.path.dirname(os.path.abspath(__file__))
+data_filename = os.path.join(this_dir, os.pardir, 'test', 'data.txt')
+
+
+def parse(file_input, scale=1):
+    return scale
+
+def parse_keyword_only(*, file_input, scale=1):
+    return scale
+
+def parse_generator(file_input):
+    yield file_input
+
+
+wrapped_parse = fnfnwrap(parse)
+wrapped_keyword_only = fnfnwrap(parse_keyword_only, filearg='file_input')
+wrapped_generator = fnfnwrap(parse_generator)
+
+
+def parse_many(a, b, c, d):
+    return a
+
+def stacked(fn, count):
+    for index in range(count):
+        fn = fnfnwrap(fn, filearg=index)
+    return fn
+
+
+def report(name, seconds, baseline, number):
+    print('{name:<40} {per:8.1f} ns/call  (+{extra:6.1f} ns)'.format(
+        name=name, per=seconds / number * 1e9,
+        extra=(seconds - baseline) / number * 1e9,
+        ))
+
+
+def main(number=1000000, repeat=5):
+    with open(data_filename) as fileobj:
+        cases = [
+            ('direct call', lambda: parse(fileobj)),
+            ('wrapped, positional file object', lambda: wrapped_parse(fileobj)),
+            ('wrapped, keyword file object',
+             lambda: wrapped_parse(file_input=fileobj)),
+            ('wrapped, keyword-only file object',
+             lambda: wrapped_keyword_only(file_input=fileobj)),
+            ('direct generator call', lambda: parse_generator(fileobj)),
+            ('wrapped generator, file object',
+             lambda: wrapped_generator(fileobj)),
+            ]
+        baseline = None
+        for name, stmt in cases:
+            seconds = min(timeit.repeat(stmt, number=number, repeat=repeat))
+            if name.startswith('direct'):
+                baseline = seconds
+            report(name, seconds, baseline, number)
+        number //= 10
+        seconds = min(timeit.repeat(
+            lambda: wrapped_parse(data_filename), number=number, repeat=repeat
+            ))
+        report('wrapped, file name (opens file)', seconds, 0, number)
+        number *= 10
+        baseline = min(timeit.repeat(
+            lambda: parse_many(fileobj, fileobj, fileobj, fileobj),
+            number=number, repeat=repeat,
+            ))
+        for count in (1, 2, 4):
+            fn = stacked(parse_many, count)
+            seconds = min(timeit.repeat(
+                lambda: fn(fileobj, fileobj, fileobj, fileobj),
+                number=number, repeat=repeat,
+                ))
+            report('{} stacked decorators, file objects'.format(count),
+                   seconds, baseline, number)
+
+
+if __name__ == '__main__':
+    main()
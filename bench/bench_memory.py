@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Measurement of the memory taken by each `@fnfnwrap` wrapper (not counting
+the wrapped functions themselves) when many functions are decorated with the
+same configuration, as plugin systems do. Run from the repository root with
+`python3 bench/bench_memory.py`.
+"""
+__all__ = ()
+
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pyfnfn import fnfnwrap
+
+
+def make_plugin(index):
+    def plugin(file_input, *, scale=index):
+        """Plugin reading a file."""
+        return scale
+    return plugin
+
+
+class Plugin(object):
+
+    @fnfnwrap(filearg='file_input')
+    def run(self, file_input):
+        return self
+
+
+def measure(build, count):
+    """Measure the memory in bytes per item kept alive by `build(count)`."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        items = build(count)
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del items
+    return (after - before) / count
+
+
+def main(count=100000):
+    functions = [ make_plugin(index) for index in range(count) ]
+    plugins = [ Plugin() for _ in range(count) ]
+    cases = [
+        ('wrapper, default options',
+         lambda n: [ fnfnwrap(fn) for fn in functions[:n] ]),
+        ('wrapper, shared open() arguments',
+         lambda n: [ fnfnwrap(fn, mode='rb', buffering=0)
+                     for fn in functions[:n] ]),
+        ('wrapper, two file arguments',
+         lambda n: [ fnfnwrap(fn, filearg=[0, 'scale'])
+                     for fn in functions[:n] ]),
+        ('bound method wrapper',
+         lambda n: [ plugin.run for plugin in plugins[:n] ]),
+        ]
+    for name, build in cases:
+        print('{name:<40} {size:8.1f} bytes/wrapper'.format(
+            name=name, size=measure(build, count),
+            ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Microbenchmark of method calls through `@fnfnwrap` wrappers, which
+go through `FunctionFilenameWrapper.__get__` on every attribute access.
+Run from the repository root with `python3 bench/bench_methods.py`.
+"""
+__all__ = ()
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pyfnfn import fnfnwrap
+
+this_dir = os.path.dirname(os.path.abspath(__file__))
+data_filename = os.path.join(this_dir, os.pardir, 'test', 'data.txt')
+
+
+class Parser(object):
+
+    def plain(self, file_input):
+        return self
+
+    @fnfnwrap(filearg='file_input')
+    def wrapped(self, file_input):
+        return self
+
+
+def main(number=200000, repeat=5):
+    parser = Parser()
+    with open(data_filename) as fileobj:
+        cases = [
+            ('plain method call', lambda: parser.plain(fileobj)),
+            ('wrapped method lookup only', lambda: parser.wrapped),
+            ('wrapped method call, file object',
+             lambda: parser.wrapped(fileobj)),
+            ]
+        for name, stmt in cases:
+            seconds = min(timeit.repeat(stmt, number=number, repeat=repeat))
+            print('{name:<40} {rate:10.0f} calls/s  {per:8.1f} ns/call'.format(
+                name=name, rate=number / seconds, per=seconds / number * 1e9,
+                ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Run the benchmark cases of `bench/suite.py`, optionally writing the
+results as JSON and comparing them against a previously saved baseline.
+Run from the repository root, for example:
+
+    python3 bench/run.py -k overhead --output before.json
+    python3 bench/run.py -k overhead --baseline before.json
+
+Comparing against a baseline exits with a non-zero status when any case
+became slower than the baseline by more than the threshold ratio.
+"""
+__all__ = ()
+
+import argparse
+import contextlib
+import fnmatch
+import json
+import os
+import platform
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from suite import CASES
+
+
+def measure(fn, repeat, min_time):
+    """Measure the fastest time per call of `fn` in nanoseconds over
+    `repeat` rounds, each lasting at least about `min_time` seconds.
+    """
+    timer = timeit.Timer(fn)
+    number, seconds = timer.autorange()
+    if seconds < min_time:
+        number = max(number, int(number * min_time / max(seconds, 1e-9)))
+    return min(timer.repeat(repeat, number)) / number * 1e9
+
+
+def select(patterns):
+    """Select names of cases matching any of the glob `patterns` (or
+    containing any of them as a substring).
+    """
+    if not patterns:
+        return list(CASES)
+    return [
+        name for name in CASES
+        if any(pattern in name or fnmatch.fnmatchcase(name, pattern)
+               for pattern in patterns)
+        ]
+
+
+def run(names, repeat, min_time):
+    """Run the given cases inside a scratch directory and return a mapping
+    from case names to nanoseconds per call.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='pyfnfn-bench-') as directory:
+        for name in names:
+            with contextlib.ExitStack() as resources:
+                fn = CASES[name](directory, resources)
+                results[name] = measure(fn, repeat, min_time)
+            print('{name:<44} {ns:12.1f} ns/call'.format(
+                name=name, ns=results[name],
+                ), flush=True)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print ratios against the baseline and return names of the cases
+    slower than the baseline by more than `threshold`.
+    """
+    regressions = []
+    print()
+    for name, ns in results.items():
+        if name not in baseline:
+            continue
+        ratio = ns / baseline[name]
+        flag = ''
+        if ratio > threshold:
+            regressions.append(name)
+            flag = '  << regression'
+        print('{name:<44} {ratio:6.2f}x{flag}'.format(
+            name=name, ratio=ratio, flag=flag,
+            ))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument(
+        '-k', dest='patterns', action='append', default=[],
+        help='only run cases matching this glob pattern or substring '
+             '(may be repeated)',
+        )
+    parser.add_argument(
+        '-l', '--list', action='store_true',
+        help='list the selected cases without running them',
+        )
+    parser.add_argument(
+        '--repeat', type=int, default=5,
+        help='number of timing rounds per case (default: %(default)s)',
+        )
+    parser.add_argument(
+        '--min-time', type=float, default=0.2,
+        help='minimum seconds per timing round (default: %(default)s)',
+        )
+    parser.add_argument(
+        '-o', '--output', help='write the results as JSON to this file',
+        )
+    parser.add_argument(
+        '-b', '--baseline', help='compare against the JSON results file',
+        )
+    parser.add_argument(
+        '--threshold', type=float, default=1.25,
+        help='slowdown ratio against the baseline reported as a '
+             'regression (default: %(default)s)',
+        )
+    options = parser.parse_args(argv)
+
+    names = select(options.patterns)
+    if options.list:
+        print('\n'.join(names))
+        return 0
+    results = run(names, options.repeat, options.min_time)
+    if options.output:
+        with open(options.output, 'w') as fileobj:
+            json.dump({
+                'python': platform.python_version(),
+                'implementation': platform.python_implementation(),
+                'platform': platform.platform(),
+                'results': results,
+                }, fileobj, indent=2, sort_keys=True)
+            fileobj.write('\n')
+    if options.baseline:
+        with open(options.baseline) as fileobj:
+            baseline = json.load(fileobj)['results']
+        if compare(results, baseline, options.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,316 @@
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Benchmark cases of `@fnfnwrap` wrappers, run by `bench/run.py`.
+
+Each case is a function registered with `@case` which receives a scratch
+directory and a `contextlib.ExitStack` for resources to be released after
+the case, and returns a callable to be timed. Cases measuring the wrapper
+overhead pass file objects so that no I/O is involved; cases opening files
+read the whole content so that the results reflect I/O sizes and options.
+"""
+__all__ = ('CASES', 'case')
+
+import collections
+import concurrent.futures
+import functools
+import os
+import subprocess
+import sys
+
+import pyfnfn
+from pyfnfn import fnfnwrap
+
+CASES = collections.OrderedDict()
+
+FILE_SIZES = collections.OrderedDict([
+    ('4k', 4 << 10),
+    ('1m', 1 << 20),
+    ('16m', 16 << 20),
+    ])
+
+
+def case(name):
+    """Register a benchmark case under `name`."""
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+def make_file(directory, size):
+    """Create a text file of about `size` bytes of numbered lines."""
+    filename = os.path.join(directory, 'data-{}.txt'.format(size))
+    if not os.path.exists(filename):
+        line = '0123456789 ' * 7 + '\n'
+        with open(filename, 'w') as fileobj:
+            fileobj.write(line * (size // len(line) + 1))
+    return filename
+
+
+##############################
+##  Wrapper overhead cases  ##
+##############################
+
+def parse(file_input, scale=1):
+    return scale
+
+def parse_keyword_only(*, file_input, scale=1):
+    return scale
+
+def parse_default(file_input=sys.stdin, scale=1):
+    return scale
+
+def parse_generator(file_input):
+    yield file_input
+
+def parse_four(a, b, c, d):
+    return a
+
+class Parser(object):
+    def parse(self, file_input):
+        return self
+
+wrapped_parse = fnfnwrap(parse)
+wrapped_parse_keyword_only = fnfnwrap(parse_keyword_only, filearg='file_input')
+wrapped_parse_default = fnfnwrap(parse_default)
+wrapped_parse_generator = fnfnwrap(parse_generator)
+wrapped_parse_four = parse_four
+for _index in range(4):
+    wrapped_parse_four = fnfnwrap(wrapped_parse_four, filearg=_index)
+
+class DuckReader(object):
+    def read(self, size=-1):
+        return ''
+
+class WrappedParser(object):
+    @fnfnwrap(filearg='file_input')
+    def parse(self, file_input):
+        return self
+
+
+@case('overhead/direct')
+def _(directory, resources):
+    fileobj = resources.enter_context(open(make_file(directory, 16)))
+    return lambda: parse(fileobj)
+
+@case('overhead/positional-file-object')
+def _(directory, resources):
+    fileobj = resources.enter_context(open(make_file(directory, 16)))
+    return lambda: wrapped_parse(fileobj)
+
+@case('overhead/keyword-file-object')
+def _(directory, resources):
+    fileobj = resources.enter_context(open(make_file(directory, 16)))
+    return lambda: wrapped_parse(file_input=fileobj)
+
+@case('overhead/keyword-only-file-object')
+def _(directory, resources):
+    fileobj = resources.enter_context(open(make_file(directory, 16)))
+    return lambda: wrapped_parse_keyword_only(file_input=fileobj)
+
+@case('overhead/default-argument')
+def _(directory, resources):
+    return lambda: wrapped_parse_default()
+
+@case('overhead/generator-file-object')
+def _(directory, resources):
+    fileobj = resources.enter_context(open(make_file(directory, 16)))
+    return lambda: wrapped_parse_generator(fileobj)
+
+@case('overhead/bound-method-direct')
+def _(directory, resources):
+    fileobj = resources.enter_context(open(make_file(directory, 16)))
+    parser = Parser()
+    return lambda: parser.parse(fileobj)
+
+@case('overhead/bound-method-file-object')
+def _(directory, resources):
+    fileobj = resources.enter_context(open(make_file(directory, 16)))
+    parser = WrappedParser()
+    return lambda: parser.parse(fileobj)
+
+@case('overhead/duck-typed-file-object')
+def _(directory, resources):
+    reader = DuckReader()
+    return lambda: wrapped_parse(reader)
+
+@case('overhead/stacked-4-file-objects')
+def _(directory, resources):
+    fileobj = resources.enter_context(open(make_file(directory, 16)))
+    return lambda: wrapped_parse_four(fileobj, fileobj, fileobj, fileobj)
+
+######################################
+##  Importing and decorating cases  ##
+######################################
+
+def run_python(code, cache_dir):
+    """Run `code` in a fresh interpreter importing this copy of pyfnfn,
+    whose bytecode is cached in `cache_dir` (python3.8+) as it would be
+    once installed, rather than compiled again by every run.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(pyfnfn.__file__)))
+    env = dict(os.environ, PYTHONPYCACHEPREFIX=cache_dir)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    subprocess.check_call([sys.executable, '-c', code], cwd=root, env=env)
+
+@case('import/interpreter')
+def _(directory, resources):
+    return lambda: run_python('pass', directory)
+
+@case('import/pyfnfn')
+def _(directory, resources):
+    return lambda: run_python('import pyfnfn', directory)
+
+@case('import/pyfnfn-and-decorate')
+def _(directory, resources):
+    return lambda: run_python(
+        'import pyfnfn\n'
+        '@pyfnfn.fnfnwrap(mode="rb")\n'
+        'def parse(file_input): pass\n',
+        directory,
+        )
+
+@case('decorate/function')
+def _(directory, resources):
+    return lambda: fnfnwrap(parse)
+
+@case('decorate/function-open-kwargs')
+def _(directory, resources):
+    return lambda: fnfnwrap(parse, mode='rb', buffering=0)
+
+@case('decorate/closure')
+def _(directory, resources):
+    def decorate_closure(scale):
+        @fnfnwrap
+        def parse_scaled(file_input):
+            return scale
+        return parse_scaled
+    return lambda: decorate_closure(2)
+
+@case('decorate/wrapped-function')
+def _(directory, resources):
+    wrapped = functools.wraps(parse)(lambda *args, **kwargs: None)
+    return lambda: fnfnwrap(wrapped)
+
+##################################
+##  Opening file names and I/O  ##
+##################################
+
+@case('open/positional-file-name')
+def _(directory, resources):
+    filename = make_file(directory, 16)
+    return lambda: wrapped_parse(filename)
+
+@case('open/keyword-file-name')
+def _(directory, resources):
+    filename = make_file(directory, 16)
+    return lambda: wrapped_parse(file_input=filename)
+
+@case('open/generator-file-name')
+def _(directory, resources):
+    filename = make_file(directory, 16)
+    return lambda: list(wrapped_parse_generator(filename))
+
+@case('open/bound-method-file-name')
+def _(directory, resources):
+    filename = make_file(directory, 16)
+    parser = WrappedParser()
+    return lambda: parser.parse(filename)
+
+@case('open/stacked-4-file-names')
+def _(directory, resources):
+    filename = make_file(directory, 16)
+    return lambda: wrapped_parse_four(filename, filename, filename, filename)
+
+def _register_thread_cases():
+    # One wrapper shared by all threads, each call given its own file
+    for threads in (1, 8):
+        def setup(directory, resources, threads=threads):
+            filename = make_file(directory, 16)
+            executor = resources.enter_context(
+                concurrent.futures.ThreadPoolExecutor(threads)
+                )
+            filenames = [filename] * 256
+            return lambda: list(executor.map(wrapped_parse, filenames))
+        case('open/threads-{}-256-file-names'.format(threads))(setup)
+
+_register_thread_cases()
+
+
+def read_all(file_input):
+    return file_input.read()
+
+def read_lines(file_input):
+    for line in file_input:
+        yield line
+
+OPEN_KWARGS = collections.OrderedDict([
+    ('text', {}),
+    ('text-utf8', {'encoding': 'utf-8'}),
+    ('text-latin1', {'encoding': 'latin-1'}),
+    ('binary', {'mode': 'rb'}),
+    ('binary-unbuffered', {'mode': 'rb', 'buffering': 0}),
+    ('binary-buffer-1m', {'mode': 'rb', 'buffering': 1 << 20}),
+    ])
+
+def _register_io_cases():
+    for size_name, size in FILE_SIZES.items():
+        for kwargs_name, open_kwargs in OPEN_KWARGS.items():
+            def setup(directory, resources, size=size,
+                      open_kwargs=open_kwargs):
+                filename = make_file(directory, size)
+                wrapper = fnfnwrap(read_all, **open_kwargs)
+                return lambda: wrapper(filename)
+            case('io/read-{}/{}'.format(size_name, kwargs_name))(setup)
+        def setup(directory, resources, size=size):
+            filename = make_file(directory, size)
+            wrapper = fnfnwrap(read_lines)
+            return lambda: sum(1 for _ in wrapper(filename))
+        case('io/generator-lines-{}/text'.format(size_name))(setup)
+
+_register_io_cases()
+
+
+###################################################
+##  Adaptive buffering with warm and cold cache  ##
+###################################################
+
+ACCESS_OPTIONS = collections.OrderedDict([
+    ('default', {}),
+    ('adaptive', {'access': True}),
+    ('sequential', {'access': 'sequential'}),
+    ('once', {'access': 'once'}),
+    ])
+
+def drop_cache(filename):
+    """Evict the pages of `filename` from the page cache, so that the next
+    read comes from the disk (unless the content was modified since).
+    """
+    fd = os.open(filename, os.O_RDONLY)
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+def _register_cache_cases():
+    # Lines of binary files are iterated over, since the buffer size
+    # determines how often the buffer is refilled by a system call
+    for size_name, size in FILE_SIZES.items():
+        for options_name, options in ACCESS_OPTIONS.items():
+            def setup(directory, resources, size=size, options=options):
+                filename = make_file(directory, size)
+                wrapper = fnfnwrap(read_lines, mode='rb', **options)
+                return lambda: sum(1 for _ in wrapper(filename))
+            case('cache/warm-{}/{}'.format(size_name, options_name))(setup)
+            if not hasattr(os, 'posix_fadvise'):
+                continue
+            def setup(directory, resources, size=size, options=options):
+                filename = make_file(directory, size)
+                wrapper = fnfnwrap(read_lines, mode='rb', **options)
+                def run():
+                    drop_cache(filename)
+                    return sum(1 for _ in wrapper(filename))
+                return run
+            case('cache/cold-{}/{}'.format(size_name, options_name))(setup)
+
+_register_cache_cases()
@@ -0,0 +1,152 @@
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Opening of files for reading with buffers sized after the files
+themselves and with hints to the kernel (through `os.posix_fadvise()`)
+about how their content is going to be accessed. Hints are skipped on
+platforms without `os.posix_fadvise()`.
+"""
+
+__all__ = ('ACCESS_PATTERNS', 'DropBehindFile', 'buffer_size',
+           'open_advised')
+
+import collections
+import io
+import os
+import stat
+
+from .utils import wrap_raw_file
+
+# Declared access patterns along with the largest buffer size chosen for
+# each of them: random accesses only need a block at a time, whereas
+# sequential scans make fewer system calls with larger buffers
+ACCESS_PATTERNS = collections.OrderedDict([
+    ('normal', 128 << 10),
+    ('sequential', 1 << 20),
+    ('random', 0),
+    ('willneed', 1 << 20),
+    ('once', 1 << 20),
+    ])
+
+# Amount of content read by `DropBehindFile` between two hints to drop it
+_DROP_WINDOW = 8 << 20
+
+_fadvise = getattr(os, 'posix_fadvise', None)
+
+
+def _check_access(access):
+    """Check the value given to the 'access' option (see `open_advised`)."""
+    if access is True:
+        return 'normal'
+    if access not in ACCESS_PATTERNS:
+        raise ValueError(
+            'unknown access pattern {access!r}: expected one of {choices}'
+            .format(access=access, choices=', '.join(
+                repr(choice) for choice in ACCESS_PATTERNS
+                ))
+            )
+    return access
+
+
+def buffer_size(st, access='normal'):
+    """Choose the size of the buffer for reading a file.
+
+    Args:
+        st: Result of `os.stat()` on the file
+        access: Declared access pattern (see `ACCESS_PATTERNS`)
+    Returns:
+        The size of the whole file rounded up to the block size of the file
+        system, but between one block and the largest size for `access`;
+        or `None` if the file is not a regular file (such as a pipe)
+    """
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    block = getattr(st, 'st_blksize', 0) or io.DEFAULT_BUFFER_SIZE
+    size = max(-(-st.st_size // block) * block, block)
+    return min(size, max(ACCESS_PATTERNS[access], block))
+
+
+class DropBehindFile(io.FileIO):
+    """Raw binary file object for files read only once, which advises the
+    kernel to drop the pages of content already read from the page cache,
+    every few megabytes as well as when closed. Large scans thereby do not
+    evict the pages of other files which are still needed.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._dropped = 0
+        self._pending = 0
+
+    def readinto(self, buffer):
+        size = super().readinto(buffer)
+        if size:
+            self._advance(size)
+        return size
+
+    def read(self, size=-1):
+        content = super().read(size)
+        if content:
+            self._advance(len(content))
+        return content
+
+    def _advance(self, size):
+        self._pending += size
+        if self._pending < _DROP_WINDOW:
+            return
+        pos = self.tell()
+        start = self._dropped if self._dropped < pos else 0
+        if pos > start:
+            _fadvise(self.fileno(), start, pos - start,
+                     os.POSIX_FADV_DONTNEED)
+        self._dropped = pos
+        self._pending = 0
+
+    def close(self):
+        if not self.closed and self.closefd:
+            try:
+                # Zero length stands for everything up to the end of file
+                _fadvise(self.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+            except OSError:
+                pass
+        super().close()
+
+
+def open_advised(file, mode='r', buffering=-1, encoding=None, errors=None,
+                 newline=None, closefd=True, opener=None, *,
+                 access='normal'):
+    """Open a file for reading like built-in function `open()` does, except
+    that the default buffer size is chosen by `buffer_size()` from the size
+    of the file, and the kernel is advised of the access pattern `access`:
+
+    - 'normal': no hint, only the adaptive buffer size
+    - 'sequential': aggressive read-ahead for reading from start to end
+    - 'random': no read-ahead, with buffers of a single block
+    - 'willneed': sequential, with the whole file read ahead immediately
+    - 'once': sequential, dropping content from the page cache once read
+      (see `DropBehindFile`)
+    """
+    if set(mode) - set('rbt'):
+        raise ValueError(
+            'advised files can only be opened for reading, not {mode!r}'
+            .format(mode=mode)
+            )
+    if access == 'once' and _fadvise is not None:
+        raw = DropBehindFile(file, 'rb', closefd, opener=opener)
+    else:
+        raw = io.FileIO(file, 'rb', closefd, opener=opener)
+    try:
+        st = os.fstat(raw.fileno())
+        if buffering < 0:
+            buffering = buffer_size(st, access) or io.DEFAULT_BUFFER_SIZE
+        if _fadvise is not None and stat.S_ISREG(st.st_mode):
+            fd = raw.fileno()
+            if access == 'random':
+                _fadvise(fd, 0, 0, os.POSIX_FADV_RANDOM)
+            elif access != 'normal':
+                _fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            if access == 'willneed':
+                _fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except BaseException:
+        raw.close()
+        raise
+    return wrap_raw_file(raw, mode, buffering, encoding, errors, newline)
@@ -0,0 +1,99 @@
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Support for coroutine functions and asynchronous generator functions,
+whose files are opened and closed off the event loop.
+"""
+
+__all__ = ('make_async_dispatcher',)
+
+import asyncio
+import contextlib
+import functools
+import inspect
+
+
+def _enter_file(filearg, file_input):
+    """Open the file name `file_input` given to `filearg` and enter its
+    context, returning both the context manager and the file object.
+    """
+    context = filearg.open_file(file_input)
+    return context, context.__enter__()
+
+
+def _exit_in_executor(loop, context):
+    """Construct an exit callback for `contextlib.AsyncExitStack` which
+    exits `context` in the default executor of `loop`.
+    """
+    async def exit_callback(exc_type, exc, tb):
+        return await loop.run_in_executor(
+            None, context.__exit__, exc_type, exc, tb
+            )
+    return exit_callback
+
+
+async def _open_files(stack, args, kwargs, pending):
+    """Asynchronous version of `decorators._open_files` where the files
+    are opened (and later closed) in the default executor of the running
+    event loop so that blocking system calls do not stall the loop.
+    """
+    loop = asyncio.get_running_loop()
+    for filearg, key, file_input in pending:
+        context, fileobj = await loop.run_in_executor(
+            None, _enter_file, filearg, file_input
+            )
+        stack.push_async_exit(_exit_in_executor(loop, context))
+        if type(key) is int:
+            args[key] = fileobj  # replace original arguments
+        else:
+            kwargs[key] = fileobj  # replace original arguments
+
+
+def make_async_dispatcher(fn, fileargs, collect_pending):
+    """Construct the call dispatcher of a wrapper over a coroutine function
+    or an asynchronous generator function. Refer to the function
+    `decorators._make_dispatcher` for the synchronous counterpart.
+
+    Args:
+        fn: Original function being wrapped
+        fileargs: Tuple of `FileArgument` specifications
+        collect_pending: Function finding file arguments to be opened
+            (see `decorators._collect_pending`)
+    Returns:
+        A function with the same call interface as the wrapper
+    """
+    if inspect.isasyncgenfunction(fn):
+        # Delegate to the original asynchronous generator manually since
+        # there is no `yield from` counterpart for asynchronous generators.
+        @functools.wraps(fn)
+        async def wrapper(args, kwargs, pending):
+            async with contextlib.AsyncExitStack() as stack:
+                await _open_files(stack, args, kwargs, pending)
+                agen = fn(*args, **kwargs)
+                try:
+                    value = await agen.__anext__()
+                    while True:
+                        try:
+                            sent = yield value
+                        except GeneratorExit:
+                            await agen.aclose()
+                            raise
+                        except BaseException as e:
+                            value = await agen.athrow(e)
+                        else:
+                            value = await agen.asend(sent)
+                except StopAsyncIteration:
+                    return
+    else:
+        @functools.wraps(fn)
+        async def wrapper(args, kwargs, pending):
+            async with contextlib.AsyncExitStack() as stack:
+                await _open_files(stack, args, kwargs, pending)
+                return await fn(*args, **kwargs)
+
+    def dispatch(*args, **kwargs):
+        pending = collect_pending(fileargs, args, kwargs)
+        if pending is None:
+            return fn(*args, **kwargs)
+        return wrapper(list(args), kwargs, pending)
+
+    return dispatch
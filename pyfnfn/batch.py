@@ -0,0 +1,140 @@
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Running a wrapped function over many file inputs with a pool of
+workers, streaming back the results as they finish.
+"""
+
+__all__ = ('BatchResult', 'get_executor', 'map_files')
+
+import collections
+import concurrent.futures
+import itertools
+import os
+
+from .utils import place_file_input
+
+BatchResult = collections.namedtuple(
+    'BatchResult', ('file_input', 'value', 'error')
+    )
+BatchResult.__doc__ = """\
+Outcome of calling a wrapped function over one file input in a batch.
+
+Attributes:
+    file_input: File name (or file object) given to the function
+    value: Value returned by the function (`None` if it failed)
+    error: Exception raised by the function (`None` if it succeeded)
+"""
+
+_EXECUTORS = {
+    'thread': concurrent.futures.ThreadPoolExecutor,
+    'process': concurrent.futures.ProcessPoolExecutor,
+    }
+
+
+def get_executor(executor, workers=None):
+    """Obtain the pool of workers specified by `executor`.
+
+    Args:
+        executor: Either 'thread' or 'process' to create a new pool of
+            that kind, or an existing `concurrent.futures.Executor`
+        workers: Number of workers of a new pool (default of the pool if
+            `None`)
+    Returns:
+        A tuple of the executor and a boolean indicating whether it is
+        newly created (and thus must be shut down by the caller)
+    """
+    if not isinstance(executor, str):
+        return executor, False
+    try:
+        executor_cls = _EXECUTORS[executor]
+    except KeyError:
+        raise ValueError(
+            'executor must be one of {names!r} or an Executor, not {exe!r}'
+            .format(names=tuple(_EXECUTORS), exe=executor)
+            ) from None
+    return executor_cls(max_workers=workers), True
+
+
+def _call_one(wrapper, file_input, args, kwargs):
+    """Call `wrapper` with `file_input` given as its first file argument
+    inside a worker. Results of generator functions are collected into
+    lists since generators cannot outlive the worker.
+    """
+    args, kwargs = place_file_input(
+        wrapper.fileargs[0], file_input, args, kwargs
+        )
+    value = wrapper(*args, **kwargs)
+    if wrapper.is_generator:
+        value = list(value)
+    return value
+
+
+def map_files(wrapper, file_inputs, args=(), kwargs=None, *,
+              executor='thread', workers=None, max_inflight=None,
+              ordered=False):
+    """Call `wrapper` once for each file input using a pool of workers.
+
+    Args:
+        wrapper: A `FunctionFilenameWrapper` (which must be picklable
+            for process pools)
+        file_inputs: Iterable of file names (or file objects for thread
+            pools) given in turn to the first file argument of `wrapper`
+        args: Other positional arguments for each call
+        kwargs: Other keyword arguments for each call
+        executor: Either 'thread' or 'process' to run the calls on a new
+            pool of that kind which is shut down at the end, or an existing
+            `concurrent.futures.Executor` which is left running
+        workers: Number of workers of a new pool (default of the pool if
+            `None`)
+        max_inflight: Maximum number of calls submitted but not yet
+            yielded, which also caps the number of files opened at once
+            (twice `workers`, or twice the number of CPUs, if `None`)
+        ordered: Whether to yield results in the order of `file_inputs`
+            instead of in the order in which they finish
+    Yields:
+        A `BatchResult` for each file input; a failure of one call is
+        reported in its result without cancelling the others
+    """
+    kwargs = kwargs or {}
+    pool, owned = get_executor(executor, workers)
+    if max_inflight is None:
+        max_inflight = 2 * (workers or os.cpu_count() or 1)
+    if max_inflight < 1:
+        raise ValueError('max_inflight must be positive')
+
+    inputs = iter(enumerate(file_inputs))
+    futures = {}  # future -> (index, file_input)
+    finished = {}  # index -> BatchResult, for ordered results only
+    next_index = 0
+    try:
+        while True:
+            # Top up submitted calls to the limit
+            for index, file_input in itertools.islice(
+                    inputs, max_inflight - len(futures) - len(finished)):
+                future = pool.submit(
+                    _call_one, wrapper, file_input, args, kwargs
+                    )
+                futures[future] = (index, file_input)
+            if not futures and not finished:
+                return
+            done, _ = concurrent.futures.wait(
+                futures, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+            for future in done:
+                index, file_input = futures.pop(future)
+                error = future.exception()
+                result = BatchResult(
+                    file_input, None if error else future.result(), error
+                    )
+                if ordered:
+                    finished[index] = result
+                else:
+                    yield result
+            while next_index in finished:
+                yield finished.pop(next_index)
+                next_index += 1
+    finally:
+        for future in futures:
+            future.cancel()
+        if owned:
+            pool.shutdown(wait=True)
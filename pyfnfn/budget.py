@@ -0,0 +1,248 @@
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Budget of file descriptors shared by files opened for reading, where
+idle files are transparently closed once the budget is exhausted and then
+reopened at their saved offsets when they are read again.
+"""
+
+__all__ = ('DescriptorBudget', 'SuspendableFile', 'default_budget',
+           'open_suspendable')
+
+import collections
+import errno
+import io
+import os
+import threading
+import weakref
+
+from .utils import wrap_raw_file
+
+
+def _default_limit():
+    """Half of the soft limit on open file descriptors of the process (or
+    256 where the limit cannot be found), leaving room for other files.
+    """
+    try:
+        import resource
+        soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    except (ImportError, OSError, ValueError):
+        return 256
+    if soft == resource.RLIM_INFINITY:
+        return 4096
+    return max(soft // 2, 1)
+
+
+class DescriptorBudget(object):
+    """Thread-safe limit on the number of descriptors held by the
+    `SuspendableFile` objects opened under it.
+
+    When a file needs a descriptor while `limit` of them are in use, the
+    least recently used file which is not in the middle of an operation is
+    suspended: its descriptor is closed and its offset saved. A suspended
+    file is reopened on its next operation, failing with `OSError` if the
+    file name now refers to a different file. The limit is exceeded rather
+    than waited upon if every file holding a descriptor is busy.
+
+    Attributes:
+        limit: Maximum number of descriptors held at once (may be changed,
+            taking effect on the next file needing a descriptor)
+        suspensions: Number of files suspended to free a descriptor
+        resumptions: Number of suspended files reopened
+    """
+
+    def __init__(self, limit=None):
+        if limit is None:
+            limit = _default_limit()
+        if limit < 1:
+            raise ValueError('limit must be positive')
+        self.limit = limit
+        self.suspensions = 0
+        self.resumptions = 0
+        # Reentrant since closing a collected file may happen at any time
+        self._lock = threading.RLock()
+        # Weak references to files holding descriptors, keyed by their ids
+        self._holders = collections.OrderedDict()
+
+    def __reduce__(self):
+        if self is default_budget:
+            return 'default_budget'
+        return type(self), (self.limit,)
+
+    def __len__(self):
+        return len(self._holders)
+
+    def _checkout(self, fileobj):
+        """Mark `fileobj` busy and make sure that it holds a descriptor."""
+        with self._lock:
+            fileobj._busy += 1
+            if fileobj._raw is not None:
+                self._holders.move_to_end(id(fileobj))
+                return
+            try:
+                excess = len(self._holders) - self.limit + 1
+                for key, ref in list(self._holders.items()):
+                    if excess <= 0:
+                        break
+                    holder = ref()
+                    if holder is None or holder._busy:
+                        continue
+                    holder._suspend()
+                    self._holders.pop(key, None)
+                    self.suspensions += 1
+                    excess -= 1
+                if fileobj._resume():
+                    self.resumptions += 1
+            except BaseException:
+                fileobj._busy -= 1
+                raise
+            self._holders[id(fileobj)] = weakref.ref(fileobj)
+
+    def _checkin(self, fileobj):
+        """Mark `fileobj` as no longer busy."""
+        with self._lock:
+            fileobj._busy -= 1
+
+    def _release(self, fileobj):
+        """Forget `fileobj` which is being closed."""
+        with self._lock:
+            self._holders.pop(id(fileobj), None)
+
+
+default_budget = DescriptorBudget()
+
+
+class SuspendableFile(io.RawIOBase):
+    """Raw binary read-only file object whose descriptor may be closed
+    while idle and reopened later at the same offset, under the control
+    of a `DescriptorBudget`.
+
+    Attributes:
+        name: File name being opened
+        budget: The `DescriptorBudget` in control of this file
+    """
+
+    def __init__(self, file, budget, closefd=True, opener=None):
+        self.name = file
+        self.budget = budget
+        self._closefd = closefd
+        self._opener = opener
+        self._raw = None
+        self._offset = 0
+        self._identity = None
+        self._busy = 0
+        budget._checkout(self)
+        budget._checkin(self)
+
+    @property
+    def suspended(self):
+        return self._raw is None and not self.closed
+
+    def _resume(self):
+        """Open the file at the saved offset (called by the budget).
+        Return whether the file is reopened rather than opened anew.
+        """
+        reopened = self._identity is not None
+        raw = open(self.name, 'rb', buffering=0, closefd=self._closefd,
+                   opener=self._opener)
+        try:
+            st = os.fstat(raw.fileno())
+            identity = st.st_dev, st.st_ino
+            if not reopened:
+                self._identity = identity
+            elif identity != self._identity:
+                raise OSError(
+                    errno.ESTALE,
+                    'file was replaced while suspended', self.name,
+                    )
+            if self._offset:
+                raw.seek(self._offset)
+        except BaseException:
+            raw.close()
+            raise
+        self._raw = raw
+        return reopened
+
+    def _suspend(self):
+        """Close the descriptor and save the offset (called by the budget)."""
+        raw, self._raw = self._raw, None
+        try:
+            self._offset = raw.tell()
+        finally:
+            raw.close()
+
+    def readable(self):
+        self._checkClosed()
+        return True
+
+    def seekable(self):
+        self._checkClosed()
+        return True
+
+    def fileno(self):
+        # The descriptor changes whenever the file is suspended
+        self._checkClosed()
+        self.budget._checkout(self)
+        try:
+            return self._raw.fileno()
+        finally:
+            self.budget._checkin(self)
+
+    def tell(self):
+        self._checkClosed()
+        with self.budget._lock:
+            if self._raw is None:
+                return self._offset
+            return self._raw.tell()
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        self._checkClosed()
+        self.budget._checkout(self)
+        try:
+            return self._raw.seek(offset, whence)
+        finally:
+            self.budget._checkin(self)
+
+    def readinto(self, buffer):
+        self._checkClosed()
+        self.budget._checkout(self)
+        try:
+            return self._raw.readinto(buffer)
+        finally:
+            self.budget._checkin(self)
+
+    def close(self):
+        if not self.closed:
+            self.budget._release(self)
+            try:
+                if self._raw is not None:
+                    self._raw.close()
+            finally:
+                self._raw = None
+                super().close()
+
+
+def open_suspendable(file, mode='r', buffering=-1, encoding=None,
+                     errors=None, newline=None, closefd=True, opener=None,
+                     *, budget=None):
+    """Open a file for reading under a descriptor budget. Arguments other
+    than `budget` are as of built-in `open()`.
+
+    Args:
+        file: File name to be opened
+        mode: Mode of opening which must be for reading
+        budget: The `DescriptorBudget` to open the file under (the shared
+            `default_budget` if `None`)
+    Returns:
+        A buffered binary or text file object over a `SuspendableFile`
+    """
+    if set(mode) - set('rbt'):
+        raise ValueError(
+            'suspendable files can only be opened for reading, not {mode!r}'
+            .format(mode=mode)
+            )
+    if buffering == 0 and 'b' not in mode:
+        raise ValueError("can't have unbuffered text I/O")
+    if budget is None:
+        budget = default_budget
+    raw = SuspendableFile(file, budget, closefd, opener)
+    return wrap_raw_file(raw, mode, buffering, encoding, errors, newline)
@@ -0,0 +1,226 @@
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Splitting one large file into newline-aligned byte ranges which are
+processed in parallel by a wrapped function, then combined with a reducer.
+"""
+
+__all__ = ('RangeFile', 'open_range', 'reduce_chunks', 'split_ranges')
+
+import functools
+import io
+import os
+
+from .batch import _call_one, get_executor
+from .lineindex import get_index, line_index_step
+from .utils import is_valid_filename, wrap_raw_file
+
+_MISSING = object()
+
+
+def split_ranges(file, count):
+    """Split a file into at most `count` byte ranges of similar sizes,
+    each of which ends right after a newline (or at the end of file).
+
+    Args:
+        file: File name to be split
+        count: Desired number of ranges
+    Returns:
+        List of pairs `(start, stop)` of non-empty byte ranges covering
+        the whole file in order
+    """
+    if count < 1:
+        raise ValueError('number of chunks must be positive')
+    with open(file, 'rb') as fileobj:
+        size = os.fstat(fileobj.fileno()).st_size
+        boundaries = [0]
+        for index in range(1, count):
+            target = max(size * index // count, boundaries[-1])
+            if target >= size:
+                break
+            # Move the boundary past the end of the line containing
+            # the byte right before the target position
+            fileobj.seek(max(target - 1, 0))
+            fileobj.readline()
+            boundary = min(fileobj.tell(), size)
+            if boundary > boundaries[-1]:
+                boundaries.append(boundary)
+        boundaries.append(size)
+    return [
+        (start, stop)
+        for start, stop in zip(boundaries, boundaries[1:])
+        if start < stop
+        ]
+
+
+class RangeFile(io.RawIOBase):
+    """Raw binary file object exposing only the byte range `[start, stop)`
+    of another binary file object, as if it were the whole file.
+
+    Attributes:
+        raw: The underlying binary file object (closed together)
+        start: Offset of the beginning of the range in `raw`
+        stop: Offset of the end of the range in `raw`
+    """
+
+    def __init__(self, raw, start, stop):
+        self.raw = raw
+        self.start = start
+        self.stop = stop
+        self._pos = 0
+
+    @property
+    def name(self):
+        return self.raw.name
+
+    def readable(self):
+        self._checkClosed()
+        return True
+
+    def seekable(self):
+        self._checkClosed()
+        return True
+
+    def fileno(self):
+        return self.raw.fileno()
+
+    def tell(self):
+        self._checkClosed()
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        self._checkClosed()
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self.stop - self.start + offset
+        else:
+            raise ValueError('invalid whence ({!r})'.format(whence))
+        if pos < 0:
+            raise ValueError('negative seek position {!r}'.format(pos))
+        self._pos = pos
+        return pos
+
+    def readinto(self, buffer):
+        self._checkClosed()
+        remaining = self.stop - self.start - self._pos
+        view = memoryview(buffer).cast('B')
+        if remaining <= 0 or not view:
+            return 0
+        self.raw.seek(self.start + self._pos)
+        size = self.raw.readinto(view[:remaining]) or 0
+        self._pos += size
+        return size
+
+    def close(self):
+        if not self.closed:
+            try:
+                self.raw.close()
+            finally:
+                super().close()
+
+
+def open_range(file, start, stop, mode='r', buffering=-1, encoding=None,
+               errors=None, newline=None, closefd=True, opener=None):
+    """Open a byte range of a file for reading as if it were the whole file.
+    Arguments other than `start` and `stop` are as of built-in `open()`.
+
+    Args:
+        file: File name to be opened
+        start: Offset of the beginning of the range
+        stop: Offset of the end of the range
+    Returns:
+        A buffered binary or text file object over a `RangeFile`
+    """
+    if set(mode) - set('rbt'):
+        raise ValueError(
+            'byte ranges can only be opened for reading, not {mode!r}'
+            .format(mode=mode)
+            )
+    raw = RangeFile(
+        open(file, 'rb', buffering=0, closefd=closefd, opener=opener),
+        start, stop,
+        )
+    return wrap_raw_file(raw, mode, buffering, encoding, errors, newline)
+
+
+def _call_chunk(wrapper, file_input, start, stop, args, kwargs):
+    """Call `wrapper` inside a worker over the byte range `[start, stop)`
+    of `file_input`, opened with the keyword arguments for `open()` of the
+    first file argument of `wrapper`.
+    """
+    filearg = wrapper.fileargs[0]
+    with open_range(file_input, start, stop, **filearg.open_kwargs) as fileobj:
+        return _call_one(wrapper, fileobj, args, kwargs)
+
+
+def reduce_chunks(wrapper, file_input, reducer, args=(), kwargs=None, *,
+                  chunks=None, executor='process', workers=None,
+                  initial=_MISSING):
+    """Split the file `file_input` into newline-aligned byte ranges, call
+    `wrapper` over each of them in parallel with the range given to its
+    first file argument, and combine the results with `reducer`. Ranges
+    hold similar numbers of bytes, or similar numbers of lines if the first
+    file argument has the file option 'line_index'.
+
+    Args:
+        wrapper: A `FunctionFilenameWrapper` (which must be picklable
+            for process pools)
+        file_input: File name of the file to be split
+        reducer: Function of two arguments combining results, applied
+            cumulatively from left to right in the order of the ranges
+        args: Other positional arguments for each call
+        kwargs: Other keyword arguments for each call
+        chunks: Number of ranges to split into (four times the number of
+            workers, or of CPUs, if `None`)
+        executor: Either 'thread' or 'process' to run the calls on a new
+            pool of that kind which is shut down at the end, or an existing
+            `concurrent.futures.Executor` which is left running
+        workers: Number of workers of a new pool (default of the pool if
+            `None`)
+        initial: Optional initial value of the reduction
+    Returns:
+        The combined result
+    Raises:
+        ValueError if the first file argument has file options other than
+        'line_index', since ranges are opened as plain files
+    """
+    if not is_valid_filename(file_input):
+        raise TypeError('only file names can be split into chunks')
+    options = wrapper.fileargs[0].options
+    others = [
+        name for name, value in options.items()
+        if name != 'line_index' and value not in (None, False)
+        ]
+    if others:
+        raise ValueError(
+            'file options cannot be used to split files into chunks: {names}'
+            .format(names=', '.join(others))
+            )
+    kwargs = kwargs or {}
+    if chunks is None:
+        chunks = 4 * (workers or os.cpu_count() or 1)
+    line_index = options['line_index']
+    if line_index:
+        ranges = get_index(
+            file_input, line_index_step(line_index)
+            ).split_ranges(chunks)
+    else:
+        ranges = split_ranges(file_input, chunks)
+    pool, owned = get_executor(executor, workers)
+    futures = []
+    try:
+        for start, stop in ranges:
+            futures.append(pool.submit(
+                _call_chunk, wrapper, file_input, start, stop, args, kwargs
+                ))
+        results = (future.result() for future in futures)
+        if initial is _MISSING:
+            return functools.reduce(reducer, results)
+        return functools.reduce(reducer, results, initial)
+    finally:
+        for future in futures:
+            future.cancel()
+        if owned:
+            pool.shutdown(wait=True)
@@ -0,0 +1,199 @@
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Opening compressed files (gzip, bzip2 and xz) for reading as streams
+of decompressed content, detecting the compression from the magic bytes
+at the beginning of the file or from the file name extension.
+"""
+
+__all__ = ('COMPRESSION_FORMATS', 'DecompressingFile', 'detect_format',
+           'open_decompressed')
+
+import collections
+import importlib
+import io
+import os
+
+from .utils import wrap_text_file
+
+# Supported compression formats along with their magic bytes, the usual
+# file name extensions, and the module and class of their decompressing
+# file objects from the standard library.
+_Format = collections.namedtuple(
+    '_Format', ('magic', 'extensions', 'module', 'factory')
+    )
+COMPRESSION_FORMATS = collections.OrderedDict([
+    ('gzip', _Format(b'\x1f\x8b', ('.gz', '.tgz'), 'gzip', 'GzipFile')),
+    ('bz2', _Format(b'BZh', ('.bz2', '.tbz2'), 'bz2', 'BZ2File')),
+    ('xz', _Format(b'\xfd7zXZ\x00', ('.xz', '.txz', '.lzma'), 'lzma',
+                   'LZMAFile')),
+    ])
+
+_MAGIC_SIZE = max(len(fmt.magic) for fmt in COMPRESSION_FORMATS.values())
+_DETECTION_METHODS = ('auto', 'extension')
+
+
+def detect_format(file=None, head=None):
+    """Detect the compression format of a file.
+
+    Args:
+        file: File name whose extension is examined (if `head` is `None`)
+        head: Bytes at the beginning of the file whose magic bytes are
+            examined
+    Returns:
+        Name of the compression format in `COMPRESSION_FORMATS`, or `None`
+        if the file does not appear to be compressed
+    """
+    if head is not None:
+        for name, fmt in COMPRESSION_FORMATS.items():
+            if head.startswith(fmt.magic):
+                return name
+        return None
+    filename = os.fsdecode(file).lower()
+    for name, fmt in COMPRESSION_FORMATS.items():
+        if filename.endswith(fmt.extensions):
+            return name
+    return None
+
+
+def _check_method(method):
+    """Check the value given to the 'decompress' option (see
+    `open_decompressed`).
+    """
+    if method is True:
+        return 'auto'
+    if method not in _DETECTION_METHODS and method not in COMPRESSION_FORMATS:
+        raise ValueError(
+            'unknown decompression {method!r}: expected one of {choices}'
+            .format(method=method, choices=', '.join(
+                repr(choice)
+                for choice in _DETECTION_METHODS + tuple(COMPRESSION_FORMATS)
+                ))
+            )
+    return method
+
+
+def open_decompressed(file, mode='r', buffering=-1, encoding=None,
+                      errors=None, newline=None, closefd=True, opener=None,
+                      *, method='auto'):
+    """Open a file for reading its decompressed content as a stream,
+    without decompressing it anywhere on disk. Files found not to be
+    compressed are read as they are. Arguments other than `method` are as
+    of built-in `open()`, where `buffering` applies to reading the
+    compressed content.
+
+    Args:
+        file: File name to be opened
+        mode: Mode of opening which must be for reading
+        method: Either 'auto' (or `True`) to detect the compression from
+            the magic bytes at the beginning of the file, 'extension' to
+            detect it from the file name extension, or the name of a format
+            in `COMPRESSION_FORMATS` to always decompress with
+    Returns:
+        A `DecompressingFile` (wrapped in a text file object in text mode)
+        or a regular file object if the file is not compressed
+    """
+    method = _check_method(method)
+    if set(mode) - set('rbt'):
+        raise ValueError(
+            'compressed files can only be opened for reading, not {mode!r}'
+            .format(mode=mode)
+            )
+    if buffering == 0 and 'b' not in mode:
+        raise ValueError("can't have unbuffered text I/O")
+    line_buffering = buffering == 1
+    if buffering in (-1, 0, 1):
+        buffering = io.DEFAULT_BUFFER_SIZE
+    raw = open(file, 'rb', buffering=buffering, closefd=closefd,
+               opener=opener)
+    try:
+        if method == 'auto':
+            fmt = detect_format(head=raw.peek(_MAGIC_SIZE)[:_MAGIC_SIZE])
+        elif method == 'extension':
+            fmt = detect_format(file)
+        else:
+            fmt = method
+        fileobj = raw if fmt is None else DecompressingFile(raw, fmt)
+        if 'b' in mode:
+            return fileobj
+        return wrap_text_file(fileobj, mode, line_buffering, encoding,
+                              errors, newline)
+    except BaseException:
+        raw.close()
+        raise
+
+
+class DecompressingFile(io.BufferedIOBase):
+    """Binary read-only file object of the decompressed content of another
+    binary file object, which is closed together with this object.
+
+    Attributes:
+        raw: The underlying binary file object of compressed content
+        format: Name of the compression format in `COMPRESSION_FORMATS`
+    """
+
+    def __init__(self, raw, format):
+        fmt = COMPRESSION_FORMATS[format]
+        factory = getattr(importlib.import_module(fmt.module), fmt.factory)
+        self.raw = raw
+        self.format = format
+        self._stream = factory(fileobj=raw) if format == 'gzip' \
+            else factory(raw)
+
+    @property
+    def name(self):
+        return self.raw.name
+
+    @property
+    def mode(self):
+        return 'rb'
+
+    def readable(self):
+        self._checkClosed()
+        return True
+
+    def seekable(self):
+        # Seeking works but requires decompressing from the beginning
+        self._checkClosed()
+        return self._stream.seekable()
+
+    def read(self, size=-1):
+        self._checkClosed()
+        return self._stream.read(size)
+
+    def read1(self, size=-1):
+        self._checkClosed()
+        return self._stream.read1(size)
+
+    def readinto(self, buffer):
+        self._checkClosed()
+        return self._stream.readinto(buffer)
+
+    def peek(self, size=0):
+        self._checkClosed()
+        return self._stream.peek(size)
+
+    def readline(self, size=-1):
+        self._checkClosed()
+        return self._stream.readline(size)
+
+    def __iter__(self):
+        self._checkClosed()
+        return iter(self._stream)
+
+    def tell(self):
+        self._checkClosed()
+        return self._stream.tell()
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        self._checkClosed()
+        return self._stream.seek(offset, whence)
+
+    def close(self):
+        if not self.closed:
+            try:
+                self._stream.close()
+            finally:
+                try:
+                    self.raw.close()
+                finally:
+                    super().close()
@@ -0,0 +1,151 @@
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Cache of the contents of small files kept in memory, shared by all
+wrappers in the process, from which in-memory file objects are served
+instead of reading the files again.
+"""
+
+__all__ = ('ContentCache', 'default_content_cache')
+
+import collections
+import io
+import os
+import threading
+
+from .utils import file_identity, wrap_text_file
+
+
+class ContentCache(object):
+    """Thread-safe cache of file contents keyed by absolute file names,
+    holding at most `max_bytes` bytes in total and evicting the least
+    recently used contents beyond that.
+
+    Each lookup validates the cached content with a `stat()` of the file
+    (device, inode, size and modification time), reading the file again
+    whenever it changed. Files larger than `max_file_size`, as well as
+    files opened through a custom opener (whose content may depend on the
+    opener), are opened from disk as usual by `open()` without being read
+    into memory (only `read()` returns their content, without caching it).
+
+    Attributes:
+        max_bytes: Maximum total size of cached contents
+        max_file_size: Maximum size of a file to be cached
+        hits: Number of files served from the cache
+        misses: Number of files read (and cached) from disk
+        evictions: Number of contents evicted to stay within `max_bytes`
+        bypasses: Number of files too large to be cached or opened
+            through a custom opener
+        size: Total size of cached contents
+    """
+
+    def __init__(self, max_bytes=64 << 20, max_file_size=1 << 20):
+        if max_bytes < 1:
+            raise ValueError('max_bytes must be positive')
+        self.max_bytes = max_bytes
+        self.max_file_size = min(max_file_size, max_bytes)
+        self.hits = self.misses = self.evictions = self.bypasses = 0
+        self.size = 0
+        self._lock = threading.Lock()
+        self._contents = collections.OrderedDict()  # name -> (identity, data)
+
+    def __reduce__(self):
+        if self is default_content_cache:
+            return 'default_content_cache'
+        return type(self), (self.max_bytes, self.max_file_size)
+
+    def __len__(self):
+        return len(self._contents)
+
+    def clear(self):
+        """Remove all cached contents."""
+        with self._lock:
+            self._contents.clear()
+            self.size = 0
+
+    def read(self, file, opener=None):
+        """Obtain the content of `file` as bytes, from the cache if valid.
+
+        Args:
+            file: File name to be read
+            opener: Custom opener as of built-in `open()`, with which the
+                content is read from disk and not cached
+        Returns:
+            The content of the file
+        """
+        if opener is not None:
+            with self._lock:
+                self.bypasses += 1
+            with open(file, 'rb', opener=opener) as fileobj:
+                return fileobj.read()
+        path = os.path.abspath(file)
+        return self._read(path, os.stat(path))
+
+    def _read(self, path, st):
+        """Obtain the content of the file at the absolute path `path`
+        whose `stat()` result is `st`, from the cache if valid.
+        """
+        identity = file_identity(st)
+        with self._lock:
+            entry = self._contents.get(path)
+            if entry is not None and entry[0] == identity:
+                self._contents.move_to_end(path)
+                self.hits += 1
+                return entry[1]
+        with open(path, 'rb') as fileobj:
+            identity = file_identity(os.fstat(fileobj.fileno()))
+            if identity[2] > self.max_file_size:
+                with self._lock:
+                    self.bypasses += 1
+                return fileobj.read()
+            data = fileobj.read()
+        with self._lock:
+            self.misses += 1
+            if len(data) != identity[2]:
+                return data  # changed while being read
+            previous = self._contents.pop(path, None)
+            if previous is not None:
+                self.size -= len(previous[1])
+            self._contents[path] = (identity, data)
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                _, (_, evicted) = self._contents.popitem(last=False)
+                self.size -= len(evicted)
+                self.evictions += 1
+        return data
+
+    def open(self, file, mode='r', buffering=-1, encoding=None, errors=None,
+             newline=None, closefd=True, opener=None):
+        """Open a file for reading as an in-memory file object over its
+        cached content. Arguments are as of built-in `open()`, where
+        `buffering` is irrelevant.
+
+        Returns:
+            An `io.BytesIO` (wrapped in `io.TextIOWrapper` decoding with
+            `encoding`, `errors` and `newline` in text mode), or the file
+            object opened by built-in `open()` if the file is too large
+            to be cached or `opener` is given
+        """
+        if set(mode) - set('rbt'):
+            raise ValueError(
+                'cached files can only be opened for reading, not {mode!r}'
+                .format(mode=mode)
+                )
+        if not closefd:
+            raise ValueError('Cannot use closefd=False with file name')
+        if opener is None:
+            path = os.path.abspath(file)
+            st = os.stat(path)
+        if opener is not None or st.st_size > self.max_file_size:
+            with self._lock:
+                self.bypasses += 1
+            return open(file, mode, buffering, encoding, errors, newline,
+                        closefd, opener)
+        # Sharing the bytes object: no copy is made until it is modified
+        fileobj = io.BytesIO(self._read(path, st))
+        fileobj.name = file
+        if 'b' in mode:
+            return fileobj
+        return wrap_text_file(fileobj, mode, False, encoding, errors, newline)
+
+
+default_content_cache = ContentCache()
@@ -9,17 +9,26 @@ the implementation of the original function.
 __all__ = ('FunctionFilenameWrapper', 'fnfnwrap')
 
 import collections
+import collections.abc
+import contextlib
 import functools
 import inspect
-import io
+import itertools
+import operator
+import sys
+import types
 
-from .utils import is_valid_filename, validate_open_kwargs
+from .inputs import (
+    FILE_NAME, FILE_OBJECT, _file_object_types as _file_types, input_kind,
+    )
+from .utils import FILE_OPTIONS, OPEN_PARAMETERS, split_open_kwargs
 
 ############################
 ##  Defining a decorator  ##
 ############################
 
-def fnfnwrap(original_fn=None, *, filearg=0, **open_kwargs):
+def fnfnwrap(original_fn=None, *, filearg=0, memoize=None, stats=None,
+             **open_kwargs):
     """A function decorator which modifies a the function input entry
     point so that it additionally accepts file names without modifying
     the implementation of the original function.
@@ -29,37 +38,371 @@ def fnfnwrap(original_fn=None, *, filearg=0, **open_kwargs):
         filearg: Input argument of the function which accepts file-like
             objects, which can be given as an index of the positional
             argument (as integer) or the name of of the argument itself
-            (as string)
+            (as string). Several file arguments can be given at once as
+            a sequence of such specifiers, or as a mapping from such
+            specifiers to dictionaries of keyword arguments to `open()`
+            which override `open_kwargs` for that particular argument.
+        memoize: A `memoize.ResultCache` (or `True` to create one with
+            default settings) memoizing results keyed on the identity of
+            files given by name along with the other arguments
+        stats: A `stats.WrapperStats` (or `True` to create one) recording
+            counters and histograms of calls, file opening and I/O
         **open_kwargs: Keyword-only arguments for built-in function
             `open()` to be passed through this function when a new file
             is opened. Refer to the document of built-in functions for
             explanation of input arguments to the function `open()`.
+            The following file options are also accepted here:
+            mmap: If true, a file name opened in mode 'rb' is given to
+                the function as a `mmapfile.MappedFile` whose reads are
+                zero-copy `memoryview` slices of the memory-mapped file.
+            handle_pool: A `handles.HandlePool` (or its maximum size to
+                create one) from which handles of files opened for reading
+                are reused across calls instead of being closed.
+            decompress: If true (or 'auto'), a file name opened for reading
+                is decompressed on the fly when its magic bytes show gzip,
+                bzip2 or xz compression (see `compression.open_decompressed`
+                for detecting by 'extension' or forcing a format).
+            prefetch: Number of buffers (or `True` for a default of four)
+                read ahead by a background thread from a file name opened
+                for reading, so that I/O overlaps with the work of the
+                function (typically a slowly consumed generator).
+            fd_budget: A `budget.DescriptorBudget` (or its limit to create
+                one, or `True` for the process-wide `budget.default_budget`)
+                under which idle files opened for reading are closed when
+                descriptors run short and transparently reopened later.
+            write_behind: Number of chunks (or `True` for a default of 16)
+                queued in memory for a file name opened for writing, which
+                are written to disk in batches by a background thread and
+                flushed before the call (or the generator) finishes.
+            durable: If true (or a `durable.GroupCommitter`), a file name
+                opened for overwriting is written to a temporary file which
+                atomically replaces it, synchronized to disk in a group with
+                concurrent commits, once the call (or the generator) ends
+                successfully; it is discarded on exceptions.
+            content_cache: A `contentcache.ContentCache` (or `True` for
+                the process-wide `contentcache.default_content_cache`) in
+                which the contents of small files opened for reading are
+                kept, given to the function as in-memory file objects.
+            line_index: If true (or the number of lines between recorded
+                offsets), a file name opened for reading is given with a
+                `seek_line()` method backed by an index of line offsets
+                persisted in a sidecar file (see `lineindex.get_index`),
+                which also balances the ranges of `reduce_chunks()`.
+            uri: If true (or a `uri.OpenerRegistry`), file names given as
+                URIs of registered schemes are opened by their backends,
+                such as `file://` URIs of local files and `http://` URIs
+                read over pooled keep-alive connections (see the shared
+                `uri.default_registry`); other file names are opened as
+                usual.
+            shards: If true, directories (also as `os.DirEntry` objects)
+                and glob patterns given as file names are read as one file
+                chaining their regular files in the order of their names,
+                opening one at a time (see `shards.open_sharded`).
+            access: If true (or the name of an access pattern such as
+                'sequential', 'random' or 'once'), files are read with
+                buffers sized after the files and the kernel is advised of
+                the access pattern (see `access.open_advised`).
     Returns:
         The same function with file open mechanics.
     """
     if original_fn is None:
-        return functools.partial(fnfnwrap, filearg=filearg, **open_kwargs)
+        return functools.partial(
+            fnfnwrap, filearg=filearg, memoize=memoize, stats=stats,
+            **open_kwargs
+            )
     else:
-        return FunctionFilenameWrapper(original_fn, filearg, open_kwargs)
+        return FunctionFilenameWrapper(
+            original_fn, filearg, open_kwargs, memoize=memoize, stats=stats
+            )
 
-# Add signature to the above function using signature from open()
+# Add signature to the above function using parameters of open()
 _original_parameters = list(
     inspect.signature(fnfnwrap).parameters.values()
     )[:-1]
 _additional_parameters = list(
-    inspect.Parameter(
-        param.name, inspect.Parameter.KEYWORD_ONLY, default=param.default
+    inspect.Parameter(name, inspect.Parameter.KEYWORD_ONLY, default=default)
+    for name, default in itertools.chain(
+        OPEN_PARAMETERS.items(), FILE_OPTIONS.items()
         )
-    for param in inspect.signature(open).parameters.values()
-    )[1:]
+    )
 fnfnwrap.__signature__ = inspect.Signature(
     _original_parameters + _additional_parameters
     )
 
+###########################
+##  Dispatcher factories  ##
+###########################
+
+FileArgument = collections.namedtuple(
+    'FileArgument', ('name', 'pos', 'open_kwargs', 'options', 'open_file')
+    )
+FileArgument.__doc__ = """\
+Resolved specification of a function input argument accepting file objects.
+
+Attributes:
+    name: Name of function input argument accepting file objects
+    pos: Index of positional `name` argument (`None` if keyword-only)
+    open_kwargs: Dictionary of keyword arguments to built-in function
+        `open()` used when a file name is given for this argument
+    options: Dictionary of file options (see `utils.FILE_OPTIONS`)
+    open_file: Function opening a file name given for this argument into
+        a context manager whose entered value is the file object
+        (constructed by `openers.make_file_opener`)
+
+Specifications with the same configuration are shared between wrappers
+(see `_make_filearg`), so their dictionaries must not be modified.
+"""
+
+def _make_filearg(name, pos, open_kwargs, options):
+    """Construct the `FileArgument` of a file argument, interned so that
+    wrappers with the same configuration share a single specification
+    along with its dictionaries and its opener.
+    """
+    from .openers import make_file_opener, opener_is_shareable
+    if opener_is_shareable(options):
+        # Types are part of the key since `True == 1` and yet the options
+        # treat them differently
+        key = (name, pos) + tuple(
+            tuple((kwarg, type(value), value) for kwarg, value in d.items())
+            for d in (open_kwargs, options)
+            )
+        try:
+            return _interned_filearg(key)
+        except TypeError:  # unhashable values are not interned
+            pass
+    return FileArgument(
+        name, pos, open_kwargs, options,
+        make_file_opener(open_kwargs, options),
+        )
+
+@functools.lru_cache(maxsize=1024)
+def _interned_filearg(key):
+    """Construct the `FileArgument` for a key of `_make_filearg`."""
+    from .openers import make_file_opener
+    name, pos, open_items, option_items = key
+    open_kwargs = { kwarg: value for kwarg, _, value in open_items }
+    options = collections.OrderedDict(
+        (kwarg, value) for kwarg, _, value in option_items
+        )
+    return FileArgument(
+        name, pos, open_kwargs, options,
+        make_file_opener(open_kwargs, options),
+        )
+
+_MISSING = object()
+
+# Concrete types already known to be file objects are kept in the set
+# `_file_types` by `inputs.input_kind`. Checking membership of this set is
+# much cheaper than classifying the value again on every call, which goes
+# through `ABCMeta.__instancecheck__` and checks for methods of streams.
+
+def _is_file_object(obj):
+    """Check if `obj` is a file object (see `inputs.input_kind`), which
+    adds its type to `_file_types` if so.
+
+    Args:
+        obj: An object given as the file argument
+    Returns:
+        A boolean indicating whether `obj` is to be passed through as is
+    """
+    return input_kind(obj) is FILE_OBJECT
+
+def _check_filename(name, file_input):
+    """Raise an error if `file_input` given to the file argument `name`
+    is neither a file object nor a file name.
+    """
+    if input_kind(file_input) is not FILE_NAME:
+        raise TypeError(
+            '{filearg!r} must have been file name or file-like object'
+            .format(filearg=name)
+            )
+
+def _open_files(stack, args, kwargs, pending):
+    """Open all files given as file names and replace them in-place in the
+    argument containers with the opened file objects.
+
+    Args:
+        stack: `contextlib.ExitStack` responsible for closing the files
+        args: List of given positional arguments
+        kwargs: Dictionary of given keyword arguments
+        pending: List of triples `(filearg, key, file_input)` where
+            `filearg` is a `FileArgument`, `key` is the lookup key for
+            the file name argument (an index into `args` if integer or
+            a key of `kwargs` otherwise), and `file_input` is the file name
+    """
+    for filearg, key, file_input in pending:
+        fileobj = stack.enter_context(filearg.open_file(file_input))
+        if type(key) is int:
+            args[key] = fileobj  # replace original arguments
+        else:
+            kwargs[key] = fileobj  # replace original arguments
+
+def _collect_pending(fileargs, args, kwargs):
+    """Find file arguments given as file names which need to be opened.
+
+    Args:
+        fileargs: Tuple of `FileArgument` specifications
+        args: Tuple of given positional arguments
+        kwargs: Dictionary of given keyword arguments
+    Returns:
+        List of triples as described in `_open_files`, or `None` if all
+        file arguments are file objects or left to their default values
+    """
+    pending = None
+    nargs = len(args)
+    for filearg in fileargs:
+        if filearg.pos is not None and filearg.pos < nargs:
+            key = filearg.pos
+            file_input = args[key]
+        else:
+            key = filearg.name
+            file_input = kwargs.get(key, _MISSING)
+        if (file_input is _MISSING or type(file_input) in _file_types
+                or _is_file_object(file_input)):
+            continue
+        _check_filename(filearg.name, file_input)
+        if pending is None:
+            pending = []
+        pending.append((filearg, key, file_input))
+    return pending
+
+def _make_dispatcher(fn, fileargs, is_generator, is_async=False):
+    """Construct the call dispatcher of a wrapper, specialized once at
+    decoration time for the resolved file arguments so that each call
+    only performs the checks relevant to those arguments.
+
+    The pass-through path (all file arguments are already file objects or
+    are left to their default values) calls the original function directly
+    without copying the given arguments.
+
+    Args:
+        fn: Original function being wrapped
+        fileargs: Tuple of `FileArgument` specifications
+        is_generator: Boolean indicating whether `fn` is a generator
+        is_async: Boolean indicating whether `fn` is a coroutine function
+            or an asynchronous generator function
+    Returns:
+        A function with the same call interface as the wrapper
+    """
+    if is_async:
+        # Imported here so that asynchronous support is only loaded on need
+        from .aio import make_async_dispatcher
+        return make_async_dispatcher(fn, fileargs, _collect_pending)
+    if len(fileargs) == 1:
+        return _make_single_dispatcher(fn, fileargs[0], is_generator)
+
+    if is_generator:
+        # File needs to be opened inside a generator if the original
+        # function is also a generator. A wrap is needed to maintain
+        # the attributes information of the generator objects.
+        @functools.wraps(fn)
+        def generator_wrapper(args, kwargs, pending):
+            with contextlib.ExitStack() as stack:
+                _open_files(stack, args, kwargs, pending)
+                return (yield from fn(*args, **kwargs))
+
+    def dispatch(*args, **kwargs):
+        pending = _collect_pending(fileargs, args, kwargs)
+        if pending is None:
+            return fn(*args, **kwargs)
+        args = list(args)  # convert from non-mutable sequence
+        if is_generator:
+            return generator_wrapper(args, kwargs, pending)
+        with contextlib.ExitStack() as stack:
+            _open_files(stack, args, kwargs, pending)
+            return fn(*args, **kwargs)
+
+    return dispatch
+
+def _make_single_dispatcher(fn, filearg, is_generator):
+    """Specialization of `_make_dispatcher` for exactly one file argument."""
+    name, pos, open_file = filearg.name, filearg.pos, filearg.open_file
+
+    if is_generator:
+        @functools.wraps(fn)
+        def generator_wrapper(args, kwargs, store, key, file_input):
+            with open_file(file_input) as fileobj:
+                store[key] = fileobj  # replace original arguments
+                return (yield from fn(*args, **kwargs))
+
+    # The containers `args` (a list copied from the given tuple) and
+    # `kwargs` (built afresh by the interpreter for every call) belong to a
+    # single call, so replacing arguments in place cannot affect concurrent
+    # or reentrant calls of the same wrapper.
+    def invoke(args, kwargs, store, key, file_input):
+        # Input argument is not a file object: need to open
+        _check_filename(name, file_input)
+        if is_generator:
+            return generator_wrapper(args, kwargs, store, key, file_input)
+        with open_file(file_input) as fileobj:
+            store[key] = fileobj  # replace original arguments
+            return fn(*args, **kwargs)
+
+    if pos is None:
+        def dispatch(*args, **kwargs):
+            file_input = kwargs.get(name, _MISSING)
+            if (file_input is _MISSING or type(file_input) in _file_types
+                    or _is_file_object(file_input)):
+                return fn(*args, **kwargs)
+            return invoke(args, kwargs, kwargs, name, file_input)
+    else:
+        def dispatch(*args, **kwargs):
+            if pos < len(args):
+                file_input = args[pos]
+                if (type(file_input) in _file_types
+                        or _is_file_object(file_input)):
+                    return fn(*args, **kwargs)
+                args = list(args)  # convert from non-mutable sequence
+                return invoke(args, kwargs, args, pos, file_input)
+            file_input = kwargs.get(name, _MISSING)
+            if (file_input is _MISSING or type(file_input) in _file_types
+                    or _is_file_object(file_input)):
+                return fn(*args, **kwargs)
+            return invoke(args, kwargs, kwargs, name, file_input)
+
+    return dispatch
+
 ##############################
 ##  Wrapper implementation  ##
 ##############################
 
+class _WrappedAttribute(object):
+    """Non-data descriptor of a metadata attribute of wrappers (as copied by
+    `functools.update_wrapper`) which is looked up on `__wrapped__` on
+    demand instead of being stored in every wrapper. Values assigned to the
+    attribute of a wrapper are kept in its instance dictionary and take
+    precedence. The value `default` is given for the class itself and when
+    `__wrapped__` lacks the attribute.
+    """
+
+    __slots__ = ('name', 'default')
+
+    def __init__(self, name, default):
+        self.name = name
+        self.default = default
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self.default
+        return getattr(instance.__wrapped__, self.name, self.default)
+
+
+class _WrappedModule(str):
+    """The `_WrappedAttribute` of `__module__`. Since classes give their
+    attribute `__module__` without going through descriptors, it is also
+    the string naming the module of the class itself, which is pickled as
+    a plain string.
+    """
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return getattr(instance.__wrapped__, '__module__', str(self))
+
+    def __reduce__(self):
+        return str, (str(self),)
+
+
 class FunctionFilenameWrapper(object):
     """Constructs a callable wrapper over a function accepting files as
     arguments.
@@ -70,126 +413,273 @@ class FunctionFilenameWrapper(object):
     to built-in function `open()`, this class wraps over the
     `original_fn` and will automatically open file when file name
     strings (provided as `str`, `bytes`, or `os.PathLike`) are given
-    as input arguments instead of file objects.
+    as input arguments instead of file objects. Files are kept open until
+    the function returns, or until the generator (or the coroutine or the
+    asynchronous generator) finishes. File objects include duck-typed
+    readers and writers, and other types may be declared as file objects
+    or file names with `inputs.register_input_type`.
+
+    Besides arguments to `open()`, `open_kwargs` may also contain file
+    options of this package (see `utils.FILE_OPTIONS`) which change how
+    file names are opened.
+
+    Several file arguments may be given to `filearg` as a sequence, or
+    as a mapping to dictionaries overriding `open_kwargs` for each
+    argument. All file names are then opened in a single pass. When
+    `original_fn` is itself a `FunctionFilenameWrapper` (as in stacked
+    decorators), both wrappers are fused into a single wrapper over the
+    innermost function.
+
+    Like functions decorated with `functools.wraps`, the wrapper has the
+    attributes `__module__`, `__name__`, `__qualname__`, `__doc__` and
+    `__annotations__` as well as the attributes of the instance dictionary
+    of the original function, which are looked up on the original function
+    on demand. Wrappers otherwise store their attributes in slots, and
+    share their specifications of file arguments with other wrappers of
+    the same configuration, so that large numbers of them stay compact.
+
+    A wrapper may be shared by any number of threads and called reentrantly
+    (including recursively from within the original function). Opened file
+    objects only ever replace file names in the argument containers created
+    for each call (and kept by each generator), never in shared state, and
+    state shared between calls (classification of input types, statistics,
+    result caches and pools of files or connections) is guarded by locks
+    instead of relying on the global interpreter lock, so that this also
+    holds on free-threaded builds of CPython.
 
     Attributes:
         __wrapped__: Original function being wrapped
-            (set by `functools.update_wrapper`)
         is_generator: Boolean indicating whether `__wrapped__` is a generator
-        filearg: Name of function input argument accepting file objects
+        is_coroutine: Boolean indicating whether `__wrapped__` is a
+            coroutine function
+        is_async_generator: Boolean indicating whether `__wrapped__` is an
+            asynchronous generator function
+        fileargs: Tuple of `FileArgument` for all file arguments, in the
+            order in which the files are opened
+        filearg: Name of the first function input argument accepting
+            file objects
         pos: Index of positional `filearg` argument (`None` if keyword-only)
         open_kwargs: Dictionary of keyword arguments to built-in function
-            `open()`
+            `open()` for `filearg`
+        result_cache: `memoize.ResultCache` memoizing results of calls
+            (`None` if results are not memoized)
+        stats: `stats.WrapperStats` recording instrumentation of calls
+            (`None` if calls are not instrumented)
     """
 
-    def __new__(cls, original_fn, filearg=0, open_kwargs=None):
-        # The following line of code already set:
-        # self.__wrapped__ = original_fn
-        return functools.update_wrapper(super().__new__(cls), original_fn)
+    __slots__ = (
+        '__wrapped__', '_spec', 'fileargs', '_bound_fileargs', '_dispatch',
+        'stats', 'result_cache', '__dict__', '__weakref__',
+        )
+
+    __module__ = _WrappedModule(__module__)
+    __doc__ = _WrappedAttribute('__doc__', __doc__)
 
-    def __init__(self, original_fn, filearg=0, open_kwargs=None):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Class bodies of subclasses define their own attributes again
+        cls.__module__ = _WrappedModule(cls.__dict__['__module__'])
+        cls.__doc__ = _WrappedAttribute('__doc__', cls.__dict__['__doc__'])
+
+    def __init__(self, original_fn, filearg=0, open_kwargs=None, *,
+                 memoize=None, stats=None):
 
         # Proactively check if original function is callable
         if not callable(original_fn):
             raise TypeError('expected a callable function')
+        self.__wrapped__ = original_fn
 
         # Proactively check if open_kwargs is valid
         open_kwargs = open_kwargs or {}
-        validate_open_kwargs(open_kwargs)
+        split_open_kwargs(open_kwargs)
+
+        # Normalize into a list of pairs of filearg and its open_kwargs
+        if isinstance(filearg, collections.abc.Mapping):
+            specs = [
+                (key, split_open_kwargs(dict(open_kwargs, **extra_kwargs)))
+                for key, extra_kwargs in filearg.items()
+                ]
+        elif isinstance(filearg, (list, tuple)):
+            specs = [(key, split_open_kwargs(open_kwargs)) for key in filearg]
+        else:
+            specs = [(filearg, split_open_kwargs(open_kwargs))]
+        if not specs:
+            raise TypeError('expected at least one file argument')
 
         # Extract argument specs from original function
-        sig = inspect.signature(original_fn).parameters
-        args = [
-            parameter.name
-            for parameter in sig.values()
-            if parameter.kind == inspect.Parameter.POSITIONAL_OR_KEYWORD
-            ]
-        kwargs = [
-            parameter.name
-            for parameter in sig.values()
-            if parameter.kind == inspect.Parameter.KEYWORD_ONLY
-            ]
+        spec = _function_spec(original_fn)
+        args, kwargs = spec.args, spec.kwargs
 
-        # Determine if positional filearg is within bounds
-        try:
-            filearg = args[filearg]  # obtain name of argument
-        except TypeError:
-            pass  # re-check later whether it is a valid name
-        except IndexError as e:
-            raise IndexError("argument list index out of range") from e
-
-        # Check if filearg name string is actually valid
-        if filearg in args:
-            pos = args.index(filearg)  # always non negative
-        elif filearg in kwargs:
-            pos = None
-        elif isinstance(filearg, str):
-            raise NameError(
-                "{name!r} is not a valid argument for the function {fn!r}"
-                .format(name=filearg, fn=original_fn.__qualname__)
+        fileargs = []
+        for key, (spec_kwargs, spec_options) in specs:
+            name, pos = _resolve_filearg(original_fn, args, kwargs, key)
+            if any(name == other.name for other in fileargs):
+                raise TypeError(
+                    "{name!r} is specified as file argument more than once"
+                    .format(name=name)
+                    )
+            fileargs.append(
+                _make_filearg(name, pos, spec_kwargs, spec_options)
                 )
-        else:
-            raise TypeError(
-                "{name!r} has incorrect type".format(name=filearg)
+
+        # Fuse with the inner wrapper of stacked decorators: files of this
+        # outer wrapper are opened first, and any argument already handled
+        # by this wrapper is passed as a file object to the inner one anyway
+        if (isinstance(original_fn, FunctionFilenameWrapper)
+                and not isinstance(original_fn, BoundFunctionFilenameWrapper)
+                and original_fn.result_cache is None
+                and original_fn.stats is None):
+            fileargs.extend(
+                inner for inner in original_fn.fileargs
+                if all(inner.name != outer.name for outer in fileargs)
                 )
+            original_fn = original_fn.__wrapped__
+            self.__wrapped__ = original_fn
+            spec = _function_spec(original_fn)
 
         # Keep track of data
-        self.is_generator = inspect.isgeneratorfunction(original_fn)
-        self.filearg = filearg
-        self.pos = pos
-        self.open_kwargs = open_kwargs
+        self._spec = spec
+        is_async = self.is_coroutine or self.is_async_generator
+        self.fileargs = tuple(fileargs)
+        self._bound_fileargs = None
+        if stats is True:
+            from .stats import WrapperStats
+            stats = WrapperStats()
+        if stats is None:
+            self._dispatch = _make_dispatcher(
+                original_fn, self.fileargs, self.is_generator, is_async
+                )
+        else:
+            # Instrumentation is built into a separate dispatcher so that
+            # wrappers without it do not pay for any of its cost
+            name = self.__qualname__
+            instrumented_fileargs = tuple(
+                filearg._replace(
+                    open_file=stats.instrument_opener(name, filearg.open_file)
+                    )
+                for filearg in self.fileargs
+                )
+            self._dispatch = stats.instrument(
+                _make_dispatcher(
+                    original_fn, instrumented_fileargs, self.is_generator,
+                    is_async,
+                    ),
+                name, self.is_generator, _collect_pending, self.fileargs,
+                is_coroutine=self.is_coroutine,
+                is_async_generator=self.is_async_generator,
+                )
+        self.stats = stats
 
-    def __call__(self, *args, **kwargs):
-        args = list(args)  # convert from non-mutable sequence
-        if self.pos is not None and self.pos < len(args):
-            # Open files for positional argument
-            return self._invoke(args, kwargs, args, self.pos)
-        elif self.filearg in kwargs:
-            # Open files for keyword arguments
-            return self._invoke(args, kwargs, kwargs, self.filearg)
+        # Memoize results of plain functions only: results of generators
+        # and asynchronous functions cannot be reused
+        if memoize is True:
+            from .memoize import ResultCache
+            memoize = ResultCache()
+        if (memoize is None or self.is_generator or self.is_coroutine
+                or self.is_async_generator):
+            memoize = None
         else:
-            # Open files not necessary (fallback to arg default values)
-            return self.__wrapped__(*args, **kwargs)
-
-    def _invoke(self, args, kwargs, store, key):
-        """Open files given at `store[key]` before invoking the original
-        function.
-
-        Args:
-            args: List of given positional arguments
-            kwargs: Dictionary of given keyword arguments
-            store: A duplicate of either `args` or `kwargs` containing
-                file name argument
-            key: Lookup key for file name argument in `store`
+            self._dispatch = memoize.wrap(
+                self._dispatch, original_fn, self.fileargs
+                )
+        self.result_cache = memoize
+
+    def __getattr__(self, name):
+        # Metadata which `functools.update_wrapper` would have copied
+        if name == '__wrapped__':
+            raise AttributeError(name)  # not initialized
+        if name in ('__name__', '__qualname__', '__annotations__'):
+            return getattr(self.__wrapped__, name)
+        try:
+            return getattr(self.__wrapped__, '__dict__', {})[name]
+        except KeyError:
+            raise AttributeError(
+                '{cls!r} object has no attribute {name!r}'
+                .format(cls=type(self).__name__, name=name)
+                ) from None
+
+    @property
+    def is_generator(self):
+        return self._spec.is_generator
+
+    @property
+    def is_coroutine(self):
+        return self._spec.is_coroutine
+
+    @property
+    def is_async_generator(self):
+        return self._spec.is_async_generator
+
+    @property
+    def filearg(self):
+        return self.fileargs[0].name
+
+    @property
+    def pos(self):
+        return self.fileargs[0].pos
+
+    @property
+    def open_kwargs(self):
+        return self.fileargs[0].open_kwargs
+
+    # Calling the wrapper object resolves `__call__` on the class, and since
+    # this is a property whose getter is implemented in C, the dispatcher
+    # obtained from the instance is invoked directly without adding an
+    # extra Python frame in between.
+    __call__ = property(operator.attrgetter('_dispatch'))
+
+    def map(self, file_inputs, *args, executor='thread', workers=None,
+            max_inflight=None, ordered=False, **kwargs):
+        """Call the function once for each of `file_inputs` given as its
+        first file argument, using a pool of workers. Refer to the function
+        `batch.map_files` for explanation of the arguments.
+
         Returns:
-            Result of the original function being invoked
+            An iterator of `batch.BatchResult` streamed as calls finish
         """
-        file_input = store[key]
-        if isinstance(file_input, io.IOBase):
-            # Input argument is already a file object: do nothing
-            return self.__wrapped__(*args, **kwargs)
-        elif is_valid_filename(file_input):
-            # Input argument is a filename: need to open
-            if self.is_generator:
-                # File needs to be opened inside a generator if the original
-                # function is also a generator. A wrap is needed to maintain
-                # the attributes information of the generator objects.
-                @functools.wraps(self.__wrapped__)
-                def generator_wrapper():
-                    with open(file_input, **self.open_kwargs) as fileobj:
-                        store[key] = fileobj  # replace original arguments
-                        return (yield from self.__wrapped__(*args, **kwargs))
-                return generator_wrapper()
-            else:
-                # Open the file normally
-                with open(file_input, **self.open_kwargs) as fileobj:
-                    store[key] = fileobj  # replace original arguments
-                    return self.__wrapped__(*args, **kwargs)
-        else:
-            raise TypeError(
-                '{filearg!r} must have been file name or file-like object'
-                .format(filearg=self.filearg)
-                )
+        from .batch import map_files
+        return map_files(
+            self, file_inputs, args, kwargs, executor=executor,
+            workers=workers, max_inflight=max_inflight, ordered=ordered,
+            )
+
+    def reduce_chunks(self, file_input, reducer, *args, chunks=None,
+                      executor='process', workers=None, initial=_MISSING,
+                      **kwargs):
+        """Split the file name `file_input` into newline-aligned byte
+        ranges, call the function over each range in parallel, and combine
+        the results with `reducer`. Refer to the function
+        `chunks.reduce_chunks` for explanation of the arguments.
+
+        Returns:
+            The combined result
+        """
+        from .chunks import reduce_chunks
+        options = {} if initial is _MISSING else {'initial': initial}
+        return reduce_chunks(
+            self, file_input, reducer, args, kwargs, chunks=chunks,
+            executor=executor, workers=workers, **options
+            )
+
+    def __reduce__(self):
+        # Wrappers replacing module-level functions by decoration are pickled
+        # by reference like functions are, since the original function can
+        # no longer be found by its name. Otherwise the wrapper is rebuilt
+        # from the original function and its file arguments.
+        module = sys.modules.get(self.__module__)
+        target = module
+        for name in self.__qualname__.split('.'):
+            target = getattr(target, name, None)
+        if target is self:
+            return self.__qualname__
+        return functools.partial(
+            type(self), memoize=self.result_cache, stats=self.stats
+            ), (
+            self.__wrapped__, {
+                filearg.name: dict(filearg.open_kwargs, **filearg.options)
+                for filearg in self.fileargs
+                },
+            )
 
     def __get__(self, instance, owner):
         # In order to make this callable work with bounded methods inside
@@ -198,10 +688,154 @@ class FunctionFilenameWrapper(object):
         # the package `wrapt` at
         # https://wrapt.readthedocs.io/en/latest/wrappers.html#function-wrappers
         get_method = self.__wrapped__.__get__(instance, owner)
-        return BoundFunctionFilenameWrapper(get_method)
+        if get_method is self.__wrapped__:
+            # Accessed through the class: nothing is bound
+            return self
+        if (isinstance(get_method, types.MethodType)
+                and get_method.__func__ is self.__wrapped__):
+            # Reuse the parameter analysis and the dispatcher of this wrapper
+            # since a bound method merely prepends its first argument.
+            # This avoids inspecting the signature on every attribute access.
+            bound = object.__new__(BoundFunctionFilenameWrapper)
+            if self.__dict__:
+                bound.__dict__.update(self.__dict__)
+            if self._bound_fileargs is None:
+                self._bound_fileargs = tuple(
+                    filearg._replace(
+                        pos=filearg.pos - 1 if filearg.pos else None
+                        )
+                    for filearg in self.fileargs
+                    )
+            bound.__wrapped__ = get_method
+            bound._spec = self._spec
+            bound.fileargs = self._bound_fileargs
+            bound._bound_fileargs = None
+            bound._dispatch = types.MethodType(
+                self._dispatch, get_method.__self__
+                )
+            bound.stats = self.stats
+            bound.result_cache = self.result_cache
+            return bound
+        return BoundFunctionFilenameWrapper(get_method, {
+            filearg.name: dict(filearg.open_kwargs, **filearg.options)
+            for filearg in self.fileargs
+            }, memoize=self.result_cache, stats=self.stats)
 
 
 class BoundFunctionFilenameWrapper(FunctionFilenameWrapper):
     """The bounded method version of the class FunctionFilenameWrapper"""
-    def __get__(self, isinstance, owner):
+    def __get__(self, instance, owner):
         return self
+
+    def __reduce__(self):
+        # Pickled as the attribute lookup on the instance bound to
+        if isinstance(self.__wrapped__, types.MethodType):
+            return getattr, (self.__wrapped__.__self__, self.__name__)
+        return super().__reduce__()
+
+
+def _resolve_filearg(original_fn, args, kwargs, filearg):
+    """Resolve the name and the positional index of a file argument.
+
+    Args:
+        original_fn: Main function being wrapped
+        args: List of names of positional-or-keyword arguments
+        kwargs: List of names of keyword-only arguments
+        filearg: Index of the positional argument (as integer) or the
+            name of the argument itself (as string)
+    Returns:
+        A tuple of the argument name and its positional index (`None` if
+        keyword-only)
+    """
+    # Determine if positional filearg is within bounds
+    try:
+        filearg = args[filearg]  # obtain name of argument
+    except TypeError:
+        pass  # re-check later whether it is a valid name
+    except IndexError as e:
+        raise IndexError("argument list index out of range") from e
+
+    # Check if filearg name string is actually valid
+    if filearg in args:
+        return filearg, args.index(filearg)  # always non negative
+    elif filearg in kwargs:
+        return filearg, None
+    elif isinstance(filearg, str):
+        raise NameError(
+            "{name!r} is not a valid argument for the function {fn!r}"
+            .format(name=filearg, fn=original_fn.__qualname__)
+            )
+    else:
+        raise TypeError(
+            "{name!r} has incorrect type".format(name=filearg)
+            )
+
+
+# Flags of code objects marking the kinds of functions (see `inspect`)
+_CO_GENERATOR = 0x20
+_CO_COROUTINE = 0x80
+_CO_ASYNC_GENERATOR = 0x200
+
+FunctionSpec = collections.namedtuple('FunctionSpec', (
+    'args', 'kwargs', 'is_generator', 'is_coroutine', 'is_async_generator',
+    ))
+FunctionSpec.__doc__ = """\
+Parameters and kind of a function being wrapped.
+
+Attributes:
+    args: Tuple of names of positional-or-keyword arguments
+    kwargs: Tuple of names of keyword-only arguments
+    is_generator: Boolean indicating whether it is a generator function
+    is_coroutine: Boolean indicating whether it is a coroutine function
+    is_async_generator: Boolean indicating whether it is an asynchronous
+        generator function
+"""
+
+def _function_spec(fn):
+    """Extract the parameters and the kind of a function to be wrapped.
+
+    Plain Python functions are read off their code objects, and the result
+    is cached per code object so that closures created over and over (such
+    as functions decorated within a loop) are only examined once. Other
+    callables go through `inspect`.
+
+    Args:
+        fn: Function being wrapped
+    Returns:
+        A `FunctionSpec`
+    """
+    # Attributes such as `__wrapped__` or `__signature__` may change what
+    # `inspect` reports, so only functions without any attribute qualify
+    if type(fn) is types.FunctionType and not fn.__dict__:
+        return _code_spec(fn.__code__)
+    sig = inspect.signature(fn).parameters
+    return FunctionSpec(
+        tuple(
+            parameter.name
+            for parameter in sig.values()
+            if parameter.kind == inspect.Parameter.POSITIONAL_OR_KEYWORD
+            ),
+        tuple(
+            parameter.name
+            for parameter in sig.values()
+            if parameter.kind == inspect.Parameter.KEYWORD_ONLY
+            ),
+        inspect.isgeneratorfunction(fn),
+        inspect.iscoroutinefunction(fn),
+        inspect.isasyncgenfunction(fn),
+        )
+
+@functools.lru_cache(maxsize=1024)
+def _code_spec(code):
+    """Compute the `FunctionSpec` of functions with the code object `code`
+    (see `_function_spec`).
+    """
+    start = getattr(code, 'co_posonlyargcount', 0)  # python3.8+
+    stop = code.co_argcount
+    return FunctionSpec(
+        code.co_varnames[start:stop],
+        code.co_varnames[stop:stop + code.co_kwonlyargcount],
+        bool(code.co_flags & _CO_GENERATOR),
+        bool(code.co_flags & _CO_COROUTINE),
+        bool(code.co_flags & _CO_ASYNC_GENERATOR),
+        )
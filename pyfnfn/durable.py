@@ -0,0 +1,266 @@
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Atomic and durable output files: content is written to a temporary file
+in the same directory which replaces the target file only once writing
+completes successfully, after being synchronized to disk, with outputs
+committed around the same time renamed in groups whose directories are
+synchronized once per group.
+"""
+
+__all__ = ('GroupCommitter', 'default_committer', 'open_durable')
+
+import binascii
+import io
+import os
+import threading
+
+from .utils import wrap_raw_file
+
+
+class _Commit(object):
+    """Pending replacement of `target` by the temporary file `temp`."""
+
+    __slots__ = ('temp', 'target', 'done', 'error')
+
+    def __init__(self, temp, target):
+        self.temp = temp
+        self.target = target
+        self.done = False
+        self.error = None
+
+
+def _fsync_file(filename):
+    """Synchronize the content of a file given by name to disk."""
+    fd = os.open(filename, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_directory(directory):
+    """Synchronize the entries of a directory to disk where supported."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:  # directories cannot be opened on some platforms
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _sync_and_close(fileobj, temp):
+    """Flush, synchronize to disk and close `fileobj` opened on `temp`."""
+    if fileobj.closed:
+        _fsync_file(temp)
+        return
+    try:
+        fileobj.flush()
+        os.fsync(fileobj.fileno())
+    finally:
+        fileobj.close()
+
+
+class GroupCommitter(object):
+    """Thread-safe group commit of durable output files.
+
+    Each thread synchronizes the content of its own file to disk, so that
+    concurrent `fsync()` calls of the same filesystem can be merged into
+    fewer journal commits, and then joins a group. The first thread to join
+    becomes the leader: while other commits are still synchronizing their
+    files, it waits up to `delay` seconds for them to join, then moves every
+    file of the group into place and synchronizes each of their directories
+    once for the whole group, while the other threads wait. A commit with
+    no other commit in progress does not wait at all.
+
+    Attributes:
+        delay: Maximum number of seconds the leader waits for a group to
+            form
+        commits: Number of files committed
+        groups: Number of groups committed
+    """
+
+    def __init__(self, delay=0.001):
+        self.delay = delay
+        self.commits = 0
+        self.groups = 0
+        self._cond = threading.Condition()
+        self._pending = []
+        self._leading = False
+        self._active = 0  # commits in progress, joined a group or not
+
+    def __reduce__(self):
+        if self is default_committer:
+            return 'default_committer'
+        return type(self), (self.delay,)
+
+    def commit(self, fileobj, temp, target):
+        """Synchronize and close `fileobj` opened on the file name `temp`,
+        then rename it to `target`, as part of a group.
+        """
+        with self._cond:
+            self._active += 1
+        try:
+            _sync_and_close(fileobj, temp)
+        except BaseException:
+            _discard(temp)
+            with self._cond:
+                self._active -= 1
+                self._cond.notify_all()
+            raise
+        entry = _Commit(temp, target)
+        with self._cond:
+            self._pending.append(entry)
+            self._cond.notify_all()
+            while not entry.done and self._leading:
+                self._cond.wait()
+            if entry.done:
+                if entry.error is not None:
+                    raise entry.error
+                return
+            self._leading = True
+            # Wait for the commits still synchronizing their files
+            if self.delay:
+                self._cond.wait_for(
+                    lambda: len(self._pending) >= self._active, self.delay
+                    )
+            batch, self._pending = self._pending, []
+        try:
+            self._commit_group(batch)
+        finally:
+            with self._cond:
+                for other in batch:
+                    other.done = True
+                self._active -= len(batch)
+                self._leading = False
+                self._cond.notify_all()
+        if entry.error is not None:
+            raise entry.error
+
+    def _commit_group(self, batch):
+        """Rename all files of a group and synchronize their directories."""
+        directories = {}
+        for entry in batch:
+            try:
+                os.replace(entry.temp, entry.target)
+            except Exception as e:
+                entry.error = e
+                _discard(entry.temp)
+            else:
+                directory = os.path.dirname(os.path.abspath(entry.target))
+                directories.setdefault(directory, []).append(entry)
+        for directory, entries in directories.items():
+            try:
+                _fsync_directory(directory)
+            except Exception as e:
+                for entry in entries:
+                    entry.error = e
+        with self._cond:
+            self.commits += len(batch)
+            self.groups += 1
+
+
+default_committer = GroupCommitter()
+
+
+def _temp_name(basename):
+    """Generate a random name of a hidden temporary file for `basename`."""
+    token = binascii.hexlify(os.urandom(6))
+    if isinstance(basename, bytes):
+        return b'.' + basename + b'.' + token + b'.tmp'
+    return '.{}.{}.tmp'.format(basename, token.decode())
+
+
+def _discard(temp):
+    try:
+        os.unlink(temp)
+    except OSError:
+        pass
+
+
+class _DurableOutput(object):
+    """Context manager of an output file written to a temporary file, which
+    is committed on successful exit and discarded otherwise.
+    """
+
+    __slots__ = ('fileobj', 'temp', 'target', 'committer')
+
+    def __init__(self, fileobj, temp, target, committer):
+        self.fileobj = fileobj
+        self.temp = temp
+        self.target = target
+        self.committer = committer
+
+    def __enter__(self):
+        return self.fileobj
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.committer.commit(self.fileobj, self.temp, self.target)
+            return
+        try:
+            self.fileobj.close()
+        finally:
+            _discard(self.temp)
+
+
+def open_durable(file, mode='w', buffering=-1, encoding=None, errors=None,
+                 newline=None, closefd=True, opener=None, *, committer=None):
+    """Open a temporary file next to `file` for writing, which replaces
+    `file` atomically and durably on successful exit of the returned
+    context manager, and is removed on exit by an exception. Other
+    arguments are as of built-in `open()`.
+
+    The target keeps its permission bits if it already exists.
+
+    Args:
+        file: File name of the target file
+        mode: Mode of opening which must be for (over)writing
+        committer: The `GroupCommitter` committing the file (the shared
+            `default_committer` if `None`)
+    Returns:
+        A context manager whose entered value is the file object
+    """
+    if set(mode) - set('wbt+') or 'w' not in mode:
+        raise ValueError(
+            'durable files can only be opened for overwriting, not {mode!r}'
+            .format(mode=mode)
+            )
+    if not closefd:
+        raise ValueError('Cannot use closefd=False with file name')
+    if committer is None:
+        committer = default_committer
+    target = os.fspath(file)
+    directory, basename = os.path.split(target)
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+    if '+' in mode:
+        flags = flags & ~os.O_WRONLY | os.O_RDWR
+    while True:
+        temp = os.path.join(directory, _temp_name(basename))
+        try:
+            if opener is None:
+                fd = os.open(temp, flags, 0o666)  # subject to the umask
+            else:
+                fd = opener(temp, flags)
+            break
+        except FileExistsError:
+            continue
+    try:
+        try:
+            os.chmod(temp, os.stat(target).st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        raw = io.FileIO(fd, 'w+' if '+' in mode else 'w')
+        raw.name = target
+        buffered_type = io.BufferedRandom if '+' in mode else io.BufferedWriter
+        fileobj = wrap_raw_file(raw, mode, buffering, encoding, errors,
+                                newline, buffered_type=buffered_type)
+    except BaseException:
+        try:
+            os.close(fd)
+        except OSError:  # already closed along with the file object
+            pass
+        _discard(temp)
+        raise
+    return _DurableOutput(fileobj, temp, target, committer)
@@ -0,0 +1,138 @@
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Pool of opened file handles which are reused across calls for the same
+file names, instead of opening and closing the files every time.
+"""
+
+__all__ = ('HandlePool',)
+
+import collections
+import os
+import threading
+
+from .utils import file_identity
+
+
+class _PooledFile(object):
+    """Context manager of a file handle checked out of a `HandlePool`,
+    which is checked back in on exit instead of being closed.
+    """
+
+    __slots__ = ('pool', 'key', 'fileobj', 'identity')
+
+    def __init__(self, pool, key, fileobj, identity):
+        self.pool = pool
+        self.key = key
+        self.fileobj = fileobj
+        self.identity = identity
+
+    def __enter__(self):
+        return self.fileobj
+
+    def __exit__(self, exc_type, exc, tb):
+        self.pool._checkin(self)
+
+
+class HandlePool(object):
+    """Thread-safe pool of idle file handles opened for reading, keyed by
+    the absolute file name together with the keyword arguments to `open()`.
+
+    A handle is checked out by exactly one caller at a time and rewound to
+    the beginning of the file, so concurrent threads never share a handle.
+    A pooled handle is discarded when the file is found to have changed
+    (device, inode, size or modification time), and the least recently
+    used idle handles are closed once more than `maxsize` of them are kept.
+
+    Attributes:
+        maxsize: Maximum number of idle handles kept open
+        hits: Number of check-outs served by a pooled handle
+        misses: Number of check-outs which opened a new handle
+    """
+
+    def __init__(self, maxsize=16):
+        if maxsize < 1:
+            raise ValueError('maxsize must be positive')
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._idle = collections.OrderedDict()  # key -> list of _PooledFile
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def open(self, file, **open_kwargs):
+        """Check out a handle of `file` opened with `open_kwargs`.
+
+        Args:
+            file: File name to be opened
+            **open_kwargs: Keyword arguments to built-in function `open()`
+        Returns:
+            A context manager whose entered value is the file object,
+            which is returned to the pool on exit
+        """
+        path = os.path.abspath(file)
+        key = (path, tuple(sorted(open_kwargs.items())))
+        identity = file_identity(os.stat(path))
+        stale = []
+        pooled = None
+        with self._lock:
+            handles = self._idle.get(key)
+            while handles:
+                candidate = handles.pop()
+                self._count -= 1
+                if candidate.identity == identity:
+                    pooled = candidate
+                    break
+                stale.append(candidate)
+            if handles is not None and not handles:
+                del self._idle[key]
+            if pooled is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        for candidate in stale:
+            candidate.fileobj.close()
+        if pooled is not None:
+            try:
+                pooled.fileobj.seek(0)
+                return pooled
+            except (OSError, ValueError):
+                pooled.fileobj.close()
+        fileobj = open(path, **open_kwargs)
+        try:
+            identity = file_identity(os.fstat(fileobj.fileno()))
+        except BaseException:
+            fileobj.close()
+            raise
+        return _PooledFile(self, key, fileobj, identity)
+
+    def _checkin(self, pooled):
+        """Return a checked out handle to the pool."""
+        if pooled.fileobj.closed:
+            return
+        evicted = []
+        with self._lock:
+            self._idle.setdefault(pooled.key, []).append(pooled)
+            self._idle.move_to_end(pooled.key)
+            self._count += 1
+            while self._count > self.maxsize:
+                key, handles = next(iter(self._idle.items()))
+                evicted.append(handles.pop(0))
+                self._count -= 1
+                if not handles:
+                    del self._idle[key]
+        for candidate in evicted:
+            candidate.fileobj.close()
+
+    def clear(self):
+        """Close all idle handles in the pool."""
+        with self._lock:
+            idle = [
+                pooled for handles in self._idle.values() for pooled in handles
+                ]
+            self._idle.clear()
+            self._count = 0
+        for pooled in idle:
+            pooled.fileobj.close()
@@ -0,0 +1,102 @@
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Classification of the values given to file arguments into file objects,
+which are passed through to the function, and file names, which are opened
+first. The classification depends only on the type of the value and is
+cached per type, so that repeated calls with values of the same type cost
+a single lookup.
+"""
+
+__all__ = ('FILE_NAME', 'FILE_OBJECT', 'INVALID', 'input_kind',
+           'register_input_type')
+
+import _thread
+import io
+import os
+
+# Kinds of values given to file arguments
+FILE_OBJECT = 'file object'
+FILE_NAME = 'file name'
+INVALID = 'invalid'
+_KINDS = { kind: kind for kind in (FILE_OBJECT, FILE_NAME, INVALID) }
+
+# Methods of which a type must have at least one so that its instances are
+# recognized as readers or writers without being subclasses of `io.IOBase`
+_STREAM_METHODS = ('read', 'readinto', 'write')
+
+# Kinds of types registered explicitly, which also apply to their subclasses
+_registered = {}
+
+# Cache of the kinds of all types seen so far, along with the set of types
+# whose instances are file objects, which is all that the pass-through path
+# of wrappers checks (see `decorators._make_dispatcher`)
+_kinds = {}
+_file_object_types = set()
+
+# A lock from `_thread`, which is always loaded, as importing `threading`
+# only for this would slow down importing the package
+_lock = _thread.allocate_lock()
+
+
+def register_input_type(cls, kind):
+    """Declare how values of type `cls` (or of its subclasses) given to
+    file arguments are treated, overriding the classification by default:
+    instances of `io.IOBase` and other types having any of the methods
+    `read()`, `readinto()` or `write()` are file objects, and instances of
+    `str`, `bytes` and `os.PathLike` are file names.
+
+    Args:
+        cls: Type of values
+        kind: `FILE_OBJECT` for values passed through to the function,
+            `FILE_NAME` for values opened with the arguments of the file
+            argument (so they must be accepted by the opener), or
+            `INVALID` for values rejected with `TypeError`
+    """
+    if not isinstance(cls, type):
+        raise TypeError('expected a type, not {cls!r}'.format(cls=cls))
+    try:
+        kind = _KINDS[kind]
+    except (KeyError, TypeError):
+        raise ValueError(
+            'unknown kind of values {kind!r}'.format(kind=kind)
+            ) from None
+    with _lock:
+        _registered[cls] = kind
+        # Subclasses of `cls` may have been classified already
+        _kinds.clear()
+        _file_object_types.clear()
+
+
+def _classify(cls):
+    """Determine the kind of values of type `cls` without the cache."""
+    for base in cls.__mro__:
+        kind = _registered.get(base)
+        if kind is not None:
+            return kind
+    if issubclass(cls, io.IOBase):
+        return FILE_OBJECT
+    if issubclass(cls, (str, bytes, getattr(os, 'PathLike', str))):
+        return FILE_NAME
+    if any(callable(getattr(cls, method, None))
+           for method in _STREAM_METHODS):
+        return FILE_OBJECT
+    return INVALID
+
+
+def input_kind(obj):
+    """Classify a value given to a file argument.
+
+    Args:
+        obj: A value given to a file argument
+    Returns:
+        One of `FILE_OBJECT`, `FILE_NAME` or `INVALID`
+    """
+    cls = type(obj)
+    kind = _kinds.get(cls)
+    if kind is None:
+        with _lock:
+            kind = _classify(cls)
+            _kinds[cls] = kind
+            if kind is FILE_OBJECT:
+                _file_object_types.add(cls)
+    return kind
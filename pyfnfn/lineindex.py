@@ -0,0 +1,285 @@
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Indexes of line offsets of text files persisted in sidecar files, for
+seeking to a line by its number and for splitting files into ranges of
+balanced numbers of lines.
+"""
+
+__all__ = ('IndexedBinaryFile', 'IndexedTextFile', 'LineIndex',
+           'get_index', 'line_index_step', 'open_indexed')
+
+import array
+import io
+import itertools
+import os
+import struct
+import sys
+import tempfile
+
+from .utils import file_identity, wrap_raw_file
+
+# Header of sidecar files: magic, version, step, number of lines, then the
+# device, inode, size and modification time of the indexed file
+_HEADER = struct.Struct('<8sIQQQQQq')
+_MAGIC = b'PYFNFNLX'
+_VERSION = 1
+
+# Suffix appended to file names to obtain the names of their sidecar files
+SIDECAR_SUFFIX = '.lineidx'
+
+# Number of lines between two recorded offsets when no step is given
+DEFAULT_STEP = 1024
+
+
+class LineIndex(object):
+    """Offsets of every `step`-th line of a file, where lines are delimited
+    by b'\\n' (which includes b'\\r\\n') so that text files must be in an
+    ASCII-compatible encoding.
+
+    Attributes:
+        step: Number of lines between two recorded offsets
+        offsets: `array.array` of the byte offsets of lines `0`, `step`,
+            `2 * step`, and so on
+        lines: Total number of lines (including a last line without b'\\n')
+        identity: Device, inode, size and modification time of the file
+            at the time it was indexed
+    """
+
+    def __init__(self, step, offsets, lines, identity):
+        self.step = step
+        self.offsets = offsets
+        self.lines = lines
+        self.identity = identity
+
+    @classmethod
+    def build(cls, file, step=DEFAULT_STEP, chunk_size=1 << 20):
+        """Scan a file and index its lines.
+
+        Args:
+            file: File name to be indexed
+            step: Number of lines between two recorded offsets
+            chunk_size: Number of bytes scanned at a time
+        Returns:
+            A `LineIndex` of the file
+        """
+        if step < 1:
+            raise ValueError('step must be positive')
+        offsets = array.array('Q', [0])
+        newlines = 0
+        position = 0
+        last = b'\n'
+        with open(file, 'rb') as fileobj:
+            identity = file_identity(os.fstat(fileobj.fileno()))
+            for chunk in iter(lambda: fileobj.read(chunk_size), b''):
+                parts = chunk.split(b'\n')
+                # Offsets within the chunk of the lines following each b'\n'
+                starts = itertools.accumulate(
+                    len(part) + 1 for part in itertools.islice(
+                        parts, len(parts) - 1
+                        )
+                    )
+                first = step - newlines % step - 1
+                offsets.extend(
+                    position + start
+                    for start in itertools.islice(starts, first, None, step)
+                    )
+                newlines += len(parts) - 1
+                position += len(chunk)
+                last = chunk[-1:]
+        lines = newlines + (last != b'\n')
+        if offsets[-1] >= position and len(offsets) > 1:
+            offsets.pop()  # offset of the end of file
+        return cls(step, offsets, lines, identity)
+
+    @classmethod
+    def load(cls, sidecar, identity):
+        """Load an index from a sidecar file if it matches `identity`.
+
+        Args:
+            sidecar: File name of the sidecar file
+            identity: Expected identity of the indexed file (see the
+                `identity` attribute)
+        Returns:
+            A `LineIndex`, or `None` if the sidecar file is missing, stale
+            or invalid
+        """
+        try:
+            with open(sidecar, 'rb') as fileobj:
+                header = fileobj.read(_HEADER.size)
+                if len(header) != _HEADER.size:
+                    return None
+                magic, version, step, lines, *stored = _HEADER.unpack(header)
+                if (magic != _MAGIC or version != _VERSION
+                        or tuple(stored) != tuple(identity)):
+                    return None
+                offsets = array.array('Q')
+                offsets.frombytes(fileobj.read())
+        except (OSError, ValueError):
+            return None
+        # Truncated sidecar files lack some of the offsets
+        if step < 1 or len(offsets) != max(-(-lines // step), 1):
+            return None
+        if sys.byteorder != 'little':
+            offsets.byteswap()
+        return cls(step, offsets, lines, identity)
+
+    def save(self, sidecar):
+        """Write the index to a sidecar file, replacing it atomically."""
+        offsets = self.offsets
+        if sys.byteorder != 'little':
+            offsets = array.array('Q', offsets)
+            offsets.byteswap()
+        # Each save has its own temporary file, so that concurrent saves
+        # (even from threads of the same process) do not clobber each other
+        directory, name = os.path.split(os.fsdecode(sidecar))
+        fd, temp = tempfile.mkstemp(prefix=name + '.', suffix='.tmp',
+                                    dir=directory or None)
+        try:
+            with open(fd, 'wb') as fileobj:
+                fileobj.write(_HEADER.pack(
+                    _MAGIC, _VERSION, self.step, self.lines, *self.identity
+                    ))
+                fileobj.write(offsets.tobytes())
+            os.replace(temp, sidecar)
+        except BaseException:
+            try:
+                os.unlink(temp)
+            except OSError:
+                pass
+            raise
+
+    def locate(self, line):
+        """Find where line number `line` (counted from zero) starts.
+
+        Returns:
+            A pair `(offset, skip)` where `skip` is the number of lines to
+            be read from byte `offset` to reach the line
+        """
+        if line < 0:
+            raise ValueError('negative line number {!r}'.format(line))
+        block = min(line // self.step, len(self.offsets) - 1)
+        return self.offsets[block], line - block * self.step
+
+    def split_ranges(self, count):
+        """Split the indexed file into at most `count` byte ranges holding
+        similar numbers of lines (up to a difference of `step` lines).
+
+        Returns:
+            List of pairs `(start, stop)` of non-empty byte ranges covering
+            the whole file in order (see `chunks.split_ranges`)
+        """
+        if count < 1:
+            raise ValueError('number of chunks must be positive')
+        size = self.identity[2]
+        blocks = len(self.offsets)
+        boundaries = sorted({
+            self.offsets[blocks * index // count] for index in range(count)
+            } | {size})
+        return [
+            (start, stop)
+            for start, stop in zip(boundaries, boundaries[1:])
+            if start < stop
+            ]
+
+
+def line_index_step(option):
+    """Resolve the value of the 'line_index' file option into a step."""
+    step = DEFAULT_STEP if option is True else option
+    if step < 1:
+        raise ValueError('step must be positive')
+    return step
+
+
+def get_index(file, step=DEFAULT_STEP, sidecar=None):
+    """Obtain the line index of a file, loading it from its sidecar file if
+    still valid, or building it and saving it into the sidecar file (if
+    the sidecar file can be written) otherwise.
+
+    Args:
+        file: File name to be indexed
+        step: Number of lines between two recorded offsets of a new index
+        sidecar: File name of the sidecar file (the file name followed by
+            `SIDECAR_SUFFIX` if `None`)
+    Returns:
+        A `LineIndex` of the file
+    """
+    if sidecar is None:
+        sidecar = os.fsdecode(file) + SIDECAR_SUFFIX
+    index = LineIndex.load(sidecar, file_identity(os.stat(file)))
+    if index is not None and index.step == step:
+        return index
+    index = LineIndex.build(file, step)
+    try:
+        index.save(sidecar)
+    except OSError:
+        pass  # read-only locations: the index is only kept in memory
+    return index
+
+
+class _LineSeekMixin(object):
+
+    def seek_line(self, line):
+        """Move to the beginning of line number `line` (counted from zero),
+        or to the end of file if there are fewer lines.
+
+        Returns:
+            The number of the line moved to (which is `line` unless the
+            end of file is reached first)
+        """
+        offset, skip = self.line_index.locate(line)
+        self.seek(offset)
+        for index in range(skip):
+            if not self.readline():
+                return line - skip + index
+        return line
+
+
+class IndexedBinaryFile(_LineSeekMixin, io.BufferedReader):
+    """Buffered binary file object seeking lines through a `LineIndex`.
+
+    Attributes:
+        line_index: The `LineIndex` of the file
+    """
+
+
+class IndexedTextFile(_LineSeekMixin, io.TextIOWrapper):
+    """Text file object seeking lines through a `LineIndex`. Offsets of
+    lines are valid positions to seek to since decoders are stateless at
+    the beginning of lines in ASCII-compatible encodings.
+
+    Attributes:
+        line_index: The `LineIndex` of the file
+    """
+
+
+def open_indexed(file, mode='r', buffering=-1, encoding=None, errors=None,
+                 newline=None, closefd=True, opener=None, *,
+                 step=DEFAULT_STEP):
+    """Open a file for reading along with its line index, which is loaded
+    from or saved into its sidecar file (see `get_index`). Arguments other
+    than `step` are as of built-in `open()`.
+
+    Args:
+        file: File name to be opened
+        mode: Mode of opening which must be for reading
+        step: Number of lines between two recorded offsets of a new index
+    Returns:
+        An `IndexedTextFile` or `IndexedBinaryFile` object whose method
+        `seek_line()` moves to the beginning of a line by its number
+    """
+    if set(mode) - set('rbt'):
+        raise ValueError(
+            'indexed files can only be opened for reading, not {mode!r}'
+            .format(mode=mode)
+            )
+    if buffering == 0 or (buffering == 1 and 'b' in mode):
+        raise ValueError('indexed files must be buffered')
+    index = get_index(file, step)
+    raw = open(file, 'rb', buffering=0, closefd=closefd, opener=opener)
+    fileobj = wrap_raw_file(raw, mode, buffering, encoding, errors, newline,
+                            buffered_type=IndexedBinaryFile,
+                            text_type=IndexedTextFile)
+    fileobj.line_index = index
+    if 'b' not in mode:
+        fileobj.buffer.line_index = index
+    return fileobj
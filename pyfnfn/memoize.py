@@ -0,0 +1,178 @@
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Memoization of results of wrapped functions keyed on the identity of
+the files given by name, together with the other call arguments.
+"""
+
+__all__ = ('CacheInfo', 'ResultCache')
+
+import collections
+import hashlib
+import os
+import threading
+import time
+
+from .utils import file_identity, is_valid_filename
+
+CacheInfo = collections.namedtuple(
+    'CacheInfo', ('hits', 'misses', 'bypasses', 'maxsize', 'currsize')
+    )
+CacheInfo.__doc__ = """\
+Statistics of a `ResultCache`, akin to `functools.lru_cache`.
+
+Attributes:
+    hits: Number of calls served from the cache
+    misses: Number of calls whose results were computed and stored
+    bypasses: Number of calls which could not be memoized, for instance
+        because a file object was given instead of a file name
+    maxsize: Maximum number of results kept (`None` if unbounded)
+    currsize: Number of results currently kept
+"""
+
+_MISSING = object()
+_BYPASS = object()
+
+
+def _file_key(file_input, hash_content):
+    """Compute the part of a cache key identifying a file given by name,
+    or `_BYPASS` if it cannot be identified.
+    """
+    try:
+        st = os.stat(file_input)
+    except (OSError, ValueError):
+        return _BYPASS  # let the wrapped call report the error
+    key = file_identity(st)
+    if hash_content:
+        digest = hashlib.sha256()
+        try:
+            with open(file_input, 'rb') as fileobj:
+                for block in iter(lambda: fileobj.read(1 << 16), b''):
+                    digest.update(block)
+        except OSError:
+            return _BYPASS
+        key += (digest.digest(),)
+    return key
+
+
+def _config_key(fileargs):
+    """Build the part of cache keys describing how the file arguments
+    `fileargs` are opened: their keyword arguments to `open()` and file
+    options.
+    """
+    return tuple(
+        (filearg.name, tuple(sorted(filearg.open_kwargs.items())),
+         tuple(filearg.options.items()))
+        for filearg in fileargs
+        )
+
+
+class ResultCache(object):
+    """Thread-safe cache of results of wrapped calls where file names are
+    keyed by the identity of the files they refer to (device, inode, size
+    and modification time, plus optionally a hash of the content) so that
+    results are recomputed whenever the files change.
+
+    Arguments are keyed as given, so that passing the same argument by
+    position or by keyword results in different entries. Calls are not
+    memoized (but counted as bypasses) when a file argument is given as a
+    file object, when a file cannot be examined, or when the other
+    arguments are not hashable. Generator and asynchronous functions are
+    never memoized. A cache may be shared by several wrappers.
+
+    Attributes:
+        maxsize: Maximum number of results kept, evicting the least
+            recently used ones (`None` if unbounded)
+        ttl: Number of seconds after which a result expires (`None` if
+            results never expire)
+        hash_content: Whether to also key files on a hash of their content
+    """
+
+    def __init__(self, maxsize=128, ttl=None, hash_content=False):
+        if maxsize is not None and maxsize < 1:
+            raise ValueError('maxsize must be positive')
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hash_content = hash_content
+        self._lock = threading.Lock()
+        self._results = collections.OrderedDict()  # key -> (value, expiry)
+        self._hits = self._misses = self._bypasses = 0
+
+    def __reduce__(self):
+        # Cached results are not carried over to other processes
+        return type(self), (self.maxsize, self.ttl, self.hash_content)
+
+    def info(self):
+        """Report statistics of the cache as a `CacheInfo`."""
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._bypasses,
+                             self.maxsize, len(self._results))
+
+    def clear(self):
+        """Remove all results and reset statistics."""
+        with self._lock:
+            self._results.clear()
+            self._hits = self._misses = self._bypasses = 0
+
+    def _make_key(self, fn, fileargs, args, kwargs, config=None):
+        """Build the cache key of a call, or return `_BYPASS`. The key
+        includes `config` (see `_config_key`) so that wrappers of the same
+        function opening files differently do not share results.
+        """
+        args = list(args)
+        kwargs = dict(kwargs)
+        for filearg in fileargs:
+            if filearg.pos is not None and filearg.pos < len(args):
+                store, key = args, filearg.pos
+            elif filearg.name in kwargs:
+                store, key = kwargs, filearg.name
+            else:
+                continue  # default value of the argument
+            if not is_valid_filename(store[key]):
+                return _BYPASS  # file objects or invalid arguments
+            store[key] = _file_key(store[key], self.hash_content)
+            if store[key] is _BYPASS:
+                return _BYPASS
+        try:
+            key = (fn, config, tuple(args), frozenset(kwargs.items()))
+            hash(key)
+        except TypeError:
+            return _BYPASS
+        return key
+
+    def wrap(self, dispatch, fn, fileargs):
+        """Memoize calls to the dispatcher of a wrapper.
+
+        Args:
+            dispatch: Dispatcher of the wrapper to be memoized
+            fn: Original function being wrapped (part of cache keys so that
+                the cache can be shared)
+            fileargs: Tuple of `FileArgument` specifications
+        Returns:
+            A function with the same call interface as `dispatch`
+        """
+        config = _config_key(fileargs)
+
+        def memoized(*args, **kwargs):
+            key = self._make_key(fn, fileargs, args, kwargs, config)
+            if key is _BYPASS:
+                with self._lock:
+                    self._bypasses += 1
+                return dispatch(*args, **kwargs)
+            now = time.monotonic()
+            with self._lock:
+                entry = self._results.get(key, _MISSING)
+                if entry is not _MISSING and entry[1] > now:
+                    self._results.move_to_end(key)
+                    self._hits += 1
+                    return entry[0]
+                self._misses += 1
+            value = dispatch(*args, **kwargs)
+            expiry = float('inf') if self.ttl is None else now + self.ttl
+            with self._lock:
+                self._results[key] = (value, expiry)
+                self._results.move_to_end(key)
+                if self.maxsize is not None:
+                    while len(self._results) > self.maxsize:
+                        self._results.popitem(last=False)
+            return value
+        return memoized
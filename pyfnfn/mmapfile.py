@@ -0,0 +1,178 @@
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Read-only file objects backed by memory-mapped files, whose reads are
+zero-copy slices of the mapping.
+"""
+
+__all__ = ('MappedFile', 'open_mapped')
+
+import io
+import mmap
+import weakref
+
+
+def open_mapped(file, mode='rb', **open_kwargs):
+    """Open a file name and map its whole content into memory.
+
+    Args:
+        file: File name to be opened
+        mode: Mode of opening which must be binary read-only
+        **open_kwargs: Other keyword arguments for built-in `open()`
+    Returns:
+        A `MappedFile` object over the opened file
+    """
+    if set(mode) != {'r', 'b'}:
+        raise ValueError(
+            'memory-mapped files require binary read mode, not {mode!r}'
+            .format(mode=mode)
+            )
+    open_kwargs.setdefault('buffering', 0)
+    fileobj = open(file, mode, **open_kwargs)
+    try:
+        return MappedFile(fileobj)
+    except BaseException:
+        fileobj.close()
+        raise
+
+
+class MappedFile(io.BufferedIOBase):
+    """Binary read-only file object over the memory map of an opened file.
+
+    Reading methods return `memoryview` slices of the mapping rather than
+    new `bytes` objects so that no data is copied, and the pages are
+    shared through the page cache with any other process mapping the same
+    file. Use `bytes()` on the slices which must outlive the file.
+
+    Closing the file releases all slices handed out by this object before
+    unmapping the file, so that the mapping is released deterministically.
+    Slices further derived from those slices by the caller cannot be
+    tracked; if any is still alive, unmapping is left to the garbage
+    collector once they are gone.
+
+    Attributes:
+        raw: The underlying opened file
+        name: Name of the underlying opened file
+    """
+
+    def __init__(self, fileobj):
+        self.raw = fileobj
+        self._pos = 0
+        self._exports = []
+        self._prune_at = 64
+        try:
+            self._mmap = mmap.mmap(
+                fileobj.fileno(), 0, access=mmap.ACCESS_READ
+                )
+        except ValueError:
+            # Empty files cannot be mapped
+            self._mmap = None
+            self._view = memoryview(b'')
+        else:
+            self._view = memoryview(self._mmap)
+
+    @property
+    def name(self):
+        return self.raw.name
+
+    @property
+    def mode(self):
+        return 'rb'
+
+    def __len__(self):
+        return len(self._view)
+
+    def readable(self):
+        self._checkClosed()
+        return True
+
+    def seekable(self):
+        self._checkClosed()
+        return True
+
+    def fileno(self):
+        return self.raw.fileno()
+
+    def tell(self):
+        self._checkClosed()
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        self._checkClosed()
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = len(self._view) + offset
+        else:
+            raise ValueError('invalid whence ({!r})'.format(whence))
+        if pos < 0:
+            raise ValueError('negative seek position {!r}'.format(pos))
+        self._pos = pos
+        return pos
+
+    def _export(self, start, stop):
+        """Hand out a slice of the mapping while keeping track of it."""
+        view = self._view[start:stop]
+        self._exports.append(weakref.ref(view))
+        if len(self._exports) > self._prune_at:
+            self._exports = [ref for ref in self._exports if ref() is not None]
+            self._prune_at = max(64, 2 * len(self._exports))
+        return view
+
+    def getbuffer(self):
+        """Return a read-only view over the whole content of the file."""
+        self._checkClosed()
+        return self._export(None, None)
+
+    def read(self, size=-1):
+        self._checkClosed()
+        start = min(self._pos, len(self._view))
+        if size is None or size < 0:
+            stop = len(self._view)
+        else:
+            stop = min(start + size, len(self._view))
+        self._pos = stop
+        return self._export(start, stop)
+
+    read1 = read
+
+    def readinto(self, buffer):
+        data = self.read(len(memoryview(buffer)))
+        size = len(data)
+        memoryview(buffer).cast('B')[:size] = data
+        data.release()
+        return size
+
+    readinto1 = readinto
+
+    def readline(self, size=-1):
+        self._checkClosed()
+        start = min(self._pos, len(self._view))
+        if self._mmap is None:
+            stop = start
+        else:
+            stop = self._mmap.find(b'\n', start) + 1 or len(self._view)
+        if size is not None and size >= 0:
+            stop = min(stop, start + size)
+        self._pos = stop
+        return self._export(start, stop)
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            for ref in self._exports:
+                view = ref()
+                if view is not None:
+                    view.release()
+            self._exports = []
+            self._view.release()
+            if self._mmap is not None:
+                try:
+                    self._mmap.close()
+                except BufferError:
+                    pass  # derived slices still alive: unmapped on collection
+        finally:
+            self.raw.close()
+            super().close()
@@ -0,0 +1,165 @@
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Construction of the functions which open file names given to file
+arguments, according to keyword arguments for `open()` and file options.
+"""
+
+__all__ = ('make_file_opener', 'opener_is_shareable')
+
+import functools
+
+
+def make_file_opener(open_kwargs, options):
+    """Construct a function which opens a file name into a file object.
+    This is done once at decoration time so that the options need not be
+    examined again for each call.
+
+    Args:
+        open_kwargs: Dictionary of keyword arguments to built-in function
+            `open()`
+        options: Dictionary of file options (see `utils.FILE_OPTIONS`)
+    Returns:
+        A function accepting a file name and returning a context manager
+        whose entered value is the opened file object (such as the file
+        object itself)
+    Raises:
+        ValueError if the options are not compatible with `open_kwargs`
+    """
+    # Modules implementing file options are imported here only when used,
+    # so that importing the package does not load all of them
+    if options['access']:
+        _check_plain_mode('access', open_kwargs, options)
+        from .access import _check_access, open_advised
+        access = _check_access(options['access'])
+        return functools.partial(open_advised, access=access, **open_kwargs)
+    if options['shards']:
+        _check_plain_mode('shards', open_kwargs, options)
+        from .shards import open_sharded
+        return functools.partial(open_sharded, **open_kwargs)
+    if options['uri'] not in (None, False):
+        mode = open_kwargs.get('mode', 'r')
+        _check_plain_mode('uri', open_kwargs, options,
+                          writing=bool(set(mode) & set('wxa')))
+        registry = options['uri']
+        if registry is True:
+            from .uri import default_registry as registry
+        return functools.partial(registry.open, **open_kwargs)
+    if options['line_index']:
+        _check_plain_mode('line_index', open_kwargs, options)
+        from .lineindex import line_index_step, open_indexed
+        step = line_index_step(options['line_index'])
+        return functools.partial(open_indexed, step=step, **open_kwargs)
+    if options['content_cache'] not in (None, False):
+        _check_plain_mode('content_cache', open_kwargs, options)
+        from .contentcache import default_content_cache
+        cache = options['content_cache']
+        if cache is True:
+            cache = default_content_cache
+        return functools.partial(cache.open, **open_kwargs)
+    if options['durable']:
+        _check_plain_mode('durable', open_kwargs, options, writing=True)
+        mode = open_kwargs.get('mode', 'r')
+        if 'w' not in mode or set(mode) & set('xa'):
+            raise ValueError(
+                "option 'durable' requires an overwriting mode, not {mode!r}"
+                .format(mode=mode)
+                )
+        from .durable import default_committer, open_durable
+        committer = options['durable']
+        if committer is True:
+            committer = default_committer
+        return functools.partial(open_durable, committer=committer,
+                                 **open_kwargs)
+    if options['write_behind'] is not None:
+        _check_plain_mode('write_behind', open_kwargs, options, writing=True)
+        from .writebehind import open_write_behind
+        depth = 16 if options['write_behind'] is True \
+            else options['write_behind']
+        if depth < 1:
+            raise ValueError('write-behind depth must be positive')
+        return functools.partial(open_write_behind, depth=depth,
+                                 **open_kwargs)
+    if options['fd_budget'] is not None:
+        _check_plain_mode('fd_budget', open_kwargs, options)
+        from .budget import DescriptorBudget, default_budget, open_suspendable
+        budget = options['fd_budget']
+        if budget is True:
+            budget = default_budget
+        elif not isinstance(budget, DescriptorBudget):
+            budget = DescriptorBudget(budget)
+        return functools.partial(open_suspendable, budget=budget,
+                                 **open_kwargs)
+    if options['prefetch'] is not None:
+        _check_plain_mode('prefetch', open_kwargs, options)
+        from .prefetch import open_prefetched
+        depth = 4 if options['prefetch'] is True else options['prefetch']
+        if depth < 1:
+            raise ValueError('prefetch depth must be positive')
+        return functools.partial(open_prefetched, depth=depth, **open_kwargs)
+    if options['decompress']:
+        _check_plain_mode('decompress', open_kwargs, options)
+        from .compression import _check_method, open_decompressed
+        method = _check_method(options['decompress'])
+        return functools.partial(
+            open_decompressed, method=method, **open_kwargs
+            )
+    if options['handle_pool'] is not None:
+        _check_plain_mode('handle_pool', open_kwargs, options)
+        from .handles import HandlePool
+        pool = options['handle_pool']
+        if not isinstance(pool, HandlePool):
+            pool = HandlePool(pool)
+        return functools.partial(pool.open, **open_kwargs)
+    if options['mmap']:
+        mode = open_kwargs.get('mode', 'r')
+        if set(mode) != {'r', 'b'}:
+            raise ValueError(
+                "option 'mmap' requires binary read mode 'rb', not {mode!r}"
+                .format(mode=mode)
+                )
+        from .mmapfile import open_mapped
+        return functools.partial(open_mapped, **open_kwargs)
+    return functools.partial(open, **open_kwargs)
+
+def opener_is_shareable(options):
+    """Check whether a function constructed by `make_file_opener` from the
+    file options `options` may be shared by several wrappers with the same
+    options. This is not the case when the size of a handle pool or the
+    limit of a descriptor budget is given, since each opener then creates
+    its own pool or budget.
+    """
+    pool = options['handle_pool']
+    budget = options['fd_budget']
+    return not (
+        isinstance(pool, int)
+        or (isinstance(budget, int) and budget is not True)
+        )
+
+# File options which replace how files are opened and so cannot be combined
+_OPENING_OPTIONS = (
+    'mmap', 'handle_pool', 'decompress', 'prefetch', 'fd_budget',
+    'write_behind', 'durable', 'content_cache', 'line_index', 'uri',
+    'shards', 'access',
+    )
+
+
+def _check_plain_mode(option, open_kwargs, options, writing=False):
+    """Check that the file option `option` is used with a plain read mode
+    (or a plain write mode if `writing`) and without any other file option
+    replacing how files are opened.
+    """
+    mode = open_kwargs.get('mode', 'r')
+    others = [
+        name for name in _OPENING_OPTIONS
+        if name != option and options[name] not in (None, False)
+        ]
+    if writing:
+        plain = not set(mode) - set('wxabt') and set(mode) & set('wxa')
+    else:
+        plain = not set(mode) - set('rbt')
+    if not plain or others:
+        raise ValueError(
+            'option {option!r} requires a plain {kind} mode, not {mode!r}'
+            .format(option=option, kind='write' if writing else 'read',
+                    mode=mode + ''.join(' with ' + name for name in others))
+            )
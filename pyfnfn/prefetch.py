@@ -0,0 +1,145 @@
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Read-ahead of files in a background thread, so that reading from disk
+overlaps with the work done by the consumer of the content (typically a
+generator function which is consumed slowly).
+"""
+
+__all__ = ('PrefetchingFile', 'open_prefetched')
+
+import io
+import queue
+import threading
+
+from .utils import wrap_raw_file
+
+# Size of each buffer read ahead when no buffering size is given
+_DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+def _read_ahead(raw, chunk_size, buffers, stop):
+    """Body of the background thread: read chunks of `raw` into the queue
+    `buffers` until the end of file, an error, or `stop` is set. The final
+    item is either `b''` or the exception raised while reading.
+    """
+    while not stop.is_set():
+        try:
+            chunk = raw.read(chunk_size)
+        except BaseException as e:
+            chunk = e
+        buffers.put(chunk)
+        if not chunk or isinstance(chunk, BaseException):
+            return
+
+
+class PrefetchingFile(io.RawIOBase):
+    """Raw binary read-only file object whose content is read ahead from
+    another raw file object by a background thread, keeping at most
+    `depth` buffers of `chunk_size` bytes in memory.
+
+    Closing this object (also when garbage-collected) stops the thread and
+    closes the underlying file. The thread does not refer to this object.
+
+    Attributes:
+        raw: The underlying raw binary file object (closed together)
+        depth: Maximum number of buffers read ahead
+        chunk_size: Size of each buffer read ahead
+    """
+
+    def __init__(self, raw, depth=4, chunk_size=_DEFAULT_CHUNK_SIZE):
+        if depth < 1:
+            raise ValueError('prefetch depth must be positive')
+        self.raw = raw
+        self.depth = depth
+        self.chunk_size = chunk_size
+        self._buffers = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._pending = memoryview(b'')
+        self._pos = 0
+        self._eof = False
+        self._thread = threading.Thread(
+            target=_read_ahead, name='pyfnfn-prefetch',
+            args=(raw, chunk_size, self._buffers, self._stop), daemon=True,
+            )
+        self._thread.start()
+
+    @property
+    def name(self):
+        return self.raw.name
+
+    def readable(self):
+        self._checkClosed()
+        return True
+
+    def fileno(self):
+        return self.raw.fileno()
+
+    def tell(self):
+        self._checkClosed()
+        return self._pos
+
+    def readinto(self, buffer):
+        self._checkClosed()
+        view = memoryview(buffer).cast('B')
+        if not self._pending and not self._eof:
+            chunk = self._buffers.get()
+            if isinstance(chunk, BaseException):
+                self._eof = True
+                raise chunk
+            if not chunk:
+                self._eof = True
+            self._pending = memoryview(chunk)
+        size = min(len(view), len(self._pending))
+        view[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        self._pos += size
+        return size
+
+    def close(self):
+        if not self.closed:
+            self._stop.set()
+            # Free a slot so that a thread blocked on a full queue can
+            # observe the stop event
+            try:
+                while True:
+                    self._buffers.get_nowait()
+            except queue.Empty:
+                pass
+            self._thread.join()
+            self._pending = memoryview(b'')
+            try:
+                self.raw.close()
+            finally:
+                super().close()
+
+
+def open_prefetched(file, mode='r', buffering=-1, encoding=None, errors=None,
+                    newline=None, closefd=True, opener=None, *, depth=4):
+    """Open a file for reading with its content read ahead by a background
+    thread. Arguments other than `depth` are as of built-in `open()`, where
+    `buffering` (if greater than one) is the size of each buffer read ahead.
+
+    Args:
+        file: File name to be opened
+        mode: Mode of opening which must be for reading
+        depth: Maximum number of buffers read ahead
+    Returns:
+        A buffered binary or text file object over a `PrefetchingFile`
+    """
+    if set(mode) - set('rbt'):
+        raise ValueError(
+            'prefetched files can only be opened for reading, not {mode!r}'
+            .format(mode=mode)
+            )
+    if buffering == 0 and 'b' not in mode:
+        raise ValueError("can't have unbuffered text I/O")
+    chunk_size = buffering if buffering > 1 else _DEFAULT_CHUNK_SIZE
+    raw = open(file, 'rb', buffering=0, closefd=closefd, opener=opener)
+    try:
+        raw = PrefetchingFile(raw, depth, chunk_size)
+    except BaseException:
+        raw.close()
+        raise
+    if buffering not in (0, 1):
+        buffering = chunk_size
+    return wrap_raw_file(raw, mode, buffering, encoding, errors, newline)
@@ -0,0 +1,197 @@
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Reading of directories and glob patterns as single files: the regular
+files found (the shards) are chained in the order of their names into one
+stream, opening each shard only when the previous one is exhausted. Shards
+are opened relative to a descriptor of their directory where supported, so
+that the path of the directory is resolved only once.
+"""
+
+__all__ = ('ShardedFile', 'open_sharded')
+
+import errno
+import fnmatch
+import glob
+import io
+import os
+import re
+
+from .utils import wrap_raw_file
+
+# Characters which make a file name a glob pattern (as in module `glob`)
+_MAGIC = re.compile(r'[*?[]')
+
+# Whether shards can be scanned and opened through a directory descriptor
+_DIR_FD_SUPPORTED = (
+    os.scandir in os.supports_fd and os.open in os.supports_dir_fd
+    )
+_DIR_FLAGS = os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0)
+_SHARD_FLAGS = os.O_RDONLY | getattr(os, 'O_BINARY', 0)
+
+_DirEntry = getattr(os, 'DirEntry', ())
+
+
+class ShardedFile(io.RawIOBase):
+    """Raw binary read-only file object chaining the content of several
+    files (the shards) one after another. At most one shard is open at a
+    time: each is opened once the previous one is read to its end.
+
+    Attributes:
+        name: The directory or glob pattern given when opening
+        shards: List of the paths of all shards in reading order
+    """
+
+    def __init__(self, name, directory, names, dir_fd=None, opener=None):
+        self.name = name
+        self.shards = [
+            shard if directory is None else os.path.join(directory, shard)
+            for shard in names
+            ]
+        self._names = names
+        self._dir_fd = dir_fd
+        self._opener = opener
+        self._index = -1
+        self._file = None
+        self._pos = 0
+
+    @property
+    def shard(self):
+        """Path of the shard currently open (`None` if there is none)."""
+        return None if self._file is None else self.shards[self._index]
+
+    def readable(self):
+        self._checkClosed()
+        return True
+
+    def tell(self):
+        self._checkClosed()
+        return self._pos
+
+    def readinto(self, buffer):
+        self._checkClosed()
+        while True:
+            if self._file is None:
+                if self._index + 1 >= len(self.shards):
+                    return 0
+                self._index += 1
+                self._file = self._open_shard(self._index)
+            size = self._file.readinto(buffer)
+            if size:
+                self._pos += size
+                return size
+            # End of this shard: move on to the next one
+            self._file.close()
+            self._file = None
+
+    def _open_shard(self, index):
+        if self._dir_fd is None:
+            return io.FileIO(self.shards[index], 'rb', opener=self._opener)
+        fd = os.open(self._names[index], _SHARD_FLAGS, dir_fd=self._dir_fd)
+        try:
+            return io.FileIO(fd, 'rb')
+        except BaseException:
+            os.close(fd)
+            raise
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        finally:
+            if self._dir_fd is not None:
+                os.close(self._dir_fd)
+                self._dir_fd = None
+            super().close()
+
+
+def _open_directory(name, directory, pattern=None, opener=None):
+    """Construct a `ShardedFile` over the regular files in `directory`
+    whose names match `pattern` (all of them if `None`), skipping hidden
+    files unless the pattern itself starts with a dot.
+    """
+    dir_fd = None
+    if _DIR_FD_SUPPORTED and opener is None:
+        dir_fd = os.open(directory, _DIR_FLAGS)
+    try:
+        hidden = pattern is not None and pattern.startswith('.')
+        with os.scandir(directory if dir_fd is None else dir_fd) as entries:
+            names = sorted(
+                entry.name for entry in entries
+                if (hidden or not entry.name.startswith('.'))
+                and (pattern is None or fnmatch.fnmatch(entry.name, pattern))
+                and entry.is_file()
+                )
+        if pattern is not None and not names:
+            raise FileNotFoundError(
+                errno.ENOENT, 'no files match the pattern', name
+                )
+        return ShardedFile(name, directory, names, dir_fd, opener)
+    except BaseException:
+        if dir_fd is not None:
+            os.close(dir_fd)
+        raise
+
+
+def _open_pattern(name, path, opener=None):
+    """Construct a `ShardedFile` over the regular files matching the glob
+    pattern `path`.
+    """
+    directory, pattern = os.path.split(path)
+    if not _MAGIC.search(directory):
+        return _open_directory(name, directory or os.curdir, pattern, opener)
+    # Patterns spanning several directories are resolved by `glob`
+    paths = sorted(
+        match for match in glob.glob(path) if os.path.isfile(match)
+        )
+    if not paths:
+        raise FileNotFoundError(
+            errno.ENOENT, 'no files match the pattern', name
+            )
+    return ShardedFile(name, None, paths, opener=opener)
+
+
+def open_sharded(file, mode='r', buffering=-1, encoding=None, errors=None,
+                 newline=None, closefd=True, opener=None):
+    """Open a file name like built-in function `open()` does, except that
+    directories (including directory entries from `os.scandir()`) and glob
+    patterns matching no file of the same name are opened for reading as
+    one file chaining their regular files in the order of their names (see
+    `ShardedFile`). Subdirectories and hidden files of directories are
+    skipped.
+
+    Regular files are opened directly without examining their names first.
+    """
+    is_pattern = False
+    if isinstance(file, _DirEntry) and file.is_dir():
+        path = file.path
+    else:
+        try:
+            return open(file, mode, buffering, encoding, errors, newline,
+                        closefd, opener)
+        except IsADirectoryError:
+            path = os.fsdecode(file)
+        except PermissionError:
+            # Opening a directory is denied instead on some platforms
+            if not os.path.isdir(file):
+                raise
+            path = os.fsdecode(file)
+        except FileNotFoundError:
+            path = os.fsdecode(file)
+            if not _MAGIC.search(path):
+                raise
+            is_pattern = True
+    if set(mode) - set('rbt'):
+        raise ValueError(
+            'directories and glob patterns can only be opened for reading, '
+            'not {mode!r}'.format(mode=mode)
+            )
+    if not closefd:
+        raise ValueError('Cannot use closefd=False with file name')
+    if is_pattern:
+        raw = _open_pattern(file, path, opener)
+    else:
+        raw = _open_directory(file, path, opener=opener)
+    return wrap_raw_file(raw, mode, buffering, encoding, errors, newline)
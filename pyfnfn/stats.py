@@ -0,0 +1,287 @@
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Instrumentation of wrapped calls: time spent opening files, in the
+function itself and exhausting generators, bytes transferred, and whether
+files were opened or passed through.
+"""
+
+__all__ = ('Histogram', 'WrapperStats')
+
+import bisect
+import threading
+import time
+
+# Upper bounds (in seconds) of histogram buckets: powers of two from one
+# microsecond up to about a minute, with a last bucket for anything above.
+_BUCKET_BOUNDS = tuple(2 ** k * 1e-6 for k in range(27))
+
+_COUNTERS = (
+    'calls', 'passthrough_calls', 'opened_calls', 'errors', 'files_opened',
+    'bytes_read', 'bytes_written',
+    )
+_HISTOGRAMS = ('open_latency', 'call_duration', 'generator_duration')
+
+
+class Histogram(object):
+    """Histogram of durations in seconds over exponentially sized buckets.
+
+    Attributes:
+        bounds: Upper bounds of all but the last bucket
+        buckets: Number of observations in each bucket
+        count: Total number of observations
+        total: Sum of all observations
+        min: Smallest observation (`None` if empty)
+        max: Largest observation (`None` if empty)
+    """
+
+    bounds = _BUCKET_BOUNDS
+
+    def __init__(self):
+        self.buckets = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.buckets[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def snapshot(self):
+        """Return a copy of the histogram as a dictionary."""
+        return {
+            'count': self.count, 'total': self.total, 'mean': self.mean,
+            'min': self.min, 'max': self.max, 'buckets': list(self.buckets),
+            }
+
+
+class WrapperStats(object):
+    """Thread-safe collection of counters and histograms of wrapped calls,
+    which may be shared by several wrappers.
+
+    Counters are: `calls`, `passthrough_calls` (no file needed opening),
+    `opened_calls`, `errors`, `files_opened`, `bytes_read` and
+    `bytes_written`. Histograms (in seconds) are: `open_latency`,
+    `call_duration` (until the function returns, which for coroutine
+    functions means until the coroutine finishes, and for generators and
+    asynchronous generators until the generator object is created) and
+    `generator_duration` (from creation of a generator or an asynchronous
+    generator until it is exhausted or closed). Bytes
+    are accounted from the change of position in the opened files.
+
+    Listeners are called as `listener(name, metric, value)` for every
+    observation where `name` is the qualified name of the wrapped function
+    and `metric` is a counter name (with the increment as value) or a
+    histogram name (with the duration as value), for exporting to external
+    metric systems. Listeners must be fast and must not raise.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._listeners = []
+        self.reset()
+
+    def __reduce__(self):
+        # Observations and listeners are not carried over to other processes
+        return type(self), ()
+
+    def reset(self):
+        """Reset all counters and histograms."""
+        with self._lock:
+            self._counters = dict.fromkeys(_COUNTERS, 0)
+            self._histograms = {name: Histogram() for name in _HISTOGRAMS}
+
+    def add_listener(self, listener):
+        """Register a function called for every observation."""
+        with self._lock:
+            self._listeners = self._listeners + [listener]
+
+    def remove_listener(self, listener):
+        """Unregister a function added by `add_listener`."""
+        with self._lock:
+            listeners = list(self._listeners)
+            listeners.remove(listener)
+            self._listeners = listeners
+
+    def snapshot(self):
+        """Return a copy of all counters and histograms as a dictionary."""
+        with self._lock:
+            result = dict(self._counters)
+            for name, histogram in self._histograms.items():
+                result[name] = histogram.snapshot()
+        return result
+
+    def count(self, name, metric, increment=1):
+        """Increment the counter `metric` on behalf of the function `name`."""
+        with self._lock:
+            self._counters[metric] += increment
+            listeners = self._listeners
+        for listener in listeners:
+            listener(name, metric, increment)
+
+    def observe(self, name, metric, value):
+        """Add `value` to the histogram `metric` on behalf of `name`."""
+        with self._lock:
+            self._histograms[metric].add(value)
+            listeners = self._listeners
+        for listener in listeners:
+            listener(name, metric, value)
+
+    def instrument_opener(self, name, open_file):
+        """Instrument a file opener (see `FileArgument.open_file`) to record
+        open latency and the bytes transferred through each opened file.
+        """
+        def instrumented_open_file(file_input):
+            return _AccountedFile(self, name, open_file, file_input)
+        return instrumented_open_file
+
+    def instrument(self, dispatch, name, is_generator, collect_pending,
+                   fileargs, is_coroutine=False, is_async_generator=False):
+        """Instrument the dispatcher of a wrapper.
+
+        Args:
+            dispatch: Dispatcher of the wrapper (whose openers were already
+                instrumented with `instrument_opener`)
+            name: Name reported to listeners
+            is_generator: Boolean indicating whether generators are returned
+            collect_pending: Function finding file arguments to be opened
+                (see `decorators._collect_pending`)
+            fileargs: Tuple of `FileArgument` specifications
+            is_coroutine: Boolean indicating whether coroutines are returned
+            is_async_generator: Boolean indicating whether asynchronous
+                generators are returned
+        Returns:
+            A function with the same call interface as `dispatch`
+        """
+        perf_counter = time.perf_counter
+
+        def instrumented(*args, **kwargs):
+            try:
+                opened = collect_pending(fileargs, args, kwargs) is not None
+            except TypeError:
+                opened = True  # let the dispatcher raise the error
+            self.count(name, 'opened_calls' if opened else 'passthrough_calls')
+            self.count(name, 'calls')
+            start = perf_counter()
+            try:
+                result = dispatch(*args, **kwargs)
+            except BaseException:
+                self.count(name, 'errors')
+                self.observe(name, 'call_duration', perf_counter() - start)
+                raise
+            if is_coroutine:
+                # Timed until the coroutine finishes instead
+                return self._timed_coroutine(name, result, start)
+            self.observe(name, 'call_duration', perf_counter() - start)
+            if is_generator:
+                return self._timed_generator(name, result, start)
+            if is_async_generator:
+                return self._timed_async_generator(name, result, start)
+            return result
+
+        return instrumented
+
+    async def _timed_coroutine(self, name, coroutine, start):
+        try:
+            return await coroutine
+        except Exception:
+            # Cancellation is not an error of the function
+            self.count(name, 'errors')
+            raise
+        finally:
+            self.observe(name, 'call_duration', time.perf_counter() - start)
+
+    async def _timed_async_generator(self, name, agen, start):
+        # Delegate to the asynchronous generator manually as in
+        # `aio.make_async_dispatcher`
+        try:
+            value = await agen.__anext__()
+            while True:
+                try:
+                    sent = yield value
+                except GeneratorExit:
+                    await agen.aclose()
+                    raise
+                except BaseException as e:
+                    value = await agen.athrow(e)
+                else:
+                    value = await agen.asend(sent)
+        except StopAsyncIteration:
+            return
+        except Exception:
+            self.count(name, 'errors')
+            raise
+        finally:
+            self.observe(
+                name, 'generator_duration', time.perf_counter() - start
+                )
+
+    def _timed_generator(self, name, generator, start):
+        try:
+            return (yield from generator)
+        except BaseException as e:
+            if not isinstance(e, GeneratorExit):
+                self.count(name, 'errors')
+            raise
+        finally:
+            self.observe(
+                name, 'generator_duration', time.perf_counter() - start
+                )
+
+
+def _position(fileobj):
+    """Obtain the byte position of the underlying raw file of `fileobj`
+    after flushing pending writes (`None` if unavailable).
+    """
+    try:
+        if fileobj.writable():
+            fileobj.flush()
+        buffered = getattr(fileobj, 'buffer', fileobj)
+        return getattr(buffered, 'raw', buffered).tell()
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+class _AccountedFile(object):
+    """Context manager opening a file through another opener and recording
+    its open latency and transferred bytes into a `WrapperStats`.
+    """
+
+    __slots__ = ('stats', 'name', 'context', 'fileobj', 'start', 'offset')
+
+    def __init__(self, stats, name, open_file, file_input):
+        self.stats = stats
+        self.name = name
+        self.start = time.perf_counter()
+        self.context = open_file(file_input)
+
+    def __enter__(self):
+        self.fileobj = self.context.__enter__()
+        self.stats.observe(
+            self.name, 'open_latency', time.perf_counter() - self.start
+            )
+        self.stats.count(self.name, 'files_opened')
+        self.offset = _position(self.fileobj)
+        return self.fileobj
+
+    def __exit__(self, exc_type, exc, tb):
+        end = _position(self.fileobj)
+        try:
+            metric = 'bytes_written' if self.fileobj.writable() \
+                else 'bytes_read'
+        except ValueError:  # closed by the function itself
+            end = None
+        try:
+            return self.context.__exit__(exc_type, exc, tb)
+        finally:
+            if self.offset is not None and end is not None:
+                self.stats.count(self.name, metric, abs(end - self.offset))
@@ -0,0 +1,423 @@
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Registry of opener backends for file names given as URIs, such as
+`file://` URIs of local files and `http://` URIs of remote files read over
+pooled keep-alive connections with ranged requests for seeking.
+"""
+
+__all__ = ('ConnectionPool', 'FileBackend', 'HTTPBackend', 'HTTPFile',
+           'OpenerRegistry', 'default_registry')
+
+import collections
+import errno
+import http.client
+import io
+import re
+import threading
+import time
+import urllib.parse
+import urllib.request
+
+from .utils import wrap_raw_file
+
+# Scheme at the beginning of a URI (at least two characters long, so that
+# Windows drive letters are not mistaken for schemes)
+_SCHEME = re.compile(r'([A-Za-z][A-Za-z0-9+.-]+)://')
+
+# Maximum number of redirections followed by a single request
+_MAX_REDIRECTS = 5
+
+
+def _check_read_mode(mode, scheme):
+    if set(mode) - set('rbt'):
+        raise ValueError(
+            '{scheme} URIs can only be opened for reading, not {mode!r}'
+            .format(scheme=scheme, mode=mode)
+            )
+
+
+class OpenerRegistry(object):
+    """Mapping of URI schemes to opener backends, which opens file names
+    given as URIs with the backend of their scheme and any other file names
+    (including URIs of schemes not registered) with built-in `open()`.
+
+    A backend is an object whose method `open()` accepts the same arguments
+    as built-in `open()`, with the URI in place of the file name.
+    """
+
+    def __init__(self, backends=None):
+        self._backends = dict(backends or {})
+        self._lock = threading.Lock()
+
+    def __reduce__(self):
+        if self is default_registry:
+            return 'default_registry'
+        return type(self), (self._backends,)
+
+    def register(self, scheme, backend):
+        """Register `backend` to open URIs of `scheme` (case-insensitive),
+        replacing any backend previously registered for it.
+        """
+        with self._lock:
+            self._backends[scheme.lower()] = backend
+
+    def unregister(self, scheme):
+        """Remove the backend registered for `scheme`."""
+        with self._lock:
+            del self._backends[scheme.lower()]
+
+    def backend_for(self, file):
+        """Find the backend opening `file`.
+
+        Returns:
+            The backend registered for the scheme of `file`, or `None` if
+            `file` is not a URI of a registered scheme
+        """
+        if not isinstance(file, str):
+            return None
+        match = _SCHEME.match(file)
+        if match is None:
+            return None
+        return self._backends.get(match.group(1).lower())
+
+    def open(self, file, mode='r', buffering=-1, encoding=None, errors=None,
+             newline=None, closefd=True, opener=None):
+        """Open a file name or a URI. Arguments are as of built-in `open()`.
+
+        Returns:
+            A file object
+        """
+        backend = self.backend_for(file)
+        if backend is None:
+            return open(file, mode, buffering, encoding, errors, newline,
+                        closefd, opener)
+        return backend.open(file, mode, buffering, encoding, errors,
+                            newline, closefd, opener)
+
+
+class FileBackend(object):
+    """Backend opening `file://` URIs of local files with built-in `open()`.
+    URIs naming other hosts than the local host are rejected.
+    """
+
+    def __reduce__(self):
+        return type(self), ()
+
+    def open(self, file, mode='r', buffering=-1, encoding=None, errors=None,
+             newline=None, closefd=True, opener=None):
+        parts = urllib.parse.urlsplit(file)
+        if parts.netloc not in ('', 'localhost'):
+            raise ValueError(
+                'file URIs of remote hosts are not supported: {file!r}'
+                .format(file=file)
+                )
+        path = urllib.request.url2pathname(parts.path)
+        return open(path, mode, buffering, encoding, errors, newline,
+                    closefd, opener)
+
+
+class ConnectionPool(object):
+    """Thread-safe pool of idle keep-alive HTTP connections, keyed by the
+    scheme, the host and the port. At most `max_idle` idle connections are
+    kept for each key, each for at most `idle_timeout` seconds.
+
+    Attributes:
+        max_idle: Maximum number of idle connections kept for each key
+        idle_timeout: Number of seconds after which idle connections are
+            closed rather than reused
+        timeout: Timeout in seconds of socket operations of connections
+        connections: Number of connections created
+        reuses: Number of requests sent over reused connections
+    """
+
+    def __init__(self, max_idle=8, idle_timeout=30.0, timeout=60.0):
+        if max_idle < 1:
+            raise ValueError('max_idle must be positive')
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.connections = 0
+        self.reuses = 0
+        self._lock = threading.Lock()
+        self._idle = collections.defaultdict(collections.deque)
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(idle) for idle in self._idle.values())
+
+    def acquire(self, key, fresh=False):
+        """Check out a connection for `key`, reusing an idle one if any
+        (unless `fresh`).
+
+        Returns:
+            A pair of an `http.client.HTTPConnection` and a boolean
+            indicating whether it was reused
+        """
+        expired = []
+        try:
+            with self._lock:
+                idle = self._idle[key]
+                deadline = time.monotonic() - self.idle_timeout
+                while idle and not fresh:
+                    conn, since = idle.pop()
+                    if since >= deadline:
+                        self.reuses += 1
+                        return conn, True
+                    expired.append(conn)
+                self.connections += 1
+        finally:
+            for conn in expired:
+                conn.close()
+        scheme, host, port = key
+        if scheme == 'https':
+            conn = http.client.HTTPSConnection(host, port,
+                                               timeout=self.timeout)
+        else:
+            conn = http.client.HTTPConnection(host, port,
+                                              timeout=self.timeout)
+        return conn, False
+
+    def release(self, key, conn):
+        """Check in an idle connection for `key` after its response has been
+        read completely, closing it if the pool is full.
+        """
+        with self._lock:
+            idle = self._idle[key]
+            if len(idle) < self.max_idle:
+                idle.append((conn, time.monotonic()))
+                return
+        conn.close()
+
+    def clear(self):
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, collections.defaultdict(
+                collections.deque
+                )
+        for connections in idle.values():
+            for conn, _ in connections:
+                conn.close()
+
+
+def _raise_for_status(response, uri):
+    """Raise the `OSError` corresponding to an error status of `response`."""
+    message = '{} {} for {}'.format(response.status, response.reason, uri)
+    if response.status in (404, 410):
+        raise FileNotFoundError(errno.ENOENT, message, uri)
+    if response.status in (401, 403):
+        raise PermissionError(errno.EACCES, message, uri)
+    raise OSError(errno.EIO, message, uri)
+
+
+def _send(conn, target, headers):
+    """Send a GET request for `target` over `conn` and get its response."""
+    conn.request('GET', target, headers=headers)
+    return conn.getresponse()
+
+
+class HTTPBackend(object):
+    """Backend opening `http://` and `https://` URIs for reading, over
+    connections of a `ConnectionPool` which are kept alive between calls.
+
+    Attributes:
+        pool: The `ConnectionPool` of connections
+    """
+
+    def __init__(self, max_idle=8, idle_timeout=30.0, timeout=60.0):
+        self.pool = ConnectionPool(max_idle, idle_timeout, timeout)
+
+    def __reduce__(self):
+        pool = self.pool
+        return type(self), (pool.max_idle, pool.idle_timeout, pool.timeout)
+
+    def request(self, uri, start=0):
+        """Send a GET request for `uri` from byte `start` onwards, following
+        redirections and retrying once over a new connection when a reused
+        connection turns out to have been closed by the server.
+
+        Returns:
+            A tuple of the pool key, the connection, the response whose
+            status is 200 or 206, and the final URI after redirections
+        Raises:
+            OSError (or its subclasses) for error statuses
+        """
+        for _ in range(_MAX_REDIRECTS + 1):
+            parts = urllib.parse.urlsplit(uri)
+            scheme = parts.scheme.lower()
+            if scheme not in ('http', 'https'):
+                raise ValueError(
+                    'unsupported scheme of redirection to {uri!r}'
+                    .format(uri=uri)
+                    )
+            port = parts.port or (443 if scheme == 'https' else 80)
+            key = (scheme, parts.hostname, port)
+            target = urllib.parse.urlunsplit(
+                ('', '', parts.path or '/', parts.query, '')
+                )
+            headers = {'Range': 'bytes={}-'.format(start)} if start else {}
+            conn, reused = self.pool.acquire(key)
+            try:
+                try:
+                    response = _send(conn, target, headers)
+                except (http.client.HTTPException, OSError):
+                    if not reused:
+                        raise
+                    # The server closed the idle connection: retry once
+                    conn.close()
+                    conn, _ = self.pool.acquire(key, fresh=True)
+                    response = _send(conn, target, headers)
+            except BaseException:
+                conn.close()
+                raise
+            if response.status in (200, 206):
+                return key, conn, response, uri
+            response.read()
+            self._finish(key, conn, response)
+            location = response.getheader('Location')
+            if response.status in (301, 302, 303, 307, 308) and location:
+                uri = urllib.parse.urljoin(uri, location)
+                continue
+            _raise_for_status(response, uri)
+        raise OSError(errno.ELOOP, 'too many redirections', uri)
+
+    def _finish(self, key, conn, response):
+        """Return the connection of a completely read response to the pool,
+        unless the server asked for it to be closed.
+        """
+        if response.will_close:
+            conn.close()
+        else:
+            self.pool.release(key, conn)
+
+    def open(self, file, mode='r', buffering=-1, encoding=None, errors=None,
+             newline=None, closefd=True, opener=None):
+        scheme = file.split(':', 1)[0].lower()
+        _check_read_mode(mode, scheme)
+        if not closefd:
+            raise ValueError('Cannot use closefd=False with file name')
+        if opener is not None:
+            raise ValueError(
+                'custom openers cannot open {scheme} URIs'
+                .format(scheme=scheme)
+                )
+        raw = HTTPFile(self, file)
+        return wrap_raw_file(raw, mode, buffering, encoding, errors, newline)
+
+
+class HTTPFile(io.RawIOBase):
+    """Raw binary file object reading a remote file over HTTP. The content
+    is streamed from a single response as long as it is read sequentially;
+    seeking elsewhere sends a new request for a range starting at the new
+    position (or skips content if the server does not support ranges).
+
+    The connection goes back to the pool of the backend once a response is
+    read completely, and is closed if the response is abandoned early.
+
+    Attributes:
+        backend: The `HTTPBackend` sending requests
+        name: The URI given when opening
+        uri: The URI after redirections
+        size: Size of the remote file (`None` if unknown)
+    """
+
+    def __init__(self, backend, uri):
+        self.backend = backend
+        self.name = self.uri = uri
+        self.size = None
+        self._pos = 0
+        self._key = self._conn = self._response = None
+        self._request(0)  # report errors such as missing files right away
+
+    @property
+    def mode(self):
+        return 'rb'
+
+    def readable(self):
+        self._checkClosed()
+        return True
+
+    def seekable(self):
+        self._checkClosed()
+        return True
+
+    def tell(self):
+        self._checkClosed()
+        return self._pos
+
+    def _request(self, start):
+        key, conn, response, self.uri = self.backend.request(self.uri, start)
+        self._key, self._conn, self._response = key, conn, response
+        if response.status == 206:
+            content_range = response.getheader('Content-Range', '')
+            total = content_range.rpartition('/')[2]
+            if total.isdigit():
+                self.size = int(total)
+            return
+        length = response.getheader('Content-Length')
+        if length is not None and length.isdigit():
+            self.size = int(length)
+        # Ranges are not supported: skip the content before `start`
+        while start > 0:
+            skipped = len(response.read(min(start, 1 << 16)))
+            if not skipped:
+                break
+            start -= skipped
+
+    def _release(self):
+        """Finish with the current response, returning its connection to
+        the pool if it was read completely or closing it otherwise.
+        """
+        conn, response = self._conn, self._response
+        self._conn = self._response = None
+        if response is None:
+            return
+        if response.isclosed():
+            self.backend._finish(self._key, conn, response)
+        else:
+            response.close()
+            conn.close()
+
+    def readinto(self, buffer):
+        self._checkClosed()
+        if self._response is None:
+            if self.size is not None and self._pos >= self.size:
+                return 0
+            self._request(self._pos)
+        count = self._response.readinto(buffer)
+        if not count:
+            self._release()
+        self._pos += count
+        return count
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        self._checkClosed()
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._pos + offset
+        elif whence == io.SEEK_END:
+            if self.size is None:
+                raise io.UnsupportedOperation('size of the file is unknown')
+            position = self.size + offset
+        else:
+            raise ValueError('invalid whence ({!r})'.format(whence))
+        if position < 0:
+            raise ValueError('negative seek position {!r}'.format(position))
+        if position != self._pos:
+            self._release()
+            self._pos = position
+        return position
+
+    def close(self):
+        if not self.closed:
+            try:
+                self._release()
+            finally:
+                super().close()
+
+
+default_registry = OpenerRegistry()
+default_registry.register('file', FileBackend())
+_default_http_backend = HTTPBackend()
+default_registry.register('http', _default_http_backend)
+default_registry.register('https', _default_http_backend)
@@ -2,11 +2,47 @@
 # More info at https://github.com/abhabongse/pyfnfn
 """Helper functions."""
 
-__all__ = ('is_valid_filename', 'validate_open_kwargs')
+__all__ = ('FILE_OPTIONS', 'OPEN_PARAMETERS', 'file_identity',
+           'is_valid_filename', 'place_file_input', 'split_open_kwargs',
+           'validate_open_kwargs', 'wrap_raw_file', 'wrap_text_file')
 
-import inspect
+import collections
+import io
 import os
 
+# Keyword arguments of built-in function `open()` (after the file itself)
+# along with their default values. They are spelled out here rather than
+# obtained through `inspect.signature(open)`, which parses the signature
+# text of the built-in and is too slow to be run at import or decoration
+# time; the test suite checks that they still agree.
+OPEN_PARAMETERS = collections.OrderedDict([
+    ('mode', 'r'),
+    ('buffering', -1),
+    ('encoding', None),
+    ('errors', None),
+    ('newline', None),
+    ('closefd', True),
+    ('opener', None),
+    ])
+
+# Keyword arguments for file arguments which are understood by this
+# package itself in addition to those of built-in function `open()`,
+# along with their default values.
+FILE_OPTIONS = collections.OrderedDict([
+    ('mmap', False),
+    ('handle_pool', None),
+    ('decompress', False),
+    ('prefetch', None),
+    ('fd_budget', None),
+    ('write_behind', None),
+    ('durable', False),
+    ('content_cache', False),
+    ('line_index', False),
+    ('uri', False),
+    ('shards', False),
+    ('access', False),
+    ])
+
 
 def is_valid_filename(filename):
     """Check if the content of `filename` is of a valid string type:
@@ -25,6 +61,20 @@ def is_valid_filename(filename):
         return False
 
 
+def file_identity(st):
+    """Extract the attributes of a stat result telling whether a file has
+    changed between two observations: the device and inode number identify
+    the file itself while the size and modification time reflect its
+    content.
+
+    Args:
+        st: Result of `os.stat()` or `os.fstat()` on the file
+    Returns:
+        A tuple which differs once the file is replaced or modified
+    """
+    return st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns
+
+
 def validate_open_kwargs(kwargs):
     """Check if keywork arguments dictionary are suitable for built-in
     `open()` function.
@@ -36,10 +86,118 @@ def validate_open_kwargs(kwargs):
     Raises:
         TypeError if some keywords are not valid
     """
-    open_spec = list(inspect.signature(open).parameters)[1:]
     for kwarg in kwargs:
-        if kwarg not in open_spec:
+        if kwarg not in OPEN_PARAMETERS:
             raise TypeError(
                 '{kwarg!r} is not a valid argument for built-in function open'
                 .format(kwarg=kwarg)
                 )
+
+
+def split_open_kwargs(kwargs):
+    """Separate keyword arguments given for file arguments into the ones
+    for built-in `open()` function and the file options of this package.
+
+    Args:
+        kwargs: A dictionary of potential keyword arguments for `open()`
+            mixed with names from `FILE_OPTIONS`
+    Returns:
+        A tuple of a dictionary of keyword arguments for `open()` and a
+        dictionary of all file options (filled with default values)
+    Raises:
+        TypeError if some keywords are not valid
+    """
+    open_kwargs = {}
+    options = FILE_OPTIONS.copy()
+    for kwarg, value in kwargs.items():
+        if kwarg in options:
+            options[kwarg] = value
+        else:
+            open_kwargs[kwarg] = value
+    validate_open_kwargs(open_kwargs)
+    return open_kwargs, options
+
+
+def place_file_input(filearg, file_input, args, kwargs):
+    """Insert a value for a file argument among the other arguments of a
+    call, positionally if the file argument is positional (so that the
+    other positional arguments fill the parameters around it) or by
+    keyword otherwise.
+
+    Args:
+        filearg: The `FileArgument` receiving `file_input`
+        file_input: File name or file object
+        args: Sequence of the other positional arguments
+        kwargs: Dictionary of the other keyword arguments (not modified)
+    Returns:
+        A tuple of the positional arguments and the keyword arguments of
+        the call
+    """
+    kwargs = dict(kwargs)
+    pos = filearg.pos
+    if pos is not None and pos <= len(args):
+        args = tuple(args[:pos]) + (file_input,) + tuple(args[pos:])
+    else:
+        kwargs[filearg.name] = file_input
+    return args, kwargs
+
+
+def wrap_raw_file(raw, mode='rb', buffering=-1, encoding=None, errors=None,
+                  newline=None, *, buffered_type=io.BufferedReader,
+                  text_type=io.TextIOWrapper):
+    """Assemble a file object over a raw binary file object the way built-in
+    `open()` does: `raw` itself if unbuffered, a buffered object over it
+    otherwise, and a text wrapper over the buffered object in text mode.
+    As with `open()`, `buffering` of one selects line buffering in text mode
+    and a negative value selects the default buffer size. `raw` is closed
+    if the file object cannot be assembled.
+
+    Args:
+        raw: Raw binary file object
+        mode: Mode of opening the file (only checked for 'b')
+        buffering, encoding, errors, newline: As of built-in `open()`
+        buffered_type: Class of the buffered object over `raw` (such as
+            `io.BufferedWriter` for files opened for writing)
+        text_type: Class of the text wrapper over the buffered object
+    Returns:
+        The outermost file object
+    Raises:
+        ValueError if unbuffered text I/O is requested
+    """
+    try:
+        text = 'b' not in mode
+        if buffering == 0:
+            if text:
+                raise ValueError("can't have unbuffered text I/O")
+            return raw
+        line_buffering = text and buffering == 1
+        if buffering < 0 or buffering == 1:
+            buffering = io.DEFAULT_BUFFER_SIZE
+        fileobj = buffered_type(raw, buffering)
+        if text:
+            fileobj = wrap_text_file(fileobj, mode, line_buffering, encoding,
+                                     errors, newline, text_type=text_type)
+    except BaseException:
+        raw.close()
+        raise
+    return fileobj
+
+
+def wrap_text_file(fileobj, mode='r', line_buffering=False, encoding=None,
+                   errors=None, newline=None, *, text_type=io.TextIOWrapper):
+    """Wrap a buffered binary file object into a text file object the way
+    built-in `open()` does in text mode, including its `mode` attribute.
+
+    Args:
+        fileobj: Buffered binary file object
+        mode: Mode of opening the file
+        line_buffering: Whether writes are flushed at each newline (as with
+            `buffering` of one in `open()`)
+        encoding, errors, newline: As of built-in `open()`
+        text_type: Class of the text wrapper
+    Returns:
+        The text file object
+    """
+    fileobj = text_type(fileobj, encoding, errors, newline, line_buffering)
+    fileobj.mode = mode
+    return fileobj
@@ -0,0 +1,174 @@
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Write-behind of files opened for writing: written data is queued in
+memory and written to disk in large batches by a background thread, so
+that slow disks do not stall the writer.
+"""
+
+__all__ = ('WriteBehindFile', 'open_write_behind')
+
+import io
+import queue
+import threading
+
+from .utils import wrap_raw_file
+
+# Size of the batches written to disk when no buffering size is given
+_DEFAULT_BATCH_SIZE = 1 << 20
+
+# Queued item asking the background thread to stop
+_STOP = None
+
+
+def _write_behind(raw, chunks, batch_size, errors):
+    """Body of the background thread: write chunks taken from the queue
+    `chunks` to `raw`, joining queued chunks into batches of up to about
+    `batch_size` bytes, until `_STOP` is taken. After the first error
+    (stored into the list `errors`), chunks are taken but discarded.
+    """
+    while True:
+        batch = [chunks.get()]
+        size = len(batch[0] or b'')
+        while batch[-1] is not _STOP and size < batch_size:
+            try:
+                batch.append(chunks.get_nowait())
+            except queue.Empty:
+                break
+            size += len(batch[-1] or b'')
+        stop = batch[-1] is _STOP
+        if stop:
+            batch.pop()
+        try:
+            if batch and not errors:
+                view = memoryview(b''.join(batch))
+                while view:
+                    view = view[raw.write(view):]
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            for _ in range(len(batch) + stop):
+                chunks.task_done()
+        if stop:
+            return
+
+
+class WriteBehindFile(io.RawIOBase):
+    """Raw binary write-only file object whose writes are queued and then
+    written to another raw file object by a background thread, keeping at
+    most `depth` written chunks in memory.
+
+    Flushing waits until all queued chunks are written. An error raised by
+    writing to `raw` is raised again by every later write, flush and close.
+    Closing this object (also when garbage-collected) flushes the queue,
+    stops the thread and closes the underlying file. The thread does not
+    refer to this object.
+
+    Attributes:
+        raw: The underlying raw binary file object (closed together)
+        depth: Maximum number of chunks queued
+        batch_size: Size beyond which queued chunks are not joined further
+    """
+
+    def __init__(self, raw, depth=16, batch_size=_DEFAULT_BATCH_SIZE):
+        if depth < 1:
+            raise ValueError('write-behind depth must be positive')
+        try:
+            self._pos = raw.tell()
+        except OSError:  # not seekable
+            self._pos = 0
+        self.raw = raw
+        self.depth = depth
+        self.batch_size = batch_size
+        self._chunks = queue.Queue(maxsize=depth)
+        self._errors = []
+        self._thread = threading.Thread(
+            target=_write_behind, name='pyfnfn-write-behind',
+            args=(raw, self._chunks, batch_size, self._errors), daemon=True,
+            )
+        self._thread.start()
+
+    @property
+    def name(self):
+        return self.raw.name
+
+    @property
+    def mode(self):
+        return self.raw.mode
+
+    def writable(self):
+        self._checkClosed()
+        return True
+
+    def fileno(self):
+        return self.raw.fileno()
+
+    def tell(self):
+        # Position as if all queued chunks were already written
+        self._checkClosed()
+        return self._pos
+
+    def _check_errors(self):
+        if self._errors:
+            raise self._errors[0]
+
+    def write(self, buffer):
+        self._checkClosed()
+        self._check_errors()
+        data = bytes(buffer)  # the caller may reuse the buffer
+        if data:
+            self._chunks.put(data)
+            self._pos += len(data)
+        return len(data)
+
+    def flush(self):
+        if not self.closed:
+            self._chunks.join()
+            self._check_errors()
+
+    def close(self):
+        if not self.closed:
+            try:
+                self._chunks.put(_STOP)
+                self._thread.join()
+                self._check_errors()
+            finally:
+                self._errors = []  # not raised again by flushing on close
+                try:
+                    self.raw.close()
+                finally:
+                    super().close()
+
+
+def open_write_behind(file, mode='w', buffering=-1, encoding=None,
+                      errors=None, newline=None, closefd=True, opener=None,
+                      *, depth=16):
+    """Open a file for writing behind a background thread. Arguments other
+    than `depth` are as of built-in `open()`, where `buffering` (if greater
+    than one) is the size of the batches written to disk.
+
+    Args:
+        file: File name to be opened
+        mode: Mode of opening which must be for writing without reading
+        depth: Maximum number of chunks queued
+    Returns:
+        A buffered binary or text file object over a `WriteBehindFile`
+    """
+    if set(mode) - set('wxabt') or not set(mode) & set('wxa'):
+        raise ValueError(
+            'write-behind files can only be opened for writing, not {mode!r}'
+            .format(mode=mode)
+            )
+    if buffering == 0 and 'b' not in mode:
+        raise ValueError("can't have unbuffered text I/O")
+    batch_size = buffering if buffering > 1 else _DEFAULT_BATCH_SIZE
+    raw_mode = mode.replace('t', '').replace('b', '') + 'b'
+    raw = open(file, raw_mode, buffering=0, closefd=closefd, opener=opener)
+    try:
+        raw = WriteBehindFile(raw, depth, batch_size)
+    except BaseException:
+        raw.close()
+        raise
+    if buffering not in (0, 1):
+        buffering = min(batch_size, 1 << 16)
+    return wrap_raw_file(raw, mode, buffering, encoding, errors, newline,
+                         buffered_type=io.BufferedWriter)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Test suite for adaptive buffering and access pattern hints."""
+__all__ = ()
+
+import io
+import os
+import stat
+import tempfile
+import types
+import unittest
+from unittest import mock
+from pyfnfn import fnfnwrap
+from pyfnfn import access
+from pyfnfn.access import (
+    ACCESS_PATTERNS, DropBehindFile, buffer_size, open_advised,
+    )
+
+# Obtain the path for data.txt within the same directory as this code.
+this_dir = os.path.dirname(os.path.abspath(__file__))
+data_filename = os.path.join(this_dir, 'data.txt')
+
+with open(data_filename, 'rb') as data_file:
+    ref_content = data_file.read()
+
+@fnfnwrap(access=True)
+def read_all(file_input):
+    return file_input.read()
+
+@fnfnwrap(mode='rb', access='once')
+def read_once(file_input):
+    return file_input.read()
+
+
+def _stat(size, blksize=4096):
+    return types.SimpleNamespace(st_mode=stat.S_IFREG | 0o644,
+                                 st_size=size, st_blksize=blksize)
+
+###################################################
+##  All test cases for access hints reside here  ##
+###################################################
+
+class AccessTestCase(unittest.TestCase):
+
+    def test_buffer_sizes(self):
+        self.assertEqual(buffer_size(_stat(0)), 4096)
+        self.assertEqual(buffer_size(_stat(100)), 4096)
+        self.assertEqual(buffer_size(_stat(5000)), 8192)
+        self.assertEqual(buffer_size(_stat(1 << 30)), 128 << 10)
+        self.assertEqual(buffer_size(_stat(1 << 30), 'sequential'), 1 << 20)
+        self.assertEqual(buffer_size(_stat(1 << 30), 'random'), 4096)
+        self.assertEqual(buffer_size(_stat(1 << 30, 65536), 'random'), 65536)
+        with open(data_filename) as fileobj:
+            st = os.fstat(fileobj.fileno())
+            self.assertEqual(buffer_size(st), st.st_blksize)
+        r, w = os.pipe()
+        try:
+            self.assertIsNone(buffer_size(os.fstat(r)))
+        finally:
+            os.close(r)
+            os.close(w)
+
+    def test_read_patterns(self):
+        self.assertEqual(read_all(data_filename), ref_content.decode())
+        self.assertEqual(read_once(data_filename), ref_content)
+        for pattern in ACCESS_PATTERNS:
+            wrapper = fnfnwrap(read_all.__wrapped__, mode='rb',
+                               access=pattern)
+            self.assertEqual(wrapper(data_filename), ref_content)
+        with open_advised(data_filename, 'rb', access='random') as fileobj:
+            fileobj.seek(5)
+            self.assertEqual(fileobj.read(3), ref_content[5:8])
+        with open_advised(data_filename, 'rb', buffering=0) as fileobj:
+            self.assertIsInstance(fileobj, io.FileIO)
+        with open_advised(data_filename, buffering=1) as fileobj:
+            self.assertTrue(fileobj.line_buffering)
+            self.assertEqual(fileobj.mode, 'r')
+
+    @unittest.skipUnless(hasattr(os, 'posix_fadvise'), 'requires fadvise')
+    def test_hints(self):
+        with mock.patch.object(access, '_fadvise') as fadvise:
+            with open_advised(data_filename, access='sequential'):
+                pass
+            fadvise.assert_called_once_with(mock.ANY, 0, 0,
+                                            os.POSIX_FADV_SEQUENTIAL)
+            fadvise.reset_mock()
+            with open_advised(data_filename, access='normal'):
+                pass
+            fadvise.assert_not_called()
+            with open_advised(data_filename, 'rb', access='once') as fileobj:
+                self.assertIsInstance(fileobj.raw, DropBehindFile)
+                fileobj.read()
+                fadvise.reset_mock()
+            fadvise.assert_called_once_with(mock.ANY, 0, 0,
+                                            os.POSIX_FADV_DONTNEED)
+
+    @unittest.skipUnless(hasattr(os, 'posix_fadvise'), 'requires fadvise')
+    def test_drop_behind(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'big.bin')
+            with open(filename, 'wb') as fileobj:
+                fileobj.write(bytes(20 << 20))
+            with mock.patch.object(access, '_fadvise') as fadvise:
+                with DropBehindFile(filename) as fileobj:
+                    while fileobj.read(1 << 20):
+                        pass
+                    dropped = [call[0][1:] for call in fadvise.call_args_list]
+                    self.assertEqual(dropped, [
+                        (0, 8 << 20, os.POSIX_FADV_DONTNEED),
+                        (8 << 20, 8 << 20, os.POSIX_FADV_DONTNEED),
+                        ])
+                    fileobj.seek(0)
+                    fileobj.read(8 << 20)
+                    self.assertEqual(fadvise.call_args[0][1:3],
+                                     (0, 8 << 20))
+
+    def test_invalid_options(self):
+        with self.assertRaisesRegex(ValueError, r'unknown access pattern'):
+            fnfnwrap(read_all.__wrapped__, access='backwards')
+        with self.assertRaisesRegex(ValueError, r'requires a plain read'):
+            fnfnwrap(read_all.__wrapped__, mode='w', access=True)
+        with self.assertRaisesRegex(ValueError, r'requires a plain read'):
+            fnfnwrap(read_all.__wrapped__, access=True, shards=True)
+        for mode in ('w', 'a', 'r+', 'xb'):
+            with self.assertRaisesRegex(ValueError, r'only be opened for'):
+                open_advised(data_filename, mode)
+        with self.assertRaises(TypeError):
+            open_advised(data_filename, 'r', -1, None, None, None, True,
+                         None, 'random')
+
+
+if __name__ == '__main__':
+    unittest.main()
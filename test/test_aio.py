@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Test suite for wrapping coroutine functions and asynchronous generator
+functions.
+"""
+__all__ = ()
+
+import asyncio
+import os
+import threading
+import unittest
+from pyfnfn import fnfnwrap
+
+# Obtain the path for data.txt within the same directory as this code.
+this_dir = os.path.dirname(os.path.abspath(__file__))
+data_filename = os.path.join(this_dir, 'data.txt')
+
+with open(data_filename) as data_file:
+    ref_data = [ int(token) for line in data_file for token in line.split() ]
+
+opening_threads = []
+
+def recording_opener(path, flags):
+    opening_threads.append(threading.get_ident())
+    return os.open(path, flags)
+
+@fnfnwrap(opener=recording_opener)
+async def read_numbers_coroutine(file_input):
+    await asyncio.sleep(0)  # file must remain open across suspension
+    return file_input, [ int(token) for line in file_input
+                         for token in line.split() ]
+
+@fnfnwrap(filearg='file_input')
+async def read_numbers_async_generator(file_input, scale=1):
+    for line in file_input:
+        for token in line.split():
+            await asyncio.sleep(0)
+            received = yield int(token) * scale
+            if received is not None:
+                scale = received
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+#######################################################
+##  All test cases for asyncio support resides here  ##
+#######################################################
+
+class AsyncTestCase(unittest.TestCase):
+
+    def test_attributes(self):
+        self.assertTrue(read_numbers_coroutine.is_coroutine)
+        self.assertFalse(read_numbers_coroutine.is_async_generator)
+        self.assertTrue(read_numbers_async_generator.is_async_generator)
+        self.assertFalse(read_numbers_async_generator.is_generator)
+
+    def test_coroutine(self):
+        del opening_threads[:]
+        fileobj, numbers = run(read_numbers_coroutine(data_filename))
+        self.assertEqual(numbers, ref_data)
+        self.assertTrue(fileobj.closed)
+        self.assertEqual(len(opening_threads), 1)
+        self.assertNotEqual(opening_threads[0], threading.get_ident())
+        with open(data_filename) as data_file:
+            fileobj, numbers = run(read_numbers_coroutine(data_file))
+            self.assertIs(fileobj, data_file)
+            self.assertFalse(data_file.closed)
+        self.assertEqual(numbers, ref_data)
+
+    def test_async_generator(self):
+        async def collect(agen):
+            return [value async for value in agen]
+        self.assertEqual(
+            run(collect(read_numbers_async_generator(data_filename))),
+            ref_data
+            )
+        with open(data_filename) as data_file:
+            self.assertEqual(
+                run(collect(read_numbers_async_generator(data_file, 2))),
+                [value * 2 for value in ref_data]
+                )
+
+    def test_async_generator_asend_and_aclose(self):
+        async def scenario():
+            agen = read_numbers_async_generator(file_input=data_filename)
+            first = await agen.__anext__()
+            second = await agen.asend(10)
+            await agen.aclose()
+            return first, second
+        self.assertEqual(run(scenario()), (ref_data[0], ref_data[1] * 10))
+
+    def test_exceptions(self):
+        with self.assertRaisesRegex(
+                TypeError, r"'file_input' must have been file name"):
+            read_numbers_coroutine(10)
+        with self.assertRaises(FileNotFoundError):
+            run(read_numbers_coroutine(os.path.join(this_dir, 'missing.txt')))
+
+
+if __name__ == '__main__':
+    unittest.main()
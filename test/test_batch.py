@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Test suite for running wrapped functions over batches of files."""
+__all__ = ()
+
+import concurrent.futures
+import os
+import pickle
+import threading
+import unittest
+from unittest import mock
+from pyfnfn import fnfnwrap
+
+# Obtain the path for data.txt within the same directory as this code.
+this_dir = os.path.dirname(os.path.abspath(__file__))
+data_filename = os.path.join(this_dir, 'data.txt')
+missing_filename = os.path.join(this_dir, 'missing.txt')
+
+with open(data_filename) as data_file:
+    ref_data = [ int(token) for line in data_file for token in line.split() ]
+
+@fnfnwrap
+def sum_numbers(file_input, offset=0):
+    return sum(int(token) + offset for line in file_input
+               for token in line.split())
+
+@fnfnwrap(filearg='file_input')
+def read_numbers_generator(file_input):
+    for line in file_input:
+        for token in line.split():
+            yield int(token)
+
+def read_first_line(file_input):
+    return file_input.readline()
+
+read_first_line_wrapped = fnfnwrap(read_first_line)
+
+class Reader(object):
+    def __init__(self, offset):
+        self.offset = offset
+    @fnfnwrap(filearg=1)
+    def total(self, file_input):
+        return sum_numbers(file_input, self.offset)
+
+###################################################
+##  All test cases for batch calls resides here  ##
+###################################################
+
+class BatchTestCase(unittest.TestCase):
+
+    def test_thread_pool(self):
+        inputs = [data_filename] * 10
+        results = list(sum_numbers.map(inputs, workers=3))
+        self.assertEqual(len(results), 10)
+        for result in results:
+            self.assertEqual(result.file_input, data_filename)
+            self.assertEqual(result.value, sum(ref_data))
+            self.assertIsNone(result.error)
+
+    def test_extra_arguments_and_order(self):
+        inputs = [data_filename] * 5 + [missing_filename] + [data_filename]
+        results = list(sum_numbers.map(inputs, offset=1, ordered=True,
+                                       workers=2, max_inflight=2))
+        self.assertEqual([r.file_input for r in results], inputs)
+        self.assertEqual(results[0].value, sum(ref_data) + len(ref_data))
+        self.assertIsInstance(results[5].error, FileNotFoundError)
+        self.assertIsNone(results[5].value)
+        self.assertEqual(results[6].value, sum(ref_data) + len(ref_data))
+
+    def test_extra_positional_arguments(self):
+        results = list(sum_numbers.map([data_filename] * 3, 1))
+        for result in results:
+            self.assertIsNone(result.error)
+            self.assertEqual(result.value, sum(ref_data) + len(ref_data))
+        results = list(Reader(0).total.map([data_filename], workers=1))
+        self.assertEqual(results[0].value, sum(ref_data))
+
+    def test_generator_function(self):
+        results = list(read_numbers_generator.map([data_filename] * 2))
+        self.assertEqual([r.value for r in results], [ref_data] * 2)
+
+    def test_max_inflight(self):
+        active = []
+        lock = threading.Lock()
+        peak = [0]
+
+        @fnfnwrap
+        def track(file_input):
+            with lock:
+                active.append(file_input)
+                peak[0] = max(peak[0], len(active))
+            try:
+                return file_input.read()
+            finally:
+                with lock:
+                    active.remove(file_input)
+
+        inputs = [data_filename] * 20
+        results = list(track.map(inputs, workers=4, max_inflight=2))
+        self.assertEqual(len(results), 20)
+        self.assertLessEqual(peak[0], 2)
+
+    def test_existing_executor(self):
+        with concurrent.futures.ThreadPoolExecutor(2) as executor:
+            results = list(sum_numbers.map([data_filename], executor=executor))
+            self.assertEqual(results[0].value, sum(ref_data))
+            # Executor is left running
+            self.assertEqual(executor.submit(int, '3').result(), 3)
+
+    def test_default_max_inflight(self):
+        class DelegatingExecutor(concurrent.futures.Executor):
+            # Executors in general do not tell their number of workers
+            def __init__(self, pool):
+                self.pool = pool
+            def submit(self, fn, *args, **kwargs):
+                return self.pool.submit(fn, *args, **kwargs)
+
+        # Four calls must be in flight at once to pass the barrier
+        barrier = threading.Barrier(4, timeout=10)
+
+        @fnfnwrap
+        def meet(file_input):
+            barrier.wait()
+            return file_input.read()
+
+        with concurrent.futures.ThreadPoolExecutor(8) as pool:
+            executor = DelegatingExecutor(pool)
+            with mock.patch('os.cpu_count', return_value=2):
+                results = list(meet.map([data_filename] * 8,
+                                        executor=executor))
+        self.assertEqual([r.error for r in results], [None] * 8)
+
+    def test_process_pool(self):
+        inputs = [data_filename, missing_filename, data_filename]
+        results = list(sum_numbers.map(inputs, executor='process',
+                                       workers=2, ordered=True))
+        self.assertEqual(results[0].value, sum(ref_data))
+        self.assertIsInstance(results[1].error, FileNotFoundError)
+        self.assertEqual(results[2].value, sum(ref_data))
+
+    def test_pickle(self):
+        for wrapper in (sum_numbers, read_numbers_generator):
+            with self.subTest(wrapper=wrapper.__qualname__):
+                self.assertIs(pickle.loads(pickle.dumps(wrapper)), wrapper)
+        wrapper = read_first_line_wrapped
+        clone = pickle.loads(pickle.dumps(wrapper))
+        self.assertIsNot(clone, wrapper)
+        self.assertEqual(clone.fileargs[0][:4], wrapper.fileargs[0][:4])
+        self.assertEqual(clone(data_filename), wrapper(data_filename))
+        bound = Reader(2).total
+        clone = pickle.loads(pickle.dumps(bound))
+        self.assertEqual(clone.__wrapped__.__self__.offset, 2)
+        self.assertEqual(clone(data_filename), bound(data_filename))
+
+    def test_exceptions(self):
+        with self.assertRaisesRegex(ValueError, r'executor must be one of'):
+            list(sum_numbers.map([data_filename], executor='fiber'))
+        with self.assertRaisesRegex(ValueError, r'max_inflight must be'):
+            list(sum_numbers.map([data_filename], max_inflight=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
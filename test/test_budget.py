@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Test suite for the budget of file descriptors of file arguments."""
+__all__ = ()
+
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from pyfnfn import fnfnwrap
+from pyfnfn.budget import (
+    DescriptorBudget, SuspendableFile, default_budget, open_suspendable,
+    )
+
+# Obtain the path for data.txt within the same directory as this code.
+this_dir = os.path.dirname(os.path.abspath(__file__))
+data_filename = os.path.join(this_dir, 'data.txt')
+
+with open(data_filename) as data_file:
+    ref_data = [ int(token) for line in data_file for token in line.split() ]
+
+with open(data_filename, 'rb') as data_file:
+    ref_content = data_file.read()
+
+shared_budget = DescriptorBudget(limit=3)
+
+@fnfnwrap(fd_budget=shared_budget, buffering=16)
+def read_numbers_generator(file_input):
+    for line in file_input:
+        for token in line.split():
+            yield int(token)
+
+##########################################################
+##  All test cases for descriptor budgets resides here  ##
+##########################################################
+
+class DescriptorBudgetTestCase(unittest.TestCase):
+
+    def test_many_generators(self):
+        # Far more generators than the budget interleaved with each other
+        generators = [ read_numbers_generator(data_filename)
+                       for _ in range(20) ]
+        suspensions = shared_budget.suspensions
+        results = [ [] for _ in generators ]
+        for _ in range(len(ref_data)):
+            for generator, result in zip(generators, results):
+                result.append(next(generator))
+            self.assertLessEqual(len(shared_budget), shared_budget.limit)
+        for generator, result in zip(generators, results):
+            result.extend(generator)
+            self.assertEqual(result, ref_data)
+        self.assertGreater(shared_budget.suspensions, suspensions)
+        self.assertEqual(len(shared_budget), 0)
+
+    def test_suspend_resume(self):
+        budget = DescriptorBudget(limit=1)
+        first = open_suspendable(data_filename, 'rb', buffering=0,
+                                 budget=budget)
+        self.assertIsInstance(first, SuspendableFile)
+        self.assertEqual(first.read(4), ref_content[:4])
+        second = open_suspendable(data_filename, 'rb', buffering=0,
+                                  budget=budget)
+        self.assertTrue(first.suspended)
+        self.assertEqual(first.tell(), 4)
+        self.assertEqual(budget.suspensions, 1)
+        self.assertEqual(first.read(), ref_content[4:])
+        self.assertEqual(budget.resumptions, 1)
+        self.assertTrue(second.suspended)
+        self.assertEqual(second.read(), ref_content)
+        first.close()
+        second.close()
+        self.assertEqual(len(budget), 0)
+
+    def test_replaced_file(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        filename = os.path.join(directory, 'data.txt')
+        shutil.copy(data_filename, filename)
+        budget = DescriptorBudget(limit=1)
+        with open_suspendable(filename, budget=budget) as fileobj:
+            self.assertEqual(fileobj.readline(), ref_content.decode()
+                             .splitlines(keepends=True)[0])
+            open_suspendable(data_filename, budget=budget).close()
+            replacement = filename + '.new'
+            shutil.copy(data_filename, replacement)
+            os.replace(replacement, filename)
+            with self.assertRaises(OSError):
+                fileobj.read()
+
+    def test_options(self):
+        @fnfnwrap(fd_budget=True)
+        def read_all(file_input):
+            return file_input.read()
+        self.assertEqual(read_all(data_filename), ref_content.decode())
+        self.assertIs(pickle.loads(pickle.dumps(default_budget)),
+                      default_budget)
+        self.assertEqual(pickle.loads(pickle.dumps(shared_budget)).limit, 3)
+        with self.assertRaisesRegex(ValueError, r'requires a plain read mode'):
+            fnfnwrap(read_all.__wrapped__, mode='a', fd_budget=True)
+        with self.assertRaisesRegex(ValueError, r'limit must be positive'):
+            fnfnwrap(read_all.__wrapped__, fd_budget=0)
+        with self.assertRaises(FileNotFoundError):
+            read_all(os.path.join(this_dir, 'missing.txt'))
+
+
+if __name__ == '__main__':
+    unittest.main()
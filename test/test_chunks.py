@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Test suite for processing byte ranges of a file in parallel."""
+__all__ = ()
+
+import io
+import operator
+import os
+import tempfile
+import unittest
+from pyfnfn import fnfnwrap
+from pyfnfn.chunks import open_range, split_ranges
+
+# Obtain the path for data.txt within the same directory as this code.
+this_dir = os.path.dirname(os.path.abspath(__file__))
+data_filename = os.path.join(this_dir, 'data.txt')
+
+with open(data_filename, 'rb') as data_file:
+    ref_content = data_file.read()
+ref_data = [ int(token) for token in ref_content.split() ]
+
+@fnfnwrap
+def read_numbers(file_input):
+    return [ int(token) for line in file_input for token in line.split() ]
+
+@fnfnwrap(filearg='file_input', mode='rb')
+def count_lines(scale, file_input):
+    return scale * sum(1 for line in file_input)
+
+@fnfnwrap(mode='rb')
+def count_lines_first(file_input, scale):
+    return scale * sum(1 for line in file_input)
+
+@fnfnwrap
+def read_numbers_generator(file_input):
+    for line in file_input:
+        for token in line.split():
+            yield int(token)
+
+################################################
+##  All test cases for chunking resides here  ##
+################################################
+
+class ChunksTestCase(unittest.TestCase):
+
+    def test_split_ranges(self):
+        for count in range(1, 2 * len(ref_content)):
+            with self.subTest(count=count):
+                ranges = split_ranges(data_filename, count)
+                self.assertLessEqual(len(ranges), count)
+                self.assertEqual(ranges[0][0], 0)
+                self.assertEqual(ranges[-1][1], len(ref_content))
+                for (_, stop), (start, _) in zip(ranges, ranges[1:]):
+                    self.assertEqual(stop, start)
+                    self.assertEqual(ref_content[stop - 1:stop], b'\n')
+
+    def test_split_ranges_empty_file(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            empty = os.path.join(tempdir, 'empty.txt')
+            open(empty, 'w').close()
+            self.assertEqual(split_ranges(empty, 4), [])
+
+    def test_open_range(self):
+        start, stop = 2, 12
+        with open_range(data_filename, start, stop, mode='rb') as fileobj:
+            self.assertEqual(fileobj.read(), ref_content[start:stop])
+            fileobj.seek(3)
+            self.assertEqual(fileobj.read(2), ref_content[start + 3:start + 5])
+        with open_range(data_filename, start, stop) as fileobj:
+            self.assertIsInstance(fileobj, io.TextIOBase)
+            self.assertEqual(fileobj.read(), ref_content[start:stop].decode())
+        with self.assertRaisesRegex(ValueError, r'only be opened for reading'):
+            open_range(data_filename, 0, 1, mode='w')
+
+    def test_reduce_chunks(self):
+        for executor in ('thread', 'process'):
+            with self.subTest(executor=executor):
+                self.assertEqual(
+                    read_numbers.reduce_chunks(
+                        data_filename, operator.add, chunks=3,
+                        executor=executor, workers=2,
+                        ),
+                    ref_data
+                    )
+        self.assertEqual(
+            count_lines.reduce_chunks(data_filename, operator.add, 10,
+                                      chunks=4, executor='thread'),
+            10 * len(ref_content.splitlines())
+            )
+        self.assertEqual(
+            count_lines_first.reduce_chunks(data_filename, operator.add, 10,
+                                            chunks=4, executor='thread'),
+            10 * len(ref_content.splitlines())
+            )
+        self.assertEqual(
+            read_numbers_generator.reduce_chunks(
+                data_filename, operator.add, chunks=2, executor='thread',
+                initial=[0],
+                ),
+            [0] + ref_data
+            )
+
+    def test_exceptions(self):
+        with open(data_filename) as data_file:
+            with self.assertRaisesRegex(TypeError, r'only file names'):
+                read_numbers.reduce_chunks(data_file, operator.add)
+        with self.assertRaisesRegex(ValueError, r'must be positive'):
+            split_ranges(data_filename, 0)
+        for options in ({'decompress': True}, {'mode': 'rb', 'mmap': True},
+                        {'prefetch': 2}):
+            wrapper = fnfnwrap(read_numbers.__wrapped__, **options)
+            with self.assertRaisesRegex(ValueError, r'file options cannot'):
+                wrapper.reduce_chunks(data_filename, operator.add)
+
+
+if __name__ == '__main__':
+    unittest.main()
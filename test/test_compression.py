@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Test suite for transparent decompression of file arguments."""
+__all__ = ()
+
+import bz2
+import gzip
+import lzma
+import os
+import shutil
+import tempfile
+import unittest
+from pyfnfn import fnfnwrap
+from pyfnfn.compression import (
+    DecompressingFile, detect_format, open_decompressed,
+    )
+
+# Obtain the path for data.txt within the same directory as this code.
+this_dir = os.path.dirname(os.path.abspath(__file__))
+data_filename = os.path.join(this_dir, 'data.txt')
+
+with open(data_filename) as data_file:
+    ref_data = [ int(token) for line in data_file for token in line.split() ]
+
+with open(data_filename, 'rb') as data_file:
+    ref_content = data_file.read()
+
+COMPRESSORS = {'gzip': gzip.compress, 'bz2': bz2.compress,
+               'xz': lzma.compress}
+
+@fnfnwrap(decompress=True)
+def read_numbers(file_input):
+    return file_input, [ int(token) for line in file_input
+                         for token in line.split() ]
+
+@fnfnwrap(decompress=True)
+def read_lines(file_input):
+    for line in file_input:
+        yield line
+
+########################################################
+##  All test cases for compressed files resides here  ##
+########################################################
+
+class DecompressionTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def make_file(self, name, content):
+        filename = os.path.join(self.directory, name)
+        with open(filename, 'wb') as fileobj:
+            fileobj.write(content)
+        return filename
+
+    def test_detect_format(self):
+        for name, compress in COMPRESSORS.items():
+            self.assertEqual(detect_format(head=compress(b'abc')), name)
+        self.assertIsNone(detect_format(head=b'abc'))
+        self.assertEqual(detect_format('data.txt.GZ'), 'gzip')
+        self.assertEqual(detect_format(b'data.txt.xz'), 'xz')
+        self.assertIsNone(detect_format('data.txt'))
+
+    def test_wrapper(self):
+        for name, compress in COMPRESSORS.items():
+            filename = self.make_file('data-' + name, compress(ref_content))
+            fileobj, numbers = read_numbers(filename)
+            self.assertEqual(numbers, ref_data)
+            self.assertTrue(fileobj.closed)
+            self.assertEqual(fileobj.buffer.format, name)
+            lines = list(read_lines(filename))
+            self.assertEqual(''.join(lines), ref_content.decode())
+        # Uncompressed files are read as they are
+        fileobj, numbers = read_numbers(data_filename)
+        self.assertEqual(numbers, ref_data)
+        self.assertNotIsInstance(fileobj.buffer, DecompressingFile)
+        self.assertTrue(fileobj.closed)
+
+    def test_text_options(self):
+        content = 'café\r\nnaïve\r\n'
+        filename = self.make_file(
+            'text.gz', gzip.compress(content.encode('utf-16'))
+            )
+        with open_decompressed(filename, encoding='utf-16') as fileobj:
+            self.assertEqual(fileobj.mode, 'r')
+            self.assertFalse(fileobj.line_buffering)
+            self.assertEqual(fileobj.read(), content.replace('\r\n', '\n'))
+        with open_decompressed(filename, 'rt', buffering=1,
+                               encoding='utf-16') as fileobj:
+            self.assertEqual(fileobj.mode, 'rt')
+            self.assertTrue(fileobj.line_buffering)
+        with open_decompressed(filename, encoding='utf-16',
+                               newline='') as fileobj:
+            self.assertEqual(fileobj.readlines(), ['café\r\n',
+                                                   'naïve\r\n'])
+
+    def test_binary(self):
+        filename = self.make_file('data.bin', bz2.compress(ref_content * 3))
+        with open_decompressed(filename, 'rb') as fileobj:
+            self.assertIsInstance(fileobj, DecompressingFile)
+            self.assertEqual(fileobj.read(5), ref_content[:5])
+            self.assertEqual(fileobj.tell(), 5)
+            self.assertEqual(fileobj.read(), (ref_content * 3)[5:])
+            fileobj.seek(0)
+            self.assertEqual(fileobj.readline(), ref_content.splitlines(
+                keepends=True)[0])
+        self.assertTrue(fileobj.raw.closed)
+
+    def test_methods(self):
+        # Detection by extension does not look at the content
+        plain = self.make_file('plain.gz', ref_content)
+        with open_decompressed(plain, 'rb', method='auto') as fileobj:
+            self.assertEqual(fileobj.read(), ref_content)
+        with self.assertRaises(OSError):
+            with open_decompressed(plain, 'rb', method='extension') as fileobj:
+                fileobj.read()
+        packed = self.make_file('packed', lzma.compress(ref_content))
+        with open_decompressed(packed, 'rb', method='extension') as fileobj:
+            self.assertEqual(fileobj.read(), lzma.compress(ref_content))
+        with open_decompressed(packed, 'rb', method='xz') as fileobj:
+            self.assertEqual(fileobj.read(), ref_content)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            fnfnwrap(read_numbers.__wrapped__, decompress='zip')
+        with self.assertRaises(ValueError):
+            fnfnwrap(read_numbers.__wrapped__, mode='w', decompress=True)
+        with self.assertRaises(ValueError):
+            fnfnwrap(read_numbers.__wrapped__, mode='rb', mmap=True,
+                     decompress=True)
+        with self.assertRaises(ValueError):
+            open_decompressed(data_filename, 'a')
+        with self.assertRaises(ValueError):
+            open_decompressed(data_filename, buffering=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
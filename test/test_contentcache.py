@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Test suite for the in-memory cache of file contents."""
+__all__ = ()
+
+import io
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from pyfnfn import fnfnwrap
+from pyfnfn.contentcache import ContentCache, default_content_cache
+
+# Obtain the path for data.txt within the same directory as this code.
+this_dir = os.path.dirname(os.path.abspath(__file__))
+data_filename = os.path.join(this_dir, 'data.txt')
+
+with open(data_filename) as data_file:
+    ref_data = [ int(token) for line in data_file for token in line.split() ]
+
+with open(data_filename, 'rb') as data_file:
+    ref_content = data_file.read()
+
+shared_cache = ContentCache(max_bytes=1 << 16)
+
+@fnfnwrap(content_cache=shared_cache)
+def read_numbers(file_input):
+    return file_input, [ int(token) for line in file_input
+                         for token in line.split() ]
+
+@fnfnwrap(mode='rb', content_cache=shared_cache)
+def read_bytes(file_input):
+    return file_input.read()
+
+#####################################################
+##  All test cases for content cache resides here  ##
+#####################################################
+
+class ContentCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        shared_cache.clear()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def make_file(self, name, content):
+        filename = os.path.join(self.directory, name)
+        with open(filename, 'wb') as fileobj:
+            fileobj.write(content)
+        return filename
+
+    def test_shared(self):
+        hits, misses = shared_cache.hits, shared_cache.misses
+        fileobj, numbers = read_numbers(data_filename)
+        self.assertEqual(numbers, ref_data)
+        self.assertIsInstance(fileobj, io.TextIOWrapper)
+        self.assertEqual(fileobj.name, data_filename)
+        self.assertTrue(fileobj.closed)
+        # Another wrapper with a different mode shares the same content
+        self.assertEqual(read_bytes(data_filename), ref_content)
+        self.assertEqual(read_numbers(data_filename)[1], ref_data)
+        self.assertEqual(shared_cache.misses - misses, 1)
+        self.assertEqual(shared_cache.hits - hits, 2)
+        self.assertEqual(shared_cache.size, len(ref_content))
+
+    def test_validation(self):
+        filename = self.make_file('data.txt', b'1 2 3\n')
+        self.assertEqual(read_numbers(filename)[1], [1, 2, 3])
+        misses = shared_cache.misses
+        with open(filename, 'ab') as fileobj:
+            fileobj.write(b'4 5\n')
+        self.assertEqual(read_numbers(filename)[1], [1, 2, 3, 4, 5])
+        self.assertEqual(shared_cache.misses - misses, 1)
+        self.assertEqual(len(shared_cache), 1)
+        os.unlink(filename)
+        with self.assertRaises(FileNotFoundError):
+            read_numbers(filename)
+
+    def test_text_options(self):
+        filename = self.make_file('text.txt', 'café\r\n'.encode('utf-16'))
+        cache = ContentCache()
+        with cache.open(filename, encoding='utf-16') as fileobj:
+            self.assertEqual(fileobj.read(), 'café\n')
+        with cache.open(filename, encoding='utf-16', newline='') as fileobj:
+            self.assertEqual(fileobj.read(), 'café\r\n')
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_eviction(self):
+        cache = ContentCache(max_bytes=10, max_file_size=8)
+        names = [ self.make_file('file-{}'.format(i), b'abcd')
+                  for i in range(3) ]
+        large = self.make_file('large', b'x' * 9)
+        for name in names:
+            cache.read(name)
+        self.assertEqual((len(cache), cache.size, cache.evictions), (2, 8, 1))
+        self.assertEqual(cache.read(names[0]), b'abcd')  # evicted earlier
+        self.assertEqual(cache.misses, 4)
+        self.assertEqual(cache.read(large), b'x' * 9)
+        self.assertEqual((cache.bypasses, len(cache)), (1, 2))
+        # Large files are opened from disk, not read into memory
+        with cache.open(large, 'rb') as fileobj:
+            self.assertIsInstance(fileobj, io.BufferedReader)
+            self.assertNotIsInstance(fileobj, io.BytesIO)
+            self.assertEqual(fileobj.read(), b'x' * 9)
+        with cache.open(large) as fileobj:
+            self.assertIsInstance(fileobj.buffer, io.BufferedReader)
+        self.assertEqual((cache.bypasses, len(cache)), (3, 2))
+
+    def test_custom_openers(self):
+        filename = self.make_file('data.txt', b'cached')
+        other = self.make_file('other.txt', b'opened')
+        cache = ContentCache()
+        self.assertEqual(cache.read(filename), b'cached')
+        def opener(path, flags):
+            return os.open(other, flags)
+        # Contents read through another opener are neither served from
+        # the cache nor cached
+        self.assertEqual(cache.read(filename, opener), b'opened')
+        with cache.open(filename, 'rb', opener=opener) as fileobj:
+            self.assertNotIsInstance(fileobj, io.BytesIO)
+            self.assertEqual(fileobj.read(), b'opened')
+        self.assertEqual(cache.read(filename), b'cached')
+        self.assertEqual((cache.hits, cache.misses, cache.bypasses),
+                         (1, 1, 2))
+
+    def test_single_stat(self):
+        filename = self.make_file('data.txt', b'1 2 3\n')
+        cache = ContentCache()
+        cache.read(filename)
+        with mock.patch('os.stat', wraps=os.stat) as stat:
+            with cache.open(filename, 'rb') as fileobj:
+                self.assertEqual(fileobj.read(), b'1 2 3\n')
+            self.assertEqual(stat.call_count, 1)
+
+    def test_options(self):
+        @fnfnwrap(content_cache=True)
+        def read_all(file_input):
+            return file_input.read()
+        self.assertEqual(read_all(data_filename), ref_content.decode())
+        self.assertIn(os.path.abspath(data_filename),
+                      default_content_cache._contents)
+        self.assertIs(pickle.loads(pickle.dumps(default_content_cache)),
+                      default_content_cache)
+        with self.assertRaisesRegex(ValueError, r'requires a plain read mode'):
+            fnfnwrap(read_all.__wrapped__, mode='w', content_cache=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,12 +6,23 @@ of how the usage of `@fnfnwrap` is intended.
 """
 __all__ = ()
 
+import functools
+import inspect
 import io
 import os
+import subprocess
+import sys
 import tempfile
 import textwrap
+import threading
 import unittest
+import weakref
 from pyfnfn import fnfnwrap
+from pyfnfn.contentcache import ContentCache
+from pyfnfn.decorators import _code_spec
+from pyfnfn.handles import HandlePool
+from pyfnfn.inputs import FILE_OBJECT, register_input_type
+from pyfnfn.memoize import ResultCache
 
 # Obtain the path for data.txt within the same directory as this code.
 this_dir = os.path.dirname(os.path.abspath(__file__))
@@ -126,6 +137,26 @@ def copy_integers(source_file, dest_file):
         for token in line.split():
             print(int(token), file=dest_file)
 
+##################################################################
+##  6b. Several file arguments can also be given to a single
+##  decorator, each with its own arguments to `open()` which
+##  override the ones shared by all file arguments. Stacked
+##  decorators as above are fused into exactly this form.
+##################################################################
+
+@fnfnwrap(filearg={'source_file': {}, 'dest_file': {'mode': 'w'}})
+def copy_integers_multiple(source_file, dest_file):
+    for line in source_file:
+        for token in line.split():
+            print(int(token), file=dest_file)
+
+@fnfnwrap(filearg=[0, 1])
+@fnfnwrap(filearg='extra_file')
+def zip_numbers_generator(first_file, second_file, *, extra_file=None):
+    for first, second in zip(read_numbers_generator(first_file),
+                             read_numbers_generator(second_file)):
+        yield first, second, (extra_file is None or not extra_file.closed)
+
 ##################################################################
 ##  7. Exception during the function definition is shown in
 ##  the construction of the `unittest.TestCase`.
@@ -147,9 +178,40 @@ class DataCollection(object):
             int(token)
             for line in file_input for token in line.split()
             ]
+    @fnfnwrap(filearg=1, mode='w')
+    def dump(self, file_output):
+        for number in self.data:
+            print(number, file=file_output)
     def __iter__(self):
         return iter(self.data)
 
+##################################################################
+##  9. Wrappers shared by many threads and called reentrantly,
+##  such as recursively from the original function itself.
+##################################################################
+
+@fnfnwrap
+def read_tagged(file_input, *, keep=False):
+    first = file_input.readline()
+    rest = file_input.read()
+    return file_input, file_input.name if keep else None, first + rest
+
+@fnfnwrap
+def read_tagged_generator(file_input):
+    for line in file_input:
+        yield file_input.name, line
+
+@fnfnwrap
+def read_nested(file_input, others):
+    """Read the first line of `file_input` and then the remainder only
+    after reading all files `others` recursively through this wrapper.
+    """
+    first = file_input.readline()
+    inner = read_nested(others[0], others[1:]) if others else []
+    if file_input.closed:
+        raise AssertionError('outer file closed by inner call')
+    return [ (file_input.name, first + file_input.read()) ] + inner
+
 ###################################
 ##  All test cases resides here  ##
 ###################################
@@ -170,6 +232,20 @@ class FnFnWrapTestCase(unittest.TestCase):
                 with open(data_filename) as data_file:
                     self.assertEqual(func('A', 'B', data_file), ref_data)
 
+    def test_positional_filearg_by_keyword(self):
+        self.assertEqual(
+            read_numbers_named_filearg('A', 'B', file_input=data_filename),
+            ref_data
+            )
+        with open(data_filename) as data_file:
+            self.assertEqual(
+                read_numbers_named_filearg('A', 'B', file_input=data_file),
+                ref_data
+                )
+        self.assertEqual(
+            read_numbers_default(file_input=data_filename), ref_data
+            )
+
     def test_keyword_only_filearg(self):
         self.assertEqual(read_numbers_keyword_only(data_input=data_filename),
                          ref_data)
@@ -238,6 +314,31 @@ class FnFnWrapTestCase(unittest.TestCase):
                 copy_integers(data_file, f4_obj)
             self.assertEqual(read_numbers_default(f4), ref_data)
 
+    def test_multiple_fileargs(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            f1 = os.path.join(tempdir, '1.txt')
+            copy_integers_multiple(data_filename, f1)
+            self.assertEqual(read_numbers_default(f1), ref_data)
+            f2 = os.path.join(tempdir, '2.txt')
+            copy_integers_multiple(dest_file=f2, source_file=data_filename)
+            self.assertEqual(read_numbers_default(f2), ref_data)
+
+    def test_fused_decorators(self):
+        self.assertEqual(
+            [filearg.name for filearg in copy_integers.fileargs],
+            ['source_file', 'dest_file']
+            )
+        self.assertEqual(copy_integers.fileargs[1].open_kwargs, {'mode': 'w'})
+        self.assertNotIsInstance(copy_integers.__wrapped__,
+                                 type(copy_integers))
+        self.assertTrue(zip_numbers_generator.is_generator)
+        pairs = list(zip_numbers_generator(data_filename, data_filename,
+                                           extra_file=data_filename))
+        self.assertEqual(pairs, [(x, x, True) for x in ref_data])
+        with open(data_filename) as data_file:
+            pairs = list(zip_numbers_generator(data_filename, data_file))
+        self.assertEqual(pairs, [(x, x, True) for x in ref_data])
+
     def test_docstring_preservation(self):
         main_string = textwrap.dedent(copy_integers.__doc__)
         expected_string = textwrap.dedent("""\
@@ -277,6 +378,24 @@ class FnFnWrapTestCase(unittest.TestCase):
         with self.assertRaisesRegex(
                 TypeError, r"'file_input' must have been file name or file-like object"):
             read_numbers_default(10)
+        with self.assertRaisesRegex(
+                TypeError, r"'data_input' must have been file name or file-like object"):
+            read_numbers_keyword_only(data_input=10)
+        with self.assertRaisesRegex(
+                TypeError, r"'b' is specified as file argument more than once"):
+            @fnfnwrap(filearg=[1, 'b'])
+            def dummy(a, b, c): pass
+        with self.assertRaisesRegex(
+                TypeError, r'expected at least one file argument'):
+            @fnfnwrap(filearg=[])
+            def dummy(a, b, c): pass
+        with self.assertRaisesRegex(
+                TypeError, r'not a valid argument for built-in function open'):
+            @fnfnwrap(filearg={0: {'modal': 10}})
+            def dummy(a, b, c): pass
+        with self.assertRaisesRegex(
+                TypeError, r"'dest_file' must have been file name or file-like object"):
+            copy_integers_multiple(data_filename, 10)
 
     def test_function_methods(self):
         data_v1 = DataCollection(data_filename)
@@ -284,6 +403,280 @@ class FnFnWrapTestCase(unittest.TestCase):
         with open(data_filename) as data_file:
             data_v2 = DataCollection(data_file)
         self.assertEqual(list(data_v2), ref_data)
+        with tempfile.TemporaryDirectory() as tempdir:
+            f1 = os.path.join(tempdir, '1.txt')
+            data_v1.dump(f1)
+            self.assertEqual(read_numbers_default(f1), ref_data)
+            f2 = os.path.join(tempdir, '2.txt')
+            DataCollection.dump(data_v2, f2)
+            self.assertEqual(read_numbers_default(f2), ref_data)
+
+    def test_bound_methods(self):
+        data = DataCollection(data_filename)
+        bound = data.dump
+        self.assertIsNot(bound, DataCollection.dump)
+        self.assertEqual(bound.pos, 0)
+        self.assertEqual(bound.filearg, 'file_output')
+        self.assertEqual(bound.open_kwargs, {'mode': 'w'})
+        self.assertEqual(bound.__name__, 'dump')
+        self.assertIs(bound.__wrapped__.__self__, data)
+        self.assertIs(bound.__get__(object(), object), bound)
+        self.assertIs(DataCollection.__dict__['dump'].__get__(None, DataCollection),
+                      DataCollection.dump)
+
+    def test_decorated_closures(self):
+        # Closures decorated within a loop share the same code object
+        def make_reader(scale):
+            def read_scaled(prefix, file_input, *, suffix=None):
+                numbers = read_numbers_default(file_input)
+                return [ scale * x for x in numbers ]
+            return read_scaled
+        hits = _code_spec.cache_info().hits
+        for scale, filearg in [(1, 1), (2, 'file_input'), (3, -1)]:
+            wrapper = fnfnwrap(make_reader(scale), filearg=filearg)
+            self.assertEqual(wrapper.pos, 1)
+            self.assertEqual(wrapper(None, data_filename),
+                             [ scale * x for x in ref_data ])
+        self.assertGreaterEqual(_code_spec.cache_info().hits, hits + 2)
+        wrapper = fnfnwrap(make_reader(1), filearg='suffix')
+        self.assertEqual((wrapper.filearg, wrapper.pos), ('suffix', None))
+
+    @unittest.skipIf(sys.version_info < (3, 8), 'requires python3.8+')
+    def test_positional_only_arguments(self):
+        namespace = {}
+        exec('def dummy(a, /, b, *c, d, **e): pass', namespace)
+        wrapper = fnfnwrap(namespace['dummy'])
+        self.assertEqual((wrapper.filearg, wrapper.pos), ('b', 0))
+        with self.assertRaisesRegex(
+                NameError, r'not a valid argument for the function'):
+            fnfnwrap(namespace['dummy'], filearg='a')
+        wrapper = fnfnwrap(namespace['dummy'], filearg='d')
+        self.assertEqual((wrapper.filearg, wrapper.pos), ('d', None))
+
+    def test_introspected_functions(self):
+        # Functions whose signatures differ from their code objects
+        @functools.wraps(read_numbers_default.__wrapped__)
+        def wrapped(*args, **kwargs):
+            return read_numbers_default.__wrapped__(*args, **kwargs)
+        self.assertEqual(fnfnwrap(wrapped)(data_filename), ref_data)
+        partial = functools.partial(copy_integers, data_filename)
+        with tempfile.TemporaryDirectory() as tempdir:
+            output = os.path.join(tempdir, 'output.txt')
+            fnfnwrap(partial, mode='w')(output)
+            self.assertEqual(read_numbers_default(output), ref_data)
+        wrapper = fnfnwrap(zip_numbers_generator.__wrapped__)
+        self.assertTrue(wrapper.is_generator)
+
+    def test_signature(self):
+        parameters = inspect.signature(fnfnwrap).parameters
+        self.assertEqual(list(parameters)[:4],
+                         ['original_fn', 'filearg', 'memoize', 'stats'])
+        self.assertEqual(parameters['mode'].default, 'r')
+        self.assertEqual(parameters['mmap'].kind,
+                         inspect.Parameter.KEYWORD_ONLY)
+
+    def test_compact_wrappers(self):
+        def make_reader():
+            def read_numbers(file_input):
+                """Read numbers."""
+                return read_numbers_default(file_input)
+            read_numbers.plugin_name = 'numbers'
+            return read_numbers
+        first = fnfnwrap(make_reader(), mode='r')
+        second = fnfnwrap(make_reader(), mode='r')
+        self.assertEqual(first(data_filename), ref_data)
+        # Metadata is delegated to the original function
+        self.assertEqual(first.__name__, 'read_numbers')
+        self.assertTrue(first.__qualname__.endswith('<locals>.read_numbers'))
+        self.assertEqual(first.__doc__, 'Read numbers.')
+        self.assertEqual(first.__module__, __name__)
+        self.assertEqual(first.plugin_name, 'numbers')
+        self.assertFalse(hasattr(first, 'missing_attribute'))
+        self.assertEqual(vars(first), {})
+        second.__doc__ = 'Overridden.'
+        self.assertEqual(second.__doc__, 'Overridden.')
+        self.assertEqual(first.__doc__, 'Read numbers.')
+        self.assertIs(weakref.ref(first)(), first)
+        # Specifications are shared between wrappers of the same options
+        self.assertIs(first.fileargs[0], second.fileargs[0])
+        self.assertIsNot(fnfnwrap(make_reader()).fileargs[0],
+                         first.fileargs[0])
+        # except those creating their own handle pools
+        self.assertIsNot(fnfnwrap(make_reader(), handle_pool=2).fileargs[0],
+                         fnfnwrap(make_reader(), handle_pool=2).fileargs[0])
+        self.assertIsNot(fnfnwrap(make_reader(), line_index=1).fileargs[0],
+                         fnfnwrap(make_reader(), line_index=True).fileargs[0])
+        data = DataCollection(data_filename)
+        self.assertIs(data.dump.fileargs, data.dump.fileargs)
+        self.assertIsNone(data.dump.__doc__)
+        self.assertEqual(data.dump.__module__, __name__)
+
+    def test_lazy_imports(self):
+        # Modules implementing optional features are not loaded on import
+        code = textwrap.dedent('''\
+            import sys
+            import pyfnfn
+            print(' '.join(sorted(sys.modules)))
+            ''')
+        modules = subprocess.check_output(
+            [sys.executable, '-c', code], universal_newlines=True,
+            cwd=os.path.dirname(this_dir),
+            ).split()
+        for name in ('pyfnfn.batch', 'pyfnfn.memoize', 'pyfnfn.stats',
+                     'pyfnfn.compression', 'pyfnfn.budget', 'pyfnfn.openers',
+                     'asyncio', 'concurrent.futures', 'threading'):
+            self.assertNotIn(name, modules)
+
+
+class ConcurrencyTestCase(unittest.TestCase):
+
+    thread_count = 32
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.files = {}
+        for index in range(16):
+            filename = os.path.join(tmp.name, 'shard-{}.txt'.format(index))
+            content = ''.join(
+                '{}-{}\n'.format(index, line) for line in range(index % 5 + 2)
+                )
+            with open(filename, 'w') as fileobj:
+                fileobj.write(content)
+            self.files[filename] = content
+        self.filenames = sorted(self.files)
+        # Switch threads as often as possible to provoke interleavings
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, interval)
+
+    def run_threads(self, target):
+        """Run `target(index)` in many threads started at the same time,
+        re-raising the first exception of any of them.
+        """
+        barrier = threading.Barrier(self.thread_count)
+        errors = []
+        def run(index):
+            try:
+                barrier.wait()
+                target(index)
+            except BaseException as e:
+                errors.append(e)
+        threads = [
+            threading.Thread(target=run, args=(index,))
+            for index in range(self.thread_count)
+            ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+
+    def test_shared_wrapper(self):
+        def target(index):
+            for call in range(100):
+                filename = self.filenames[(index + call) % len(self.files)]
+                if call % 3 == 0:
+                    fileobj, name, content = read_tagged(filename, keep=True)
+                elif call % 3 == 1:
+                    fileobj, name, content = read_tagged(
+                        file_input=filename, keep=True,
+                        )
+                else:
+                    with open(filename) as given:
+                        fileobj, name, content = read_tagged(given, keep=True)
+                        self.assertIs(fileobj, given)
+                        self.assertFalse(given.closed)
+                self.assertEqual(name, filename)
+                self.assertEqual(content, self.files[filename])
+                self.assertTrue(fileobj.closed)
+        self.run_threads(target)
+
+    def test_interleaved_generators(self):
+        def target(index):
+            for round_ in range(10):
+                names = [
+                    self.filenames[(index + round_ + k) % len(self.files)]
+                    for k in range(4)
+                    ]
+                generators = [
+                    read_tagged_generator(name) for name in names
+                    ]
+                lines = { name: [] for name in names }
+                # Advance all generators of this thread alternately
+                while generators:
+                    for generator in list(generators):
+                        item = next(generator, None)
+                        if item is None:
+                            generators.remove(generator)
+                        else:
+                            lines[item[0]].append(item[1])
+                for name in names:
+                    self.assertEqual(''.join(lines[name]), self.files[name])
+        self.run_threads(target)
+
+    def test_recursive_calls(self):
+        def target(index):
+            for call in range(20):
+                names = [
+                    self.filenames[(index * 7 + call + k) % len(self.files)]
+                    for k in range(6)
+                    ]
+                result = read_nested(names[0], names[1:])
+                self.assertEqual(result, [
+                    (name, self.files[name]) for name in names
+                    ])
+        self.run_threads(target)
+
+    def test_concurrent_type_registration(self):
+        def target(index):
+            if index % 4 == 0:
+                # Registering types clears the caches of all input kinds
+                for _ in range(50):
+                    register_input_type(type('Unrelated', (), {}),
+                                        FILE_OBJECT)
+                return
+            for call in range(50):
+                filename = self.filenames[(index + call) % len(self.files)]
+                _, _, content = read_tagged(filename)
+                self.assertEqual(content, self.files[filename])
+                # Readers of types never classified before
+                reader = type('Reader', (io.StringIO,), {})(content)
+                fileobj, _, content = read_tagged(reader)
+                self.assertIs(fileobj, reader)
+                self.assertEqual(content, self.files[filename])
+        self.run_threads(target)
+
+    def test_shared_pools_and_caches(self):
+        pool = HandlePool(maxsize=4)
+        results = ResultCache(maxsize=8)
+        contents = ContentCache(max_bytes=64)
+        wrappers = (
+            fnfnwrap(read_tagged.__wrapped__, handle_pool=pool),
+            fnfnwrap(read_tagged.__wrapped__, memoize=results),
+            fnfnwrap(read_tagged.__wrapped__, content_cache=contents),
+            )
+        calls = 30
+        def target(index):
+            for call in range(calls):
+                filename = self.filenames[(index + call) % len(self.files)]
+                for wrapper in wrappers:
+                    _, _, content = wrapper(filename)
+                    self.assertEqual(content, self.files[filename])
+        self.run_threads(target)
+        # Counters and sizes add up once all threads are done
+        total = self.thread_count * calls
+        self.assertEqual(pool.hits + pool.misses, total)
+        self.assertLessEqual(len(pool), pool.maxsize)
+        info = results.info()
+        self.assertEqual(info.hits + info.misses, total)
+        self.assertLessEqual(info.currsize, info.maxsize)
+        self.assertEqual(contents.hits + contents.misses, total)
+        self.assertEqual(contents.size, sum(
+            len(data) for _, data in contents._contents.values()
+            ))
+        self.assertLessEqual(contents.size, contents.max_bytes)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Test suite for atomic and durable output file arguments."""
+__all__ = ()
+
+import os
+import shutil
+import stat
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+from pyfnfn import fnfnwrap
+from pyfnfn.durable import GroupCommitter, open_durable
+
+# Obtain the path for data.txt within the same directory as this code.
+this_dir = os.path.dirname(os.path.abspath(__file__))
+data_filename = os.path.join(this_dir, 'data.txt')
+
+with open(data_filename) as data_file:
+    ref_data = [ int(token) for line in data_file for token in line.split() ]
+
+@fnfnwrap(mode='w', durable=True)
+def write_numbers(file_output, numbers, fail_at=None, on_exit=None):
+    for index, number in enumerate(numbers):
+        if index == fail_at:
+            raise RuntimeError('failed at {}'.format(index))
+        print(number, file=file_output)
+    if on_exit is not None:
+        on_exit()
+
+@fnfnwrap(mode='w', durable=True)
+def write_numbers_generator(file_output, numbers):
+    for number in numbers:
+        print(number, file=file_output)
+        yield number
+
+############################################################
+##  All test cases for durable output files resides here  ##
+############################################################
+
+class DurableOutputTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.filename = os.path.join(self.directory, 'output.txt')
+
+    def read_numbers(self, filename=None):
+        with open(filename or self.filename) as fileobj:
+            return [ int(token) for line in fileobj for token in line.split() ]
+
+    def test_commit(self):
+        write_numbers(self.filename, ref_data)
+        self.assertEqual(self.read_numbers(), ref_data)
+        self.assertEqual(os.listdir(self.directory), ['output.txt'])
+
+    def test_exception(self):
+        write_numbers(self.filename, ref_data)
+        with self.assertRaisesRegex(RuntimeError, 'failed at 2'):
+            write_numbers(self.filename, [7, 8, 9], fail_at=2)
+        # The target is left untouched and the temporary file discarded
+        self.assertEqual(self.read_numbers(), ref_data)
+        self.assertEqual(os.listdir(self.directory), ['output.txt'])
+
+    def test_generator(self):
+        generator = write_numbers_generator(self.filename, ref_data)
+        self.assertEqual(next(generator), ref_data[0])
+        self.assertFalse(os.path.exists(self.filename))
+        generator.close()  # unfinished generators do not commit
+        self.assertEqual(os.listdir(self.directory), [])
+        self.assertEqual(list(write_numbers_generator(self.filename,
+                                                      ref_data)), ref_data)
+        self.assertEqual(self.read_numbers(), ref_data)
+
+    def test_group_commit(self):
+        committer = GroupCommitter(delay=0.05)
+        wrapper = fnfnwrap(write_numbers.__wrapped__, mode='w',
+                           durable=committer)
+        filenames = [ os.path.join(self.directory, 'out-{}.txt'.format(i))
+                      for i in range(8) ]
+        barrier = threading.Barrier(len(filenames))
+        def write_together(filename):
+            # All writers finish at once so that their commits overlap
+            wrapper(filename, ref_data, on_exit=barrier.wait)
+        syncing_threads = set()
+        real_fsync = os.fsync
+        def slow_fsync(fd):
+            syncing_threads.add(threading.current_thread().name)
+            time.sleep(0.001)
+            return real_fsync(fd)
+        with mock.patch('os.fsync', side_effect=slow_fsync) as fsync:
+            threads = [ threading.Thread(target=write_together,
+                                         args=(filename,))
+                        for filename in filenames ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        for filename in filenames:
+            self.assertEqual(self.read_numbers(filename), ref_data)
+        self.assertEqual(committer.commits, 8)
+        self.assertLess(committer.groups, 8)
+        # One fsync per file plus one per directory of each group
+        self.assertEqual(fsync.call_count, 8 + committer.groups)
+        # Each file is synchronized by the thread writing it
+        self.assertEqual(syncing_threads,
+                         { thread.name for thread in threads })
+
+    def test_single_commit_does_not_wait(self):
+        committer = GroupCommitter(delay=10)
+        wrapper = fnfnwrap(write_numbers.__wrapped__, mode='w',
+                           durable=committer)
+        start = time.monotonic()
+        for _ in range(3):
+            wrapper(self.filename, ref_data)
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertEqual((committer.commits, committer.groups), (3, 3))
+        self.assertEqual(self.read_numbers(), ref_data)
+
+    def test_permissions(self):
+        with open(self.filename, 'w') as fileobj:
+            fileobj.write('old')
+        os.chmod(self.filename, 0o640)
+        with open_durable(self.filename, 'wb') as fileobj:
+            fileobj.write(b'new')
+            fileobj.close()  # closing early still commits
+        self.assertEqual(stat.S_IMODE(os.stat(self.filename).st_mode), 0o640)
+        with open(self.filename) as fileobj:
+            self.assertEqual(fileobj.read(), 'new')
+
+    def test_attributes(self):
+        @fnfnwrap(mode='w', durable=True)
+        def describe(file_output):
+            return file_output.name, file_output.mode
+        self.assertEqual(describe(self.filename), (self.filename, 'w'))
+        with open_durable(self.filename, 'wb') as fileobj:
+            self.assertEqual((fileobj.name, fileobj.mode),
+                             (self.filename, 'wb'))
+        with open_durable(self.filename, 'w+', buffering=1) as fileobj:
+            self.assertEqual(fileobj.name, self.filename)
+            self.assertTrue(fileobj.line_buffering)
+            fileobj.write('7\n')
+            fileobj.seek(0)
+            self.assertEqual(fileobj.read(), '7\n')
+        self.assertEqual(self.read_numbers(), [7])
+
+    def test_invalid(self):
+        for mode in ('r', 'a', 'x'):
+            with self.assertRaises(ValueError):
+                fnfnwrap(write_numbers.__wrapped__, mode=mode, durable=True)
+        with self.assertRaisesRegex(ValueError, 'with write_behind'):
+            fnfnwrap(write_numbers.__wrapped__, mode='w', durable=True,
+                     write_behind=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
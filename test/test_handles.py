@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Test suite for the pool of reusable file handles."""
+__all__ = ()
+
+import os
+import tempfile
+import threading
+import unittest
+from pyfnfn import fnfnwrap
+from pyfnfn.handles import HandlePool
+
+# Obtain the path for data.txt within the same directory as this code.
+this_dir = os.path.dirname(os.path.abspath(__file__))
+data_filename = os.path.join(this_dir, 'data.txt')
+
+with open(data_filename) as data_file:
+    ref_data = [ int(token) for line in data_file for token in line.split() ]
+
+shared_pool = HandlePool(maxsize=2)
+
+@fnfnwrap(handle_pool=shared_pool)
+def read_numbers(file_input):
+    return file_input, [ int(token) for line in file_input
+                         for token in line.split() ]
+
+####################################################
+##  All test cases for handle pools resides here  ##
+####################################################
+
+class HandlePoolTestCase(unittest.TestCase):
+
+    def setUp(self):
+        shared_pool.clear()
+
+    def test_reuse(self):
+        hits, misses = shared_pool.hits, shared_pool.misses
+        first, numbers = read_numbers(data_filename)
+        self.assertEqual(numbers, ref_data)
+        self.assertFalse(first.closed)
+        self.assertEqual(len(shared_pool), 1)
+        second, numbers = read_numbers(data_filename)
+        self.assertIs(first, second)
+        self.assertEqual(numbers, ref_data)  # rewound
+        self.assertEqual(shared_pool.hits - hits, 1)
+        self.assertEqual(shared_pool.misses - misses, 1)
+        shared_pool.clear()
+        self.assertTrue(first.closed)
+        self.assertEqual(len(shared_pool), 0)
+
+    def test_different_open_kwargs(self):
+        pool = HandlePool()
+        with pool.open(data_filename) as text_file:
+            pass
+        with pool.open(data_filename, mode='rb') as binary_file:
+            self.assertIsNot(binary_file, text_file)
+            self.assertEqual(binary_file.read(1), b'1')
+        self.assertEqual(len(pool), 2)
+        pool.clear()
+
+    def test_concurrent_checkout(self):
+        barrier = threading.Barrier(3)
+        handles = []
+
+        @fnfnwrap(handle_pool=shared_pool)
+        def hold(file_input):
+            handles.append(file_input)
+            barrier.wait(timeout=5)
+            return file_input.read()
+
+        threads = [threading.Thread(target=hold, args=(data_filename,))
+                   for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(map(id, handles))), 3)
+        self.assertEqual(len(shared_pool), 2)  # one evicted
+        self.assertEqual(sum(handle.closed for handle in handles), 1)
+
+    def test_invalidation(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            filename = os.path.join(tempdir, 'numbers.txt')
+            with open(filename, 'w') as fileobj:
+                fileobj.write('1 2 3\n')
+            first, numbers = read_numbers(filename)
+            self.assertEqual(numbers, [1, 2, 3])
+            os.replace(filename, filename + '.old')
+            with open(filename, 'w') as fileobj:
+                fileobj.write('4 5\n')
+            second, numbers = read_numbers(filename)
+            self.assertEqual(numbers, [4, 5])
+            self.assertIsNot(first, second)
+            self.assertTrue(first.closed)
+            shared_pool.clear()
+
+    def test_lru_eviction(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            names = [os.path.join(tempdir, str(i)) for i in range(3)]
+            for name in names:
+                with open(name, 'w') as fileobj:
+                    fileobj.write('0\n')
+            handles = [read_numbers(name)[0] for name in names]
+            self.assertEqual([h.closed for h in handles], [True, False, False])
+            shared_pool.clear()
+
+    def test_exceptions(self):
+        with self.assertRaisesRegex(ValueError, r'requires a plain read mode'):
+            @fnfnwrap(mode='w', handle_pool=4)
+            def dummy(file_input): pass
+        with self.assertRaisesRegex(ValueError, r'requires a plain read mode'):
+            @fnfnwrap(mode='rb', mmap=True, handle_pool=4)
+            def dummy(file_input): pass
+        with self.assertRaisesRegex(ValueError, r'maxsize must be positive'):
+            HandlePool(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Test suite for the classification of values given to file arguments."""
+__all__ = ()
+
+import io
+import os
+import pathlib
+import tempfile
+import unittest
+from pyfnfn import fnfnwrap
+from pyfnfn.inputs import (
+    FILE_NAME, FILE_OBJECT, INVALID, _file_object_types, input_kind,
+    register_input_type,
+    )
+
+# Obtain the path for data.txt within the same directory as this code.
+this_dir = os.path.dirname(os.path.abspath(__file__))
+data_filename = os.path.join(this_dir, 'data.txt')
+
+with open(data_filename) as data_file:
+    ref_content = data_file.read()
+
+@fnfnwrap
+def read_all(file_input):
+    return file_input.read()
+
+@fnfnwrap(mode='w')
+def write_all(file_output, content):
+    file_output.write(content)
+
+
+class ChunkReader(object):
+    """Reader of chunks of a string which is not an `io.IOBase`."""
+
+    def __init__(self, content):
+        self.content = content
+
+    def read(self, size=-1):
+        content = self.content
+        self.content = ''
+        return content
+
+
+class ListWriter(object):
+    """Writer collecting strings into a list."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(data)
+        return len(data)
+
+
+class Descriptor(int):
+    """File descriptor which built-in `open()` accepts in place of names."""
+
+
+class Token(str):
+    pass
+
+##################################################
+##  All test cases for input kinds reside here  ##
+##################################################
+
+class InputKindTestCase(unittest.TestCase):
+
+    def test_default_kinds(self):
+        with open(data_filename) as fileobj:
+            self.assertEqual(input_kind(fileobj), FILE_OBJECT)
+            self.assertIn(type(fileobj), _file_object_types)
+        self.assertEqual(input_kind(io.BytesIO()), FILE_OBJECT)
+        with tempfile.SpooledTemporaryFile() as fileobj:
+            self.assertEqual(input_kind(fileobj), FILE_OBJECT)
+        self.assertEqual(input_kind(ChunkReader('')), FILE_OBJECT)
+        self.assertEqual(input_kind(ListWriter()), FILE_OBJECT)
+        self.assertEqual(input_kind('name'), FILE_NAME)
+        self.assertEqual(input_kind(b'name'), FILE_NAME)
+        self.assertEqual(input_kind(pathlib.Path('name')), FILE_NAME)
+        for value in (None, 12, 3.4, True, [], Descriptor(0)):
+            self.assertEqual(input_kind(value), INVALID)
+
+    def test_duck_typed_streams(self):
+        self.assertEqual(read_all(ChunkReader(ref_content)), ref_content)
+        writer = ListWriter()
+        write_all(writer, 'content')
+        self.assertEqual(writer.chunks, ['content'])
+        with tempfile.SpooledTemporaryFile(mode='w+') as fileobj:
+            write_all(fileobj, ref_content)
+            fileobj.seek(0)
+            self.assertEqual(read_all(fileobj), ref_content)
+
+    def test_register(self):
+        with self.assertRaisesRegex(TypeError, r'must have been file name'):
+            read_all(Descriptor(0))
+        self.assertEqual(input_kind(Token('name')), FILE_NAME)
+        register_input_type(Descriptor, FILE_NAME)
+        descriptor = Descriptor(os.open(data_filename, os.O_RDONLY))
+        self.assertEqual(read_all(descriptor), ref_content)
+        with self.assertRaises(OSError):
+            os.fstat(descriptor)  # closed along with the file
+        register_input_type(str, INVALID)
+        try:
+            # Registration also applies to subclasses classified before
+            self.assertEqual(input_kind(Token('name')), INVALID)
+            with self.assertRaisesRegex(TypeError, r'must have been file'):
+                read_all(data_filename)
+        finally:
+            register_input_type(str, FILE_NAME)
+        self.assertEqual(read_all(data_filename), ref_content)
+        with self.assertRaises(TypeError):
+            register_input_type(Descriptor(0), FILE_NAME)
+        with self.assertRaisesRegex(ValueError, r'unknown kind'):
+            register_input_type(Descriptor, 'stream')
+
+if __name__ == '__main__':
+    unittest.main()
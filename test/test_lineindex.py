@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Test suite for persistent indexes of line offsets."""
+__all__ = ()
+
+import operator
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from pyfnfn import fnfnwrap
+from pyfnfn.lineindex import (
+    SIDECAR_SUFFIX, IndexedTextFile, LineIndex, get_index, open_indexed,
+    )
+
+# Obtain the path for data.txt within the same directory as this code.
+this_dir = os.path.dirname(os.path.abspath(__file__))
+data_filename = os.path.join(this_dir, 'data.txt')
+
+with open(data_filename, 'rb') as data_file:
+    ref_content = data_file.read()
+
+@fnfnwrap(line_index=4)
+def read_from_line(file_input, line):
+    file_input.seek_line(line)
+    return file_input.read()
+
+@fnfnwrap(line_index=4)
+def count_lines(file_input):
+    return sum(1 for _ in file_input)
+
+
+def line_starts(content):
+    """Offsets of the beginnings of all lines, computed naively."""
+    starts = [0]
+    for index, byte in enumerate(content):
+        if byte == ord('\n') and index + 1 < len(content):
+            starts.append(index + 1)
+    return starts if content else [0]
+
+###################################################
+##  All test cases for line indexes reside here  ##
+###################################################
+
+class LineIndexTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def make_file(self, content, name='data.txt'):
+        filename = os.path.join(self.directory, name)
+        with open(filename, 'wb') as fileobj:
+            fileobj.write(content)
+        return filename
+
+    def test_build(self):
+        contents = [
+            b'', b'\n', b'a', b'a\nb', b'a\r\nb\r\n', b'\n\n\n',
+            b''.join(b'line %d\n' % i for i in range(100)),
+            ]
+        for content in contents:
+            filename = self.make_file(content)
+            starts = line_starts(content)
+            for step in (1, 2, 3, 7, 1024):
+                for chunk_size in (1, 5, 1 << 20):
+                    with self.subTest(content=content[:10], step=step,
+                                      chunk_size=chunk_size):
+                        index = LineIndex.build(filename, step, chunk_size)
+                        self.assertEqual(list(index.offsets), starts[::step])
+                        self.assertEqual(index.lines,
+                                         len(content.splitlines()))
+
+    def test_sidecar(self):
+        filename = self.make_file(ref_content)
+        sidecar = filename + SIDECAR_SUFFIX
+        index = get_index(filename, step=2)
+        self.assertTrue(os.path.exists(sidecar))
+        with mock.patch.object(LineIndex, 'build') as build:
+            loaded = get_index(filename, step=2)
+            build.assert_not_called()
+        self.assertEqual(loaded.offsets, index.offsets)
+        self.assertEqual(loaded.lines, index.lines)
+        # Changes of the file invalidate the sidecar file
+        with open(filename, 'ab') as fileobj:
+            fileobj.write(b'1 2 3\n')
+        rebuilt = get_index(filename, step=2)
+        self.assertEqual(rebuilt.lines, index.lines + 1)
+        self.assertEqual(LineIndex.load(sidecar, rebuilt.identity).lines,
+                         rebuilt.lines)
+        with open(sidecar, 'r+b') as fileobj:
+            fileobj.write(b'garbage!')
+        self.assertIsNone(LineIndex.load(sidecar, rebuilt.identity))
+
+    def test_truncated_sidecar(self):
+        filename = self.make_file(ref_content)
+        sidecar = filename + SIDECAR_SUFFIX
+        index = get_index(filename, step=1)
+        with open(sidecar, 'r+b') as fileobj:
+            fileobj.truncate(os.path.getsize(sidecar) - 8)
+        self.assertIsNone(LineIndex.load(sidecar, index.identity))
+        rebuilt = get_index(filename, step=1)
+        self.assertEqual(rebuilt.offsets, index.offsets)
+        self.assertEqual(LineIndex.load(sidecar, index.identity).offsets,
+                         index.offsets)
+
+    def test_concurrent_saves(self):
+        filename = self.make_file(ref_content * 100)
+        sidecar = filename + SIDECAR_SUFFIX
+        index = LineIndex.build(filename, step=1)
+        barrier = threading.Barrier(8)
+        errors = []
+        def save():
+            barrier.wait()
+            try:
+                for _ in range(20):
+                    index.save(sidecar)
+            except OSError as exc:
+                errors.append(exc)
+        threads = [threading.Thread(target=save) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(LineIndex.load(sidecar, index.identity).offsets,
+                         index.offsets)
+        self.assertEqual(sorted(os.listdir(self.directory)),
+                         ['data.txt', 'data.txt' + SIDECAR_SUFFIX])
+
+    def test_seek_line(self):
+        content = b''.join(b'line %d\r\n' % i for i in range(50))
+        lines = content.decode().splitlines(keepends=True)
+        filename = self.make_file(content)
+        for mode in ('rb', 'r'):
+            with open_indexed(filename, mode, step=8) as fileobj:
+                if mode == 'r':
+                    self.assertIsInstance(fileobj, IndexedTextFile)
+                for line in (0, 7, 8, 9, 31, 49, 17):
+                    self.assertEqual(fileobj.seek_line(line), line)
+                    expected = content.splitlines(keepends=True)[line]
+                    if mode == 'r':
+                        expected = lines[line].replace('\r\n', '\n')
+                    self.assertEqual(fileobj.readline(), expected)
+                self.assertEqual(fileobj.seek_line(60), 50)
+                self.assertFalse(fileobj.read())
+
+    def test_wrapper(self):
+        filename = self.make_file(ref_content)
+        lines = ref_content.decode().splitlines(keepends=True)
+        for line in range(len(lines) + 1):
+            self.assertEqual(read_from_line(filename, line),
+                             ''.join(lines[line:]))
+        self.assertTrue(os.path.exists(filename + SIDECAR_SUFFIX))
+
+    def test_split_ranges(self):
+        content = b''.join(b'%d\n' % (10 ** (i % 6)) for i in range(120))
+        filename = self.make_file(content)
+        index = get_index(filename, step=4)
+        ranges = index.split_ranges(5)
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], len(content))
+        counts = [ content[start:stop].count(b'\n') for start, stop in ranges ]
+        self.assertEqual(sum(counts), 120)
+        self.assertLessEqual(max(counts) - min(counts), 4)
+        self.assertEqual(
+            count_lines.reduce_chunks(filename, operator.add, chunks=5,
+                                      executor='thread'),
+            120
+            )
+
+    def test_invalid(self):
+        with self.assertRaisesRegex(ValueError, r'requires a plain read mode'):
+            fnfnwrap(count_lines.__wrapped__, mode='w', line_index=True)
+        with self.assertRaisesRegex(ValueError, r'must be positive'):
+            fnfnwrap(count_lines.__wrapped__, line_index=-1)
+        with self.assertRaises(ValueError):
+            LineIndex.build(data_filename).locate(-1)
+
+
+if __name__ == '__main__':
+    unittest.main()
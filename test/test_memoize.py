@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Test suite for memoization of wrapped functions keyed on file identity."""
+__all__ = ()
+
+import os
+import pickle
+import tempfile
+import time
+import unittest
+from pyfnfn import fnfnwrap
+from pyfnfn.memoize import ResultCache
+
+# Obtain the path for data.txt within the same directory as this code.
+this_dir = os.path.dirname(os.path.abspath(__file__))
+data_filename = os.path.join(this_dir, 'data.txt')
+
+with open(data_filename) as data_file:
+    ref_data = [ int(token) for line in data_file for token in line.split() ]
+
+calls = []
+
+@fnfnwrap(memoize=ResultCache(maxsize=2))
+def parse_numbers(file_input, scale=1):
+    calls.append(file_input.name)
+    return [ int(token) * scale for line in file_input
+             for token in line.split() ]
+
+@fnfnwrap(memoize=True)
+def parse_numbers_generator(file_input):
+    for line in file_input:
+        yield line
+
+###################################################
+##  All test cases for memoization resides here  ##
+###################################################
+
+class MemoizeTestCase(unittest.TestCase):
+
+    def setUp(self):
+        parse_numbers.result_cache.clear()
+        del calls[:]
+
+    def test_hits_and_misses(self):
+        self.assertEqual(parse_numbers(data_filename), ref_data)
+        self.assertEqual(parse_numbers(data_filename), ref_data)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(parse_numbers(data_filename, 2),
+                         [x * 2 for x in ref_data])
+        self.assertEqual(parse_numbers(data_filename, 2),
+                         [x * 2 for x in ref_data])
+        self.assertEqual(len(calls), 2)
+        info = parse_numbers.result_cache.info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (2, 2, 2))
+
+    def test_bypass(self):
+        with open(data_filename) as data_file:
+            self.assertEqual(parse_numbers(data_file), ref_data)
+        with open(data_filename) as data_file:
+            self.assertEqual(parse_numbers(data_file), ref_data)
+        self.assertEqual(len(calls), 2)
+        parse_numbers(data_filename, scale=[1])  # unhashable argument
+        self.assertEqual(len(calls), 3)
+        info = parse_numbers.result_cache.info()
+        self.assertEqual((info.bypasses, info.currsize), (3, 0))
+        self.assertIsNone(parse_numbers_generator.result_cache)
+        with open(data_filename) as data_file:
+            self.assertEqual(list(parse_numbers_generator(data_filename)),
+                             data_file.readlines())
+
+    def test_file_change(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            filename = os.path.join(tempdir, 'numbers.txt')
+            with open(filename, 'w') as fileobj:
+                fileobj.write('1 2\n')
+            self.assertEqual(parse_numbers(filename), [1, 2])
+            with open(filename, 'w') as fileobj:
+                fileobj.write('3 4 5\n')
+            self.assertEqual(parse_numbers(filename), [3, 4, 5])
+            self.assertEqual(len(calls), 2)
+
+    def test_content_hash(self):
+        cache = ResultCache(hash_content=True)
+        @fnfnwrap(memoize=cache)
+        def parse(file_input):
+            return file_input.read()
+        with tempfile.TemporaryDirectory() as tempdir:
+            filename = os.path.join(tempdir, 'data.txt')
+            with open(filename, 'w') as fileobj:
+                fileobj.write('ab')
+            self.assertEqual(parse(filename), 'ab')
+            stat = os.stat(filename)
+            with open(filename, 'w') as fileobj:
+                fileobj.write('cd')
+            # Same size and modification time but different content
+            os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            self.assertEqual(parse(filename), 'cd')
+        self.assertEqual(cache.info().misses, 2)
+
+    def test_eviction(self):
+        cache = ResultCache(maxsize=1, ttl=0.05)
+        @fnfnwrap(memoize=cache)
+        def parse(file_input, tag):
+            calls.append(tag)
+            return tag
+        parse(data_filename, 1)
+        parse(data_filename, 2)
+        parse(data_filename, 1)  # evicted by size
+        parse(data_filename, 1)
+        self.assertEqual(calls, [1, 2, 1])
+        time.sleep(0.1)
+        parse(data_filename, 1)  # expired
+        self.assertEqual(calls, [1, 2, 1, 1])
+
+    def test_shared_across_modes(self):
+        cache = ResultCache()
+        def read_all(file_input):
+            calls.append(file_input.mode)
+            return file_input.read()
+        read_text = fnfnwrap(read_all, memoize=cache)
+        read_binary = fnfnwrap(read_all, mode='rb', memoize=cache)
+        self.assertIsInstance(read_text(data_filename), str)
+        self.assertIsInstance(read_binary(data_filename), bytes)
+        self.assertIsInstance(read_text(data_filename), str)
+        self.assertIsInstance(read_binary(data_filename), bytes)
+        self.assertEqual(calls, ['r', 'rb'])
+        self.assertEqual(cache.info().currsize, 2)
+
+    def test_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            parse_numbers(os.path.join(this_dir, 'missing.txt'))
+        self.assertEqual(parse_numbers.result_cache.info().bypasses, 1)
+
+    def test_pickle(self):
+        cache = pickle.loads(pickle.dumps(parse_numbers.result_cache))
+        self.assertEqual(cache.maxsize, 2)
+        self.assertEqual(cache.info().currsize, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Test suite for memory-mapped file arguments."""
+__all__ = ()
+
+import io
+import os
+import tempfile
+import unittest
+from pyfnfn import fnfnwrap
+from pyfnfn.mmapfile import MappedFile, open_mapped
+
+# Obtain the path for data.txt within the same directory as this code.
+this_dir = os.path.dirname(os.path.abspath(__file__))
+data_filename = os.path.join(this_dir, 'data.txt')
+
+with open(data_filename, 'rb') as data_file:
+    ref_content = data_file.read()
+
+@fnfnwrap(mode='rb', mmap=True)
+def read_mapped(file_input):
+    return file_input, file_input.read()
+
+@fnfnwrap(mode='rb', mmap=True)
+def read_mapped_lines(file_input):
+    for line in file_input:
+        yield bytes(line)
+
+###########################################################
+##  All test cases for memory-mapped files resides here  ##
+###########################################################
+
+class MappedFileTestCase(unittest.TestCase):
+
+    def test_read(self):
+        with open_mapped(data_filename) as mapped:
+            self.assertIsInstance(mapped, io.IOBase)
+            self.assertEqual(len(mapped), len(ref_content))
+            head = mapped.read(3)
+            self.assertIsInstance(head, memoryview)
+            self.assertEqual(head, ref_content[:3])
+            self.assertEqual(mapped.tell(), 3)
+            self.assertEqual(mapped.read(), ref_content[3:])
+            self.assertEqual(mapped.read(), b'')
+            mapped.seek(-2, io.SEEK_END)
+            self.assertEqual(mapped.read(10), ref_content[-2:])
+            mapped.seek(0)
+            buffer = bytearray(5)
+            self.assertEqual(mapped.readinto(buffer), 5)
+            self.assertEqual(buffer, ref_content[:5])
+            self.assertEqual(mapped.getbuffer(), ref_content)
+
+    def test_readline(self):
+        with open_mapped(data_filename) as mapped:
+            lines = [bytes(line) for line in mapped]
+        self.assertEqual(lines, ref_content.splitlines(keepends=True))
+        with open_mapped(data_filename) as mapped:
+            self.assertEqual(mapped.readline(2), ref_content[:2])
+
+    def test_release_on_close(self):
+        with open_mapped(data_filename) as mapped:
+            view = mapped.read()
+        self.assertTrue(mapped.closed)
+        self.assertTrue(mapped.raw.closed)
+        with self.assertRaises(ValueError):
+            bytes(view)  # released together with the file
+        with self.assertRaises(ValueError):
+            mapped.read()
+
+    def test_empty_file(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            empty = os.path.join(tempdir, 'empty.bin')
+            open(empty, 'wb').close()
+            with open_mapped(empty) as mapped:
+                self.assertEqual(mapped.read(), b'')
+                self.assertEqual(mapped.readline(), b'')
+
+    def test_decorator(self):
+        mapped, content = read_mapped(data_filename)
+        self.assertIsInstance(mapped, MappedFile)
+        self.assertTrue(mapped.closed)
+        with open(data_filename, 'rb') as data_file:
+            fileobj, content = read_mapped(data_file)
+            self.assertIs(fileobj, data_file)
+            self.assertEqual(content, ref_content)
+        sequence = read_mapped_lines(data_filename)
+        self.assertEqual(next(sequence), ref_content.splitlines(True)[0])
+        sequence.close()
+        self.assertEqual(list(read_mapped_lines(data_filename)),
+                         ref_content.splitlines(keepends=True))
+
+    def test_exceptions(self):
+        with self.assertRaisesRegex(
+                ValueError, r"option 'mmap' requires binary read mode"):
+            @fnfnwrap(mmap=True)
+            def dummy(file_input): pass
+        with self.assertRaisesRegex(
+                ValueError, r"option 'mmap' requires binary read mode"):
+            @fnfnwrap(mode='r+b', mmap=True)
+            def dummy(file_input): pass
+        with self.assertRaisesRegex(
+                ValueError, r'require binary read mode'):
+            open_mapped(data_filename, 'r')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Test suite for read-ahead of file arguments in background threads."""
+__all__ = ()
+
+import gc
+import io
+import os
+import time
+import unittest
+from pyfnfn import fnfnwrap
+from pyfnfn.prefetch import PrefetchingFile, open_prefetched
+
+# Obtain the path for data.txt within the same directory as this code.
+this_dir = os.path.dirname(os.path.abspath(__file__))
+data_filename = os.path.join(this_dir, 'data.txt')
+
+with open(data_filename) as data_file:
+    ref_data = [ int(token) for line in data_file for token in line.split() ]
+
+with open(data_filename, 'rb') as data_file:
+    ref_content = data_file.read()
+
+@fnfnwrap(prefetch=2)
+def read_numbers_generator(file_input):
+    yield file_input
+    for line in file_input:
+        for token in line.split():
+            yield int(token)
+
+
+class FailingRaw(io.RawIOBase):
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        raise OSError('disk on fire')
+
+###############################################################
+##  All test cases for prefetching file objects reside here  ##
+###############################################################
+
+class PrefetchTestCase(unittest.TestCase):
+
+    def test_generator(self):
+        generator = read_numbers_generator(data_filename)
+        fileobj = next(generator)
+        self.assertIsInstance(fileobj.buffer.raw, PrefetchingFile)
+        numbers = []
+        for number in generator:
+            numbers.append(number)
+            time.sleep(0.001)  # slow consumer
+        self.assertEqual(numbers, ref_data)
+        self.assertTrue(fileobj.closed)
+        self.assertFalse(fileobj.buffer.raw._thread.is_alive())
+
+    def test_bounded(self):
+        with open_prefetched(data_filename, 'rb', buffering=2,
+                             depth=3) as fileobj:
+            raw = fileobj.raw
+            self.assertEqual(fileobj.read(1), ref_content[:1])
+            time.sleep(0.05)
+            self.assertLessEqual(raw._buffers.qsize(), 3)
+            self.assertTrue(raw._thread.is_alive())  # blocked on full queue
+            self.assertEqual(fileobj.read(), ref_content[1:])
+        with open_prefetched(data_filename, 'rb', buffering=0) as fileobj:
+            self.assertIsInstance(fileobj, PrefetchingFile)
+            self.assertEqual(fileobj.readall(), ref_content)
+
+    def test_early_close(self):
+        generator = read_numbers_generator(data_filename)
+        fileobj = next(generator)
+        self.assertEqual(next(generator), ref_data[0])
+        thread = fileobj.buffer.raw._thread
+        generator.close()
+        self.assertTrue(fileobj.closed)
+        self.assertFalse(thread.is_alive())
+        # Abandoned generators stop their threads once garbage-collected
+        generator = read_numbers_generator(data_filename)
+        thread = next(generator).buffer.raw._thread
+        del generator
+        gc.collect()
+        self.assertFalse(thread.is_alive())
+
+    def test_error(self):
+        with PrefetchingFile(FailingRaw(), depth=1) as fileobj:
+            with self.assertRaisesRegex(OSError, 'disk on fire'):
+                fileobj.read(10)
+            self.assertEqual(fileobj.read(10), b'')
+
+    def test_invalid(self):
+        with self.assertRaisesRegex(ValueError, r'requires a plain read mode'):
+            fnfnwrap(read_numbers_generator.__wrapped__, mode='w',
+                     prefetch=True)
+        with self.assertRaisesRegex(ValueError, r'with decompress'):
+            fnfnwrap(read_numbers_generator.__wrapped__, prefetch=True,
+                     decompress=True)
+        with self.assertRaisesRegex(ValueError, r'must be positive'):
+            fnfnwrap(read_numbers_generator.__wrapped__, prefetch=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
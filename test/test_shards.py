@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Test suite for reading directories and glob patterns as single files."""
+__all__ = ()
+
+import os
+import tempfile
+import unittest
+from pyfnfn import fnfnwrap
+from pyfnfn.shards import ShardedFile, open_sharded
+
+# Obtain the path for data.txt within the same directory as this code.
+this_dir = os.path.dirname(os.path.abspath(__file__))
+data_filename = os.path.join(this_dir, 'data.txt')
+
+with open(data_filename, 'rb') as data_file:
+    ref_content = data_file.read()
+
+@fnfnwrap(shards=True)
+def read_all(file_input):
+    return file_input.read()
+
+@fnfnwrap(shards=True)
+def read_lines(file_input):
+    for line in file_input:
+        yield line
+
+
+def _open_fds():
+    return len(os.listdir('/proc/self/fd'))
+
+############################################################
+##  All test cases for directories and globs reside here  ##
+############################################################
+
+class ShardsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        # Cut the reference content into shards in the middle of lines
+        self.cuts = [0, 3, 10, 11, 20, len(ref_content)]
+        for index, (start, stop) in enumerate(zip(self.cuts, self.cuts[1:])):
+            self._write('part-{:02}.txt'.format(index),
+                        ref_content[start:stop])
+        self._write('.hidden', b'hidden')
+        os.mkdir(os.path.join(self.dir, 'subdir'))
+        self._write(os.path.join('subdir', 'nested.txt'), b'nested')
+
+    def _write(self, name, content):
+        with open(os.path.join(self.dir, name), 'wb') as fileobj:
+            fileobj.write(content)
+
+    def test_directories(self):
+        self.assertEqual(read_all(self.dir), ref_content.decode())
+        self.assertEqual(list(read_lines(self.dir)),
+                         ref_content.decode().splitlines(True))
+        with open_sharded(self.dir, 'rb', buffering=0) as fileobj:
+            self.assertIsInstance(fileobj, ShardedFile)
+            self.assertEqual(len(fileobj.shards), len(self.cuts) - 1)
+            self.assertEqual(fileobj.read(), ref_content)
+        # Regular files are opened as usual
+        self.assertEqual(read_all(data_filename), ref_content.decode())
+        with self.assertRaises(FileNotFoundError):
+            read_all(os.path.join(self.dir, 'missing.txt'))
+
+    def test_glob_patterns(self):
+        pattern = os.path.join(self.dir, 'part-0[1-3].txt')
+        self.assertEqual(read_all(pattern),
+                         ref_content[self.cuts[1]:self.cuts[4]].decode())
+        pattern = os.path.join(self.dir, '*', '*.txt')
+        self.assertEqual(read_all(pattern), 'nested')
+        self.assertEqual(read_all(os.path.join(self.dir, '.h*')), 'hidden')
+        with self.assertRaises(FileNotFoundError):
+            read_all(os.path.join(self.dir, '*.csv'))
+
+    def test_dir_entries(self):
+        with os.scandir(self.dir) as entries:
+            entries = { entry.name: entry for entry in entries }
+        self.assertEqual(read_all(entries['subdir']), 'nested')
+        self.assertEqual(read_all(entries['part-00.txt']),
+                         ref_content[:self.cuts[1]].decode())
+
+    def test_split_characters(self):
+        self._write('part-05.txt', 'กข'.encode('utf-8')[:-1])
+        self._write('part-06.txt', b'')
+        self._write('part-07.txt', 'กข'.encode('utf-8')[-1:])
+        wrapper = fnfnwrap(read_all.__wrapped__, encoding='utf-8',
+                           shards=True)
+        self.assertEqual(wrapper(self.dir), ref_content.decode() + 'กข')
+
+    @unittest.skipUnless(os.path.isdir('/proc/self/fd'), 'requires /proc')
+    def test_one_shard_open_at_a_time(self):
+        before = _open_fds()
+        with open_sharded(self.dir, 'rb', buffering=0) as fileobj:
+            shards = []
+            while fileobj.read(5):
+                # The directory and the current shard only
+                self.assertEqual(_open_fds(), before + 2)
+                shards.append(fileobj.shard)
+            self.assertIsNone(fileobj.shard)
+        self.assertEqual(_open_fds(), before)
+        self.assertEqual(sorted(set(shards)), fileobj.shards)
+
+    def test_invalid_modes(self):
+        with self.assertRaisesRegex(ValueError, r'requires a plain read'):
+            fnfnwrap(read_all.__wrapped__, mode='w', shards=True)
+        with self.assertRaisesRegex(ValueError, r'requires a plain read'):
+            fnfnwrap(read_all.__wrapped__, shards=True, prefetch=True)
+        with self.assertRaisesRegex(ValueError, r'unbuffered text'):
+            open_sharded(self.dir, buffering=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Test suite for instrumentation of wrapped calls."""
+__all__ = ()
+
+import asyncio
+import os
+import tempfile
+import unittest
+from pyfnfn import fnfnwrap
+from pyfnfn.stats import Histogram, WrapperStats
+
+# Obtain the path for data.txt within the same directory as this code.
+this_dir = os.path.dirname(os.path.abspath(__file__))
+data_filename = os.path.join(this_dir, 'data.txt')
+
+with open(data_filename, 'rb') as data_file:
+    ref_content = data_file.read()
+
+@fnfnwrap(stats=True)
+def read_content(file_input):
+    return file_input.read()
+
+@fnfnwrap(filearg='file_output', mode='w', stats=True)
+def write_content(content, file_output):
+    file_output.write(content)
+
+@fnfnwrap(stats=True)
+def read_lines(file_input):
+    for line in file_input:
+        yield line
+
+@fnfnwrap(stats=True)
+async def read_slowly(file_input, fail=False):
+    await asyncio.sleep(0.01)
+    if fail:
+        raise ValueError('failed')
+    return file_input.read()
+
+@fnfnwrap(stats=True)
+async def read_lines_async(file_input):
+    for line in file_input:
+        await asyncio.sleep(0)
+        yield line
+
+@fnfnwrap
+def read_uninstrumented(file_input):
+    return file_input.read()
+
+#######################################################
+##  All test cases for instrumentation resides here  ##
+#######################################################
+
+class StatsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        for wrapper in (read_content, write_content, read_lines,
+                        read_slowly, read_lines_async):
+            wrapper.stats.reset()
+
+    def test_counters(self):
+        read_content(data_filename)
+        with open(data_filename) as data_file:
+            read_content(data_file)
+        with self.assertRaises(FileNotFoundError):
+            read_content(os.path.join(this_dir, 'missing.txt'))
+        snapshot = read_content.stats.snapshot()
+        self.assertEqual(snapshot['calls'], 3)
+        self.assertEqual(snapshot['opened_calls'], 2)
+        self.assertEqual(snapshot['passthrough_calls'], 1)
+        self.assertEqual(snapshot['errors'], 1)
+        self.assertEqual(snapshot['files_opened'], 1)
+        self.assertEqual(snapshot['bytes_read'], len(ref_content))
+        self.assertEqual(snapshot['open_latency']['count'], 1)
+        self.assertEqual(snapshot['call_duration']['count'], 3)
+        self.assertGreater(snapshot['call_duration']['total'], 0)
+
+    def test_bytes_written(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            write_content('hello\n', os.path.join(tempdir, 'out.txt'))
+        self.assertEqual(write_content.stats.snapshot()['bytes_written'], 6)
+
+    def test_generator(self):
+        lines = read_lines(data_filename)
+        self.assertEqual(
+            read_lines.stats.snapshot()['generator_duration']['count'], 0
+            )
+        self.assertEqual(b''.join(map(str.encode, lines)), ref_content)
+        snapshot = read_lines.stats.snapshot()
+        self.assertEqual(snapshot['generator_duration']['count'], 1)
+        self.assertEqual(snapshot['files_opened'], 1)
+        lines = read_lines(data_filename)
+        next(lines)
+        lines.close()
+        snapshot = read_lines.stats.snapshot()
+        self.assertEqual(snapshot['generator_duration']['count'], 2)
+        self.assertEqual(snapshot['errors'], 0)
+
+    def test_coroutines(self):
+        self.assertEqual(asyncio.run(read_slowly(data_filename)),
+                         ref_content.decode())
+        with self.assertRaises(ValueError):
+            asyncio.run(read_slowly(data_filename, fail=True))
+        snapshot = read_slowly.stats.snapshot()
+        self.assertEqual(snapshot['calls'], 2)
+        self.assertEqual(snapshot['errors'], 1)
+        self.assertEqual(snapshot['call_duration']['count'], 2)
+        self.assertGreaterEqual(snapshot['call_duration']['min'], 0.01)
+
+    def test_async_generators(self):
+        async def consume(limit=None):
+            lines = []
+            agen = read_lines_async(data_filename)
+            async for line in agen:
+                lines.append(line)
+                if len(lines) == limit:
+                    await agen.aclose()
+                    break
+            return lines
+        lines = asyncio.run(consume())
+        self.assertEqual(''.join(lines), ref_content.decode())
+        self.assertEqual(len(asyncio.run(consume(1))), 1)
+        snapshot = read_lines_async.stats.snapshot()
+        self.assertEqual(snapshot['generator_duration']['count'], 2)
+        self.assertEqual(snapshot['call_duration']['count'], 2)
+        self.assertEqual(snapshot['files_opened'], 2)
+        self.assertEqual(snapshot['errors'], 0)
+
+    def test_listeners(self):
+        events = []
+        listener = lambda *event: events.append(event)
+        read_content.stats.add_listener(listener)
+        read_content(data_filename)
+        read_content.stats.remove_listener(listener)
+        read_content(data_filename)
+        metrics = [metric for name, metric, value in events]
+        self.assertEqual(sorted(metrics), sorted([
+            'opened_calls', 'calls', 'open_latency', 'files_opened',
+            'bytes_read', 'call_duration',
+            ]))
+        self.assertTrue(all(name == 'read_content' for name, _, _ in events))
+
+    def test_shared_stats(self):
+        stats = WrapperStats()
+        first = fnfnwrap(lambda file_input: None, stats=stats)
+        second = fnfnwrap(lambda file_input: None, stats=stats)
+        first(data_filename)
+        second(data_filename)
+        self.assertEqual(stats.snapshot()['calls'], 2)
+
+    def test_disabled(self):
+        self.assertIsNone(read_uninstrumented.stats)
+
+    def test_histogram(self):
+        histogram = Histogram()
+        for value in (1e-7, 3e-6, 3e-6, 1e3):
+            histogram.add(value)
+        self.assertEqual(histogram.count, 4)
+        self.assertEqual((histogram.min, histogram.max), (1e-7, 1e3))
+        self.assertEqual(histogram.buckets[0], 1)
+        self.assertEqual(histogram.buckets[2], 2)
+        self.assertEqual(histogram.buckets[-1], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
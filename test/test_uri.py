@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Test suite for opener backends of file names given as URIs."""
+__all__ = ()
+
+import http.server
+import io
+import os
+import pathlib
+import pickle
+import threading
+import unittest
+from pyfnfn import fnfnwrap
+from pyfnfn.uri import (
+    FileBackend, HTTPBackend, OpenerRegistry, default_registry,
+    )
+
+# Obtain the path for data.txt within the same directory as this code.
+this_dir = os.path.dirname(os.path.abspath(__file__))
+data_filename = os.path.join(this_dir, 'data.txt')
+
+with open(data_filename, 'rb') as data_file:
+    ref_content = data_file.read()
+
+@fnfnwrap(uri=True)
+def read_all(file_input):
+    return file_input.read()
+
+
+class RangeRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Stand-in of an HTTP server with keep-alive and ranged requests,
+    serving `ref_content` at /data.txt.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        path, _, query = self.path.partition('?')
+        self.server.paths.append(self.path)
+        if path == '/moved':
+            self.send_response(302)
+            self.send_header('Location', '/data.txt')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if path != '/data.txt':
+            self.send_error(404)
+            return
+        start = 0
+        header = self.headers.get('Range')
+        if header and query != 'norange':
+            start = int(header[len('bytes='):].split('-')[0])
+            self.send_response(206)
+            self.send_header('Content-Range', 'bytes {}-{}/{}'.format(
+                start, len(ref_content) - 1, len(ref_content)
+                ))
+        else:
+            self.send_response(200)
+            self.send_header('Accept-Ranges', 'bytes')
+        body = ref_content[start:]
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if query == 'drop':
+            # Close the connection without telling the client
+            self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+##################################################
+##  All test cases for URI openers reside here  ##
+##################################################
+
+class URITestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.server = http.server.ThreadingHTTPServer(
+            ('127.0.0.1', 0), RangeRequestHandler
+            )
+        self.server.daemon_threads = True
+        self.server.connections = 0
+        self.server.paths = []
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.backend = HTTPBackend()
+        self.addCleanup(self.backend.pool.clear)
+        self.registry = OpenerRegistry({'http': self.backend})
+        self.base = 'http://127.0.0.1:{}'.format(self.server.server_port)
+
+    def test_file_uris(self):
+        uri = pathlib.Path(data_filename).as_uri()
+        self.assertEqual(read_all(uri), ref_content.decode())
+        self.assertEqual(read_all(data_filename), ref_content.decode())
+        with self.assertRaises(ValueError):
+            read_all('file://example.com/data.txt')
+
+    def test_keep_alive(self):
+        wrapper = fnfnwrap(read_all.__wrapped__, mode='rb',
+                           uri=self.registry)
+        for _ in range(5):
+            self.assertEqual(wrapper(self.base + '/data.txt'), ref_content)
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(self.backend.pool.connections, 1)
+        self.assertEqual(self.backend.pool.reuses, 4)
+        self.assertEqual(len(self.backend.pool), 1)
+        # Non-URI file names are still opened locally
+        self.assertEqual(wrapper(data_filename), ref_content)
+
+    def test_ranged_reads(self):
+        for suffix in ('', '?norange'):
+            uri = self.base + '/data.txt' + suffix
+            with self.registry.open(uri, 'rb') as fileobj:
+                self.assertEqual(fileobj.read(10), ref_content[:10])
+                fileobj.seek(20)
+                self.assertEqual(fileobj.read(5), ref_content[20:25])
+                fileobj.seek(-7, io.SEEK_END)
+                self.assertEqual(fileobj.read(), ref_content[-7:])
+                fileobj.seek(3)
+                self.assertEqual(fileobj.read(), ref_content[3:])
+        self.assertIn('/data.txt', self.server.paths)
+        with self.registry.open(self.base + '/data.txt') as fileobj:
+            self.assertEqual(fileobj.readline(),
+                             ref_content.decode().splitlines(True)[0])
+
+    def test_abandoned_and_stale_connections(self):
+        uri = self.base + '/data.txt'
+        with self.registry.open(uri, 'rb', buffering=0) as fileobj:
+            self.assertEqual(fileobj.read(1), ref_content[:1])
+        self.assertEqual(len(self.backend.pool), 0)  # closed, not reused
+        uri = self.base + '/data.txt?drop'
+        self.assertEqual(self.registry.open(uri, 'rb').read(), ref_content)
+        self.assertEqual(len(self.backend.pool), 1)
+        # The pooled connection was closed by the server: retried
+        self.assertEqual(self.registry.open(uri, 'rb').read(), ref_content)
+        self.assertEqual(self.backend.pool.connections, 3)
+
+    def test_redirects_and_errors(self):
+        with self.registry.open(self.base + '/moved', 'rb') as fileobj:
+            self.assertEqual(fileobj.read(), ref_content)
+            self.assertEqual(fileobj.raw.uri, self.base + '/data.txt')
+            self.assertEqual(fileobj.name, self.base + '/moved')
+        with self.assertRaises(FileNotFoundError):
+            self.registry.open(self.base + '/missing.txt')
+        with self.assertRaisesRegex(ValueError, r'only be opened for reading'):
+            self.registry.open(self.base + '/data.txt', 'w')
+        with self.assertRaisesRegex(ValueError, r'requires a plain'):
+            fnfnwrap(read_all.__wrapped__, uri=True, mmap=True)
+
+    def test_pickle(self):
+        self.assertIs(pickle.loads(pickle.dumps(default_registry)),
+                      default_registry)
+        registry = pickle.loads(pickle.dumps(
+            OpenerRegistry({'file': FileBackend(), 'http': self.backend})
+            ))
+        self.assertIsInstance(registry.backend_for(self.base),
+                              HTTPBackend)
+        self.assertIsNone(registry.backend_for('ftp://example.com/'))
+        self.assertIsNone(registry.backend_for('C://data.txt'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,11 +6,18 @@ of how the usage of `@fnfnwrap` is intended.
 """
 __all__ = ()
 
+import inspect
+import io
 import itertools
 import os
+import shutil
 import sys
+import tempfile
 import unittest
-from pyfnfn.utils import is_valid_filename, validate_open_kwargs
+from pyfnfn.utils import (
+    FILE_OPTIONS, OPEN_PARAMETERS, file_identity, is_valid_filename,
+    split_open_kwargs, validate_open_kwargs, wrap_raw_file,
+    )
 
 # Obtain the path for data.txt within the same directory as this code.
 this_dir = os.path.dirname(os.path.abspath(__file__))
@@ -71,6 +78,13 @@ class ValidOpenKeywordArgumentsTestCase(unittest.TestCase):
         except:
             self.fail('Exception raised unexpectedly!')
 
+    def test_open_parameters(self):
+        parameters = list(inspect.signature(open).parameters.values())[1:]
+        self.assertEqual(
+            list(OPEN_PARAMETERS.items()),
+            [ (param.name, param.default) for param in parameters ]
+            )
+
     def test_invalid_open_arguments(self):
         with self.assertRaises(TypeError):
             validate_open_kwargs({'modal': None})
@@ -80,3 +94,70 @@ class ValidOpenKeywordArgumentsTestCase(unittest.TestCase):
             open_kwargs = { arg: None for arg in valid_args }
             open_kwargs['wrong'] = None
             validate_open_kwargs(open_kwargs)
+
+
+#########################################################
+##  All test cases for split_open_kwargs resides here  ##
+#########################################################
+
+class SplitOpenKeywordArgumentsTestCase(unittest.TestCase):
+
+    def test_split(self):
+        open_kwargs, options = split_open_kwargs({'mode': 'rb', 'mmap': True})
+        self.assertEqual(open_kwargs, {'mode': 'rb'})
+        self.assertEqual(options, dict(FILE_OPTIONS, mmap=True))
+        open_kwargs, options = split_open_kwargs({})
+        self.assertEqual(open_kwargs, {})
+        self.assertEqual(options, FILE_OPTIONS)
+
+    def test_invalid_open_arguments(self):
+        with self.assertRaises(TypeError):
+            split_open_kwargs({'mmap': True, 'modal': None})
+
+#####################################################
+##  All test cases for file_identity resides here  ##
+#####################################################
+
+class FileIdentityTestCase(unittest.TestCase):
+
+    def test_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'data.txt')
+            shutil.copy(data_filename, filename)
+            identity = file_identity(os.stat(filename))
+            self.assertEqual(identity, file_identity(os.stat(filename)))
+            with open(filename, 'rb') as fileobj:
+                self.assertEqual(identity,
+                                 file_identity(os.fstat(fileobj.fileno())))
+            with open(filename, 'ab') as fileobj:
+                fileobj.write(b'more')
+            self.assertNotEqual(identity, file_identity(os.stat(filename)))
+
+#####################################################
+##  All test cases for wrap_raw_file resides here  ##
+#####################################################
+
+class WrapRawFileTestCase(unittest.TestCase):
+
+    def test_wrap(self):
+        with open(data_filename, 'rb') as data_file:
+            content = data_file.read()
+        raw = io.FileIO(data_filename)
+        self.assertIs(wrap_raw_file(raw, 'rb', 0), raw)
+        fileobj = wrap_raw_file(raw, 'rb')
+        self.assertIsInstance(fileobj, io.BufferedReader)
+        self.assertEqual(fileobj.read(), content)
+        fileobj.close()
+        for buffering in (-1, 1, 64):
+            raw = io.FileIO(data_filename)
+            with wrap_raw_file(raw, 'rt', buffering) as fileobj:
+                self.assertIsInstance(fileobj, io.TextIOWrapper)
+                self.assertEqual(fileobj.mode, 'rt')
+                self.assertEqual(fileobj.line_buffering, buffering == 1)
+                self.assertEqual(fileobj.read(), content.decode())
+
+    def test_unbuffered_text(self):
+        raw = io.FileIO(data_filename)
+        with self.assertRaisesRegex(ValueError, r'unbuffered text'):
+            wrap_raw_file(raw, 'r', 0)
+        self.assertTrue(raw.closed)
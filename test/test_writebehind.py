@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# Author: Abhabongse Janthong
+# More info at https://github.com/abhabongse/pyfnfn
+"""Test suite for write-behind of file arguments opened for writing."""
+__all__ = ()
+
+import io
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from pyfnfn import fnfnwrap
+from pyfnfn.writebehind import WriteBehindFile, open_write_behind
+
+# Obtain the path for data.txt within the same directory as this code.
+this_dir = os.path.dirname(os.path.abspath(__file__))
+data_filename = os.path.join(this_dir, 'data.txt')
+
+with open(data_filename) as data_file:
+    ref_data = [ int(token) for line in data_file for token in line.split() ]
+
+@fnfnwrap(mode='w', write_behind=4)
+def write_numbers(file_output, numbers):
+    for number in numbers:
+        print(number, file=file_output)
+    return file_output
+
+@fnfnwrap(mode='w', write_behind=True)
+def write_numbers_generator(file_output):
+    while True:
+        number = yield file_output
+        if number is None:
+            return
+        print(number, file=file_output)
+
+
+class SlowRaw(io.RawIOBase):
+    """Raw file which records batches, blocking until released."""
+
+    def __init__(self, fail=False):
+        self.batches = []
+        self.release = threading.Event()
+        self.fail = fail
+
+    def writable(self):
+        return True
+
+    def write(self, buffer):
+        self.release.wait()
+        if self.fail:
+            raise OSError('disk full')
+        self.batches.append(bytes(buffer))
+        return len(buffer)
+
+###################################################
+##  All test cases for write-behind reside here  ##
+###################################################
+
+class WriteBehindTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.filename = os.path.join(self.directory, 'output.txt')
+
+    def read_numbers(self):
+        with open(self.filename) as fileobj:
+            return [ int(token) for line in fileobj for token in line.split() ]
+
+    def test_wrapper(self):
+        fileobj = write_numbers(self.filename, ref_data * 100)
+        self.assertTrue(fileobj.closed)
+        self.assertIsInstance(fileobj.buffer.raw, WriteBehindFile)
+        self.assertEqual(self.read_numbers(), ref_data * 100)
+
+    def test_generator(self):
+        generator = write_numbers_generator(self.filename)
+        fileobj = next(generator)
+        for number in ref_data:
+            generator.send(number)
+        self.assertFalse(fileobj.closed)
+        with self.assertRaises(StopIteration):
+            generator.send(None)
+        self.assertTrue(fileobj.closed)
+        self.assertEqual(self.read_numbers(), ref_data)
+
+    def test_batches(self):
+        raw = SlowRaw()
+        with WriteBehindFile(raw, depth=8, batch_size=6) as fileobj:
+            for _ in range(9):
+                self.assertEqual(fileobj.write(b'ab'), 2)
+            self.assertEqual(fileobj.tell(), 18)
+            raw.release.set()
+            fileobj.flush()
+            self.assertEqual(b''.join(raw.batches), b'ab' * 9)
+            self.assertLess(len(raw.batches), 9)  # queued chunks were joined
+        self.assertTrue(raw.closed)
+
+    def test_errors(self):
+        raw = SlowRaw(fail=True)
+        fileobj = WriteBehindFile(raw, depth=2)
+        fileobj.write(b'abc')
+        raw.release.set()
+        with self.assertRaisesRegex(OSError, 'disk full'):
+            fileobj.flush()
+        with self.assertRaisesRegex(OSError, 'disk full'):
+            fileobj.write(b'def')
+        with self.assertRaisesRegex(OSError, 'disk full'):
+            fileobj.close()
+        self.assertTrue(fileobj.closed)
+        self.assertTrue(raw.closed)
+
+    def test_modes(self):
+        with open_write_behind(self.filename, 'wb', buffering=0) as fileobj:
+            self.assertIsInstance(fileobj, WriteBehindFile)
+            fileobj.write(b'abc\n')
+        with open_write_behind(self.filename, 'a') as fileobj:
+            self.assertEqual(fileobj.mode, 'a')
+            self.assertFalse(fileobj.line_buffering)
+            self.assertEqual(fileobj.buffer.tell(), 4)
+            fileobj.write('def\n')
+        with open_write_behind(self.filename, 'at', buffering=1) as fileobj:
+            self.assertEqual(fileobj.mode, 'at')
+            self.assertTrue(fileobj.line_buffering)
+        with open(self.filename) as fileobj:
+            self.assertEqual(fileobj.read(), 'abc\ndef\n')
+        with self.assertRaises(FileExistsError):
+            open_write_behind(self.filename, 'x')
+        with self.assertRaisesRegex(ValueError, r'requires a plain write'):
+            fnfnwrap(write_numbers.__wrapped__, write_behind=True)
+        with self.assertRaisesRegex(ValueError, r'requires a plain write'):
+            fnfnwrap(write_numbers.__wrapped__, mode='w+', write_behind=True)
+        with self.assertRaisesRegex(ValueError, r'with prefetch'):
+            fnfnwrap(write_numbers.__wrapped__, fd_budget=True, prefetch=2)
+
+
+if __name__ == '__main__':
+    unittest.main()